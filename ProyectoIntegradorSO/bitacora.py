@@ -0,0 +1,389 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las búsquedas recorren los registros con struct
+    np = None
+
+from registro import LogRecord
+
+# Formato del diario (todo en little-endian):
+#   cabecera de HEADER.size bytes, seguida de segmentos de block_records registros de datos y un
+#   registro índice que resume el segmento. Todos los registros miden RECORD_SIZE bytes, así que la
+#   posición de cualquier registro se calcula sin leer el archivo.
+#   Registro de datos: marca de tiempo (f8), ciclo (i8), código (u4, id de cadena), pid (i4, -1 si no
+#   hay), tipos de los argumentos (u1, 2 bits cada uno), número de argumentos (u1), relleno y cuatro
+#   argumentos de 8 bytes.
+#   Registro índice: ciclo mínimo y máximo (i8), INDEX_MARK en la posición del código, número de
+#   registros (u4) y un filtro de Bloom de los PID del segmento.
+# Las cadenas (códigos y argumentos de texto) se guardan una sola vez en el archivo .str anexo, como
+# longitud (u4) y bytes UTF-8; los registros guardan su identificador.
+MAGIC = b"SOJRNL01"
+HEADER = struct.Struct("<8sHHI48x")
+RECORD = struct.Struct("<dqIiBB6x8s8s8s8s")
+INDEX = struct.Struct("<qqII40s")
+RECORD_SIZE = RECORD.size
+INDEX_MARK = 0xFFFFFFFF
+BLOOM_BITS = 320
+MAX_ARGS = 4
+
+# Tipos de argumento
+_NONE, _INT, _FLOAT, _STR = range(4)
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_ZERO = bytes(8)
+_LENGTH = struct.Struct("<I")
+
+if np is not None:
+    # Vista estructurada de un registro de datos, para recorrer segmentos sin copiarlos
+    RECORD_DTYPE = np.dtype({"names": ["timestamp", "cycle", "code", "pid"],
+                             "formats": ["<f8", "<i8", "<u4", "<i4"],
+                             "offsets": [0, 8, 16, 20], "itemsize": RECORD_SIZE})
+
+
+def _bloom_bits(pid: int) -> Tuple[int, int]:
+    # Dos posiciones del filtro de Bloom para un PID
+    return pid % BLOOM_BITS, (pid * 2654435761 >> 7) % BLOOM_BITS
+
+
+class Journal:
+    """
+    Diario binario de eventos en disco, solo de anexado.
+    Cada evento ocupa un registro de tamaño fijo; cada block_records
+    registros se escribe un registro índice con el rango de ciclos y un
+    filtro de Bloom de los PID del segmento, que permite al lector saltar
+    segmentos enteros. Los registros se acumulan en memoria y se escriben
+    en bloques de flush_bytes. Un diario existente se continúa al abrirlo.
+    """
+
+    def __init__(self, path: str, block_records: int = 4096, flush_bytes: int = 1 << 20):
+        if block_records < 1:
+            raise ValueError("Un segmento debe tener al menos un registro")
+
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.strings: Dict[str, int] = {}
+        self._buffer = bytearray()
+        self._pending_strings = bytearray()
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.block_records, self.records = _read_header(path)
+            # Descarta un registro a medio escribir (interrupción durante un volcado)
+            stored = (os.path.getsize(path) - HEADER.size) // RECORD_SIZE
+            os.truncate(path, HEADER.size + stored * RECORD_SIZE)
+            self._load_strings()
+            self._resume_segment()
+        else:
+            self.block_records = block_records
+            self.records = 0
+            with open(path, "wb") as output:
+                output.write(HEADER.pack(MAGIC, 1, RECORD_SIZE, block_records))
+            open(path + ".str", "wb").close()
+            self._reset_segment()
+
+        self._file = open(path, "ab")
+        self._string_file = open(path + ".str", "ab")
+
+    def _load_strings(self) -> None:
+        for text in _read_strings(self.path + ".str"):
+            self.strings[text] = len(self.strings)
+
+    def _resume_segment(self) -> None:
+        # Recalcula el resumen del último segmento sin índice para seguir anexando a él
+        self._reset_segment()
+        stored = (os.path.getsize(self.path) - HEADER.size) // RECORD_SIZE
+        if not stored % (self.block_records + 1):
+            return
+        reader = JournalReader(self.path)
+        try:
+            for record in reader.records_in_segment((self.records - 1) // self.block_records):
+                self._track(-1 if record.cycle is None else record.cycle, -1 if record.pid is None else record.pid)
+        finally:
+            reader.close()
+        # Segmento completo cuyo índice no llegó a escribirse
+        if self._segment_count == self.block_records:
+            self._close_segment()
+
+    def _close_segment(self) -> None:
+        self._buffer += INDEX.pack(self._min_cycle, self._max_cycle, INDEX_MARK, self._segment_count,
+                                   self._bloom.to_bytes(BLOOM_BITS // 8, "little"))
+        self._reset_segment()
+
+    def _reset_segment(self) -> None:
+        self._segment_count = 0
+        self._min_cycle = None
+        self._max_cycle = None
+        self._bloom = 0
+
+    def _track(self, cycle: int, pid: int) -> None:
+        if self._min_cycle is None or cycle < self._min_cycle:
+            self._min_cycle = cycle
+        if self._max_cycle is None or cycle > self._max_cycle:
+            self._max_cycle = cycle
+        if pid >= 0:
+            first, second = _bloom_bits(pid)
+            self._bloom |= (1 << first) | (1 << second)
+        self._segment_count += 1
+
+    def _intern(self, text: str) -> int:
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+            encoded = text.encode("utf-8")
+            self._pending_strings += _LENGTH.pack(len(encoded)) + encoded
+        return string_id
+
+    def _encode(self, value: Any) -> Tuple[int, bytes]:
+        if value is None:
+            return _NONE, _ZERO
+        if isinstance(value, bool):
+            return _INT, _I64.pack(int(value))
+        if isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+            return _INT, _I64.pack(value)
+        if isinstance(value, float):
+            return _FLOAT, _F64.pack(value)
+        return _STR, _I64.pack(self._intern(str(value)))
+
+    def append(self, entry: tuple) -> None:
+        # entry: (marca de tiempo, ciclo, código, pid, argumentos), igual que en EventLog
+        timestamp, cycle, code, pid, payload = entry
+        self.write(timestamp, cycle, code, pid, payload)
+
+    def write(self, timestamp: float, cycle: Optional[int], code: str, pid: Optional[int],
+              payload: tuple = ()) -> None:
+        cycle = -1 if cycle is None else cycle
+        pid = -1 if pid is None else pid
+        kinds = 0
+        args = [_ZERO] * MAX_ARGS
+        # Los argumentos que no caben en el registro se descartan
+        payload = payload[:MAX_ARGS]
+        for position, value in enumerate(payload):
+            kind, args[position] = self._encode(value)
+            kinds |= kind << (2 * position)
+
+        self._buffer += RECORD.pack(timestamp, cycle, self._intern(code), pid, kinds, len(payload), *args)
+        self.records += 1
+        self._track(cycle, pid)
+        if self._segment_count == self.block_records:
+            self._close_segment()
+        if len(self._buffer) >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        # Las cadenas se escriben antes que los registros que las usan
+        if self._pending_strings:
+            self._string_file.write(self._pending_strings)
+            self._string_file.flush()
+            self._pending_strings = bytearray()
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer = bytearray()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        self._string_file.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _read_header(path: str) -> Tuple[int, int]:
+    # Devuelve (registros por segmento, registros de datos) de un diario existente
+    with open(path, "rb") as source:
+        header = source.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} no es un diario de eventos: cabecera incompleta")
+    magic, version, record_size, block_records = HEADER.unpack(header)
+    if magic != MAGIC or version != 1 or record_size != RECORD_SIZE:
+        raise ValueError(f"{path} no es un diario de eventos compatible")
+
+    stored = (os.path.getsize(path) - HEADER.size) // RECORD_SIZE
+    segments, partial = divmod(stored, block_records + 1)
+    return block_records, segments * block_records + min(partial, block_records)
+
+
+def _read_strings(path: str) -> List[str]:
+    strings = []
+    if not os.path.exists(path):
+        return strings
+    with open(path, "rb") as source:
+        data = source.read()
+    offset = 0
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        if offset + length > len(data):
+            break  # Cadena a medio escribir
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    return strings
+
+
+class JournalReader:
+    """
+    Lector del diario por proyección en memoria (mmap).
+    No carga el archivo: cada consulta desempaqueta solo los registros que
+    devuelve, directamente de las páginas proyectadas. by_cycle y by_pid
+    consultan primero los registros índice (uno por segmento) y recorren
+    solo los segmentos que pueden contener resultados; con NumPy, el
+    recorrido de un segmento es una vista sin copia sobre la proyección.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.block_records, self.records = _read_header(path)
+        self.strings = _read_strings(path + ".str")
+        self._file = open(path, "rb")
+        size = os.path.getsize(path)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._map) if self._map is not None else memoryview(b"")
+        self.segments = -(-self.records // self.block_records)
+        self._cycle_bounds: Optional[Tuple[List[int], List[int]]] = None
+
+    def close(self) -> None:
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.records
+
+    def _offset(self, index: int) -> int:
+        # Posición en bytes del registro de datos index, saltando los registros índice anteriores
+        segment, position = divmod(index, self.block_records)
+        return HEADER.size + (segment * (self.block_records + 1) + position) * RECORD_SIZE
+
+    def _segment_bounds(self, segment: int) -> Tuple[int, int]:
+        first = segment * self.block_records
+        return first, min(first + self.block_records, self.records)
+
+    def record(self, index: int) -> LogRecord:
+        if not 0 <= index < self.records:
+            raise IndexError("Registro fuera del diario")
+        return self._decode(RECORD.unpack_from(self._view, self._offset(index)))
+
+    def __getitem__(self, index: int) -> LogRecord:
+        return self.record(index if index >= 0 else self.records + index)
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        for segment in range(self.segments):
+            yield from self.records_in_segment(segment)
+
+    def _decode(self, fields: tuple) -> LogRecord:
+        timestamp, cycle, code, pid, kinds, count = fields[:6]
+        payload = []
+        for position, raw in enumerate(fields[6:6 + count]):
+            kind = (kinds >> (2 * position)) & 3
+            if kind == _NONE:
+                payload.append(None)
+            elif kind == _INT:
+                payload.append(_I64.unpack(raw)[0])
+            elif kind == _FLOAT:
+                payload.append(_F64.unpack(raw)[0])
+            else:
+                payload.append(self.strings[_I64.unpack(raw)[0]])
+        return LogRecord(timestamp, None if cycle < 0 else cycle, self.strings[code],
+                         None if pid < 0 else pid, tuple(payload))
+
+    def _segment_summary(self, segment: int) -> Optional[Tuple[int, int, int]]:
+        # (ciclo mínimo, ciclo máximo, filtro de Bloom) del segmento; None si es el último incompleto
+        first, last = self._segment_bounds(segment)
+        offset = self._offset(first) + self.block_records * RECORD_SIZE
+        if last - first < self.block_records or offset + RECORD_SIZE > len(self._view):
+            return None
+        min_cycle, max_cycle, mark, _, bloom = INDEX.unpack_from(self._view, offset)
+        if mark != INDEX_MARK:
+            raise ValueError(f"Registro índice dañado en el segmento {segment}")
+        return min_cycle, max_cycle, int.from_bytes(bloom, "little")
+
+    def records_in_segment(self, segment: int, positions: Optional[List[int]] = None) -> Iterator[LogRecord]:
+        first, last = self._segment_bounds(segment)
+        base = self._offset(first)
+        indices = range(last - first) if positions is None else positions
+        for position in indices:
+            yield self._decode(RECORD.unpack_from(self._view, base + position * RECORD_SIZE))
+
+    def _matching_positions(self, segment: int, field: str, low: int, high: int) -> List[int]:
+        # Posiciones del segmento cuyo campo (ciclo o pid) está en [low, high]
+        first, last = self._segment_bounds(segment)
+        base = self._offset(first)
+        if np is not None:
+            block = np.frombuffer(self._map, dtype=RECORD_DTYPE, count=last - first, offset=base)
+            values = block[field]
+            return np.nonzero((values >= low) & (values <= high))[0].tolist()
+
+        column = 1 if field == "cycle" else 3
+        with self._view[base:base + (last - first) * RECORD_SIZE] as chunk:
+            return [position for position, fields in enumerate(RECORD.iter_unpack(chunk))
+                    if low <= fields[column] <= high]
+
+    def by_cycle(self, start: int, end: Optional[int] = None) -> Iterator[LogRecord]:
+        # Eventos con ciclo entre start y end (ambos incluidos), en orden de escritura
+        end = start if end is None else end
+        reached, remaining = self._cycle_index()
+        indexed = len(reached)
+        # Búsqueda binaria de los segmentos indexados que pueden contener [start, end]
+        for segment in range(bisect_left(reached, start), bisect_right(remaining, end)):
+            summary = self._segment_summary(segment)
+            if summary[1] < start or summary[0] > end:
+                continue
+            yield from self.records_in_segment(segment, self._matching_positions(segment, "cycle", start, end))
+        for segment in range(indexed, self.segments):
+            yield from self.records_in_segment(segment, self._matching_positions(segment, "cycle", start, end))
+
+    def _cycle_index(self) -> Tuple[List[int], List[int]]:
+        # Por segmento indexado: ciclo máximo alcanzado hasta él y ciclo mínimo desde él.
+        # Ambas listas son crecientes aunque los ciclos retrocedan, así que admiten bisect
+        if self._cycle_bounds is None:
+            reached, remaining = [], []
+            for segment in range(self.segments):
+                summary = self._segment_summary(segment)
+                if summary is None:
+                    break
+                reached.append(summary[1] if not reached else max(reached[-1], summary[1]))
+                remaining.append(summary[0])
+            for position in range(len(remaining) - 2, -1, -1):
+                remaining[position] = min(remaining[position], remaining[position + 1])
+            self._cycle_bounds = reached, remaining
+        return self._cycle_bounds
+
+    def by_pid(self, pid: int) -> Iterator[LogRecord]:
+        bits = _bloom_bits(pid)
+        mask = (1 << bits[0]) | (1 << bits[1])
+        for segment in range(self.segments):
+            summary = self._segment_summary(segment)
+            if summary is not None and summary[2] & mask != mask:
+                continue
+            yield from self.records_in_segment(segment, self._matching_positions(segment, "pid", pid, pid))
+
+    def cycle_range(self) -> Tuple[Optional[int], Optional[int]]:
+        # Ciclos mínimo y máximo del diario, a partir de los índices y del segmento final
+        low = high = None
+        for segment in range(self.segments):
+            summary = self._segment_summary(segment)
+            if summary is None:
+                cycles = [record.cycle for record in self.records_in_segment(segment) if record.cycle is not None]
+                if not cycles:
+                    continue
+                summary = (min(cycles), max(cycles))
+            low = summary[0] if low is None else min(low, summary[0])
+            high = summary[1] if high is None else max(high, summary[1])
+        return low, high
@@ -0,0 +1,99 @@
+import random
+from typing import Any, Dict, Optional, Tuple
+
+DISTRIBUTIONS = ("exponential", "pareto")
+
+
+class SyntheticWorkload:
+    """
+    Generador sintético de carga de trabajo.
+    Produce tuplas (llegada, prioridad, memoria, tiempo de CPU) ordenadas por
+    llegada, con llegadas de Poisson (tiempos entre llegadas exponenciales de
+    tasa arrival_rate por ciclo) y tiempos de CPU exponenciales o de cola
+    pesada (Pareto con forma pareto_shape y la misma media). Con
+    interactive_fraction > 0 la carga es mixta: esa fracción de procesos son
+    interactivos, con ráfagas cortas (media interactive_burst) y la mejor
+    prioridad del rango, y el resto son trabajos por lotes. Es perezoso: con
+    count=None genera indefinidamente y nunca guarda la carga en memoria.
+    La misma semilla produce siempre la misma carga. El iterador guarda sus
+    parámetros, el estado del generador aleatorio y las tuplas ya emitidas,
+    así que se puede serializar a mitad de la carga y continúa donde estaba.
+    """
+
+    def __init__(self, count: Optional[int] = None, seed: Optional[int] = None, arrival_rate: float = 0.2,
+                 burst_distribution: str = "exponential", mean_burst: float = 5.0,
+                 pareto_shape: float = 1.5, priority_range: Tuple[int, int] = (1, 5),
+                 memory_range: Tuple[int, int] = (16, 256), start_time: int = 0,
+                 max_burst: Optional[int] = None, interactive_fraction: float = 0.0,
+                 interactive_burst: float = 1.5):
+        if arrival_rate <= 0:
+            raise ValueError("La tasa de llegadas debe ser positiva")
+        if mean_burst < 1:
+            raise ValueError("El tiempo medio de CPU debe ser al menos 1")
+        if burst_distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribución desconocida: {burst_distribution}")
+        if burst_distribution == "pareto" and pareto_shape <= 1:
+            raise ValueError("La forma de Pareto debe ser mayor que 1 para tener media finita")
+        if not 0 <= interactive_fraction <= 1:
+            raise ValueError("La fracción de procesos interactivos debe estar entre 0 y 1")
+        if interactive_burst < 1:
+            raise ValueError("El tiempo medio de CPU interactivo debe ser al menos 1")
+
+        self.count = count
+        self.seed = seed
+        self.arrival_rate = arrival_rate
+        self.burst_distribution = burst_distribution
+        self.mean_burst = mean_burst
+        self.pareto_shape = pareto_shape
+        self.priority_range = tuple(priority_range)
+        self.memory_range = tuple(memory_range)
+        self.max_burst = max_burst
+        self.interactive_fraction = interactive_fraction
+        self.interactive_burst = interactive_burst
+        # Escala de Pareto tal que la media coincida con mean_burst
+        self._pareto_scale = mean_burst * (pareto_shape - 1) / pareto_shape
+        self._rng = random.Random(seed)
+        self._clock = float(start_time)
+        self.generated = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_rng"] = self._rng.getstate()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._rng = random.Random()
+        self._rng.setstate(state["_rng"])
+
+    def __iter__(self) -> "SyntheticWorkload":
+        return self
+
+    def __next__(self) -> Tuple[int, int, int, int]:
+        if self.count is not None and self.generated >= self.count:
+            raise StopIteration
+
+        rng = self._rng
+        self._clock += rng.expovariate(self.arrival_rate)
+        self.generated += 1
+
+        # Sin fracción interactiva no se consume ningún número aleatorio extra, así que
+        # las cargas de una semilla dada no cambian
+        if self.interactive_fraction and rng.random() < self.interactive_fraction:
+            burst = max(1, round(rng.expovariate(1.0 / self.interactive_burst)))
+            return (int(self._clock), self.priority_range[0], rng.randint(*self.memory_range), burst)
+
+        if self.burst_distribution == "exponential":
+            burst = rng.expovariate(1.0 / self.mean_burst)
+        else:
+            burst = self._pareto_scale * rng.paretovariate(self.pareto_shape)
+        burst = max(1, round(burst))
+        if self.max_burst is not None:
+            burst = min(burst, self.max_burst)
+
+        return (int(self._clock), rng.randint(*self.priority_range), rng.randint(*self.memory_range), burst)
+
+
+def generate_workload(count: Optional[int] = None, **params: Any) -> SyntheticWorkload:
+    # Parámetros de SyntheticWorkload; la misma semilla produce siempre la misma carga
+    return SyntheticWorkload(count, **params)
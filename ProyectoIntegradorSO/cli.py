@@ -1,30 +1,24 @@
 from rich.console import Console
 from rich.table import Table
-from rich.prompt import IntPrompt, Prompt
+from rich.prompt import Confirm, FloatPrompt, IntPrompt, Prompt
 from rich.panel import Panel
-from procesos import ProcessManager
-from recursos import SystemResources
-from planificador import SchedulerFactory, RoundRobinScheduler
-from comunicacion import message_system, producer_consumer
+from planificador import RoundRobinScheduler, MLFQScheduler
+from comunicacion import BROADCAST, OVERFLOW_POLICIES, ConditionVariable, Mutex, message_system, producer_consumer
+from comparacion import COLUMNS, compare_algorithms, compare_from_snapshot, snapshot_workload
+import instantanea
+import rendimiento
+from memoria import ALLOCATORS
+from registro import format_record
+from sesion import Session
+from trazas import TraceReplay
 console = Console()
 
-class CLI:
+
+class CLI(Session):
+    # Menús interactivos sobre una sesión del simulador; las operaciones y sus validaciones están en Session
     def __init__(self):
-        self.process_manager = ProcessManager()
-        self.resources = SystemResources()
-        self.scheduler = None
-        self.scheduler_algorithm = "fcfs"
-        self.quantum = 2
-        self.logs = []
-        self._setup_scheduler()
-
-    def _setup_scheduler(self):
-        self.scheduler = SchedulerFactory.create_scheduler(
-            self.scheduler_algorithm,
-            self.process_manager,
-            self.resources,
-            self.quantum
-        )
+        # Sistemas de comunicación compartidos del módulo; restaurar una instantánea los sustituye
+        super().__init__(message_system, producer_consumer)
 
     def show_menu(self) -> None:
         """Muestra el menú principal"""
@@ -43,60 +37,83 @@ class CLI:
             "10. Enviar mensaje entre procesos\n"
             "11. Ver mensajes de un proceso\n"
             "12. Simulación Productor-Consumidor\n"
+            "13. Generar carga de trabajo sintética\n"
+            "14. Ver métricas de planificación\n"
+            "15. Comparar algoritmos con la carga actual\n"
+            "16. Cambiar asignador de memoria\n"
+            "17. Configurar buzón de mensajes\n"
+            "18. Difusión, grupos y temas\n"
+            "19. Semáforos, mutex y variables de condición\n"
+            "20. Volcar el registro de eventos a disco (activar/desactivar)\n"
+            "21. Diario binario de eventos (activar/desactivar y consultar)\n"
+            "22. Instantáneas del simulador (guardar, restaurar y puntos de control)\n"
+            "23. Trazas (importar carga CSV/JSONL, grabar y reproducir)\n"
             "0. Salir"
         )
         console.print(
             "[dim italic]Nota: Los valores entre paréntesis son valores recomendados, pero puedes introducir valores diferentes según tus necesidades.[/dim italic]")
 
     def create_process_interactive(self) -> None:
-        try:
-            console.print(
-                "[italic]Los valores entre paréntesis son recomendados, pero puedes usar otros valores.[/italic]")
-            priority = IntPrompt.ask("Prioridad [dim](Recomendado: 1-5)[/dim]", default=3)
-
-            console.print(f"[dim]Memoria total: {self.resources.total_memory} MB[/dim]")
-            console.print(f"[dim]Memoria disponible: {self.resources.available_memory} MB[/dim]")
-
-            memory = IntPrompt.ask("Memoria a asignar (MB) [dim](Recomendado: 256)[/dim]", default=256)
-            burst_time = IntPrompt.ask("Tiempo de CPU [dim](Recomendado: 5, puedes usar cualquier valor)[/dim]",
-                                       default=5)
-
-            if priority < 1:
-                console.print("[yellow]⚠ Advertencia: La prioridad se ha ajustado al valor mínimo (1)[/yellow]")
-                priority = 1
+        console.print(
+            "[italic]Los valores entre paréntesis son recomendados, pero puedes usar otros valores.[/italic]")
+        priority = IntPrompt.ask("Prioridad [dim](Recomendado: 1-5)[/dim]", default=3)
 
-            if memory < 1:
-                console.print(f"[yellow]⚠ Advertencia: La memoria se ha ajustado al valor mínimo (1 MB)[/yellow]")
-                memory = 1
+        console.print(f"[dim]Memoria total: {self.resources.total_memory} MB[/dim]")
+        console.print(f"[dim]Memoria disponible: {self.resources.available_memory} MB[/dim]")
 
-            if burst_time < 1:
-                console.print("[yellow]⚠ Advertencia: El tiempo de CPU se ha ajustado al valor mínimo (1)[/yellow]")
-                burst_time = 1
+        memory = IntPrompt.ask("Memoria a asignar (MB) [dim](Recomendado: 256)[/dim]", default=256)
+        burst_time = IntPrompt.ask("Tiempo de CPU [dim](Recomendado: 5, puedes usar cualquier valor)[/dim]",
+                                   default=5)
 
-            # Verificar si hay memoria suficiente
-            if memory > self.resources.available_memory:
-                console.print(
-                    f"[red]✗ No hay suficiente memoria disponible. Disponible: {self.resources.available_memory} MB[/red]")
-                return
+        if priority < 1:
+            console.print("[yellow]⚠ Advertencia: La prioridad se ha ajustado al valor mínimo (1)[/yellow]")
+            priority = 1
 
-            new_process = self.process_manager.create_process(priority, memory, burst_time)
+        if memory < 1:
+            console.print(f"[yellow]⚠ Advertencia: La memoria se ha ajustado al valor mínimo (1 MB)[/yellow]")
+            memory = 1
 
-            success = self.resources.assign_memory(new_process.pid, memory)
-            if not success:
-                console.print(f"[red]✗ Error al asignar memoria al proceso[/red]")
+        if burst_time < 1:
+            console.print("[yellow]⚠ Advertencia: El tiempo de CPU se ha ajustado al valor mínimo (1)[/yellow]")
+            burst_time = 1
 
-                self.process_manager.processes.remove(new_process)
-                self.process_manager.ready_queue.remove(new_process)
-                return
+        try:
+            new_process = self.create_process(priority, memory, burst_time)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
 
-            message_system.create_queue(new_process.pid)
+        console.print(f"[green]✓ Proceso creado (PID: {new_process.pid})[/green]")
+        console.print(f"[dim]Memoria restante: {self.resources.available_memory} MB[/dim]")
+
+    def generate_workload_interactive(self) -> None:
+        console.print("[italic]Los procesos llegan según un proceso de Poisson a partir del tiempo actual "
+                      "y solo se admiten cuando hay memoria disponible.[/italic]")
+        count = IntPrompt.ask("Número de procesos a generar [dim](Recomendado: 20)[/dim]", default=20)
+        arrival_rate = FloatPrompt.ask("Llegadas por ciclo [dim](Recomendado: 0.2)[/dim]", default=0.2)
+        distribution = Prompt.ask("Distribución del tiempo de CPU", choices=["exponential", "pareto"],
+                                  default="exponential")
+        mean_burst = FloatPrompt.ask("Tiempo medio de CPU [dim](Recomendado: 5)[/dim]", default=5.0)
+        interactive_fraction = FloatPrompt.ask(
+            "Fracción de procesos interactivos [dim](ráfagas cortas y prioridad 1; 0 = ninguno)[/dim]", default=0.0)
+        seed = IntPrompt.ask("Semilla [dim](misma semilla, misma carga)[/dim]", default=42)
+
+        if count < 1:
+            console.print("[yellow]⚠ Advertencia: El número de procesos se ha ajustado al valor mínimo (1)[/yellow]")
+            count = 1
 
-            console.print(f"[green]✓ Proceso creado (PID: {new_process.pid})[/green]")
-            console.print(f"[dim]Memoria restante: {self.resources.available_memory} MB[/dim]")
-            self.logs.append(
-                f"Proceso {new_process.pid} creado con prioridad {priority}, memoria {memory}MB y tiempo {burst_time}")
+        try:
+            self.add_synthetic_workload(
+                count, seed=seed, arrival_rate=arrival_rate, burst_distribution=distribution,
+                mean_burst=mean_burst, memory_range=(16, min(256, self.resources.total_memory)),
+                interactive_fraction=interactive_fraction)
         except ValueError as e:
             console.print(f"[red]Error: {e}[/red]")
+            return
+
+        console.print(f"[green]✓ {count} procesos programados a partir del tiempo {self.scheduler.time}[/green]")
+        self.events.note(
+            f"Carga sintética: {count} procesos ({distribution}, {arrival_rate} llegadas/ciclo, semilla {seed})")
 
     def list_processes_table(self) -> None:
         table = Table(title="Procesos Activos")
@@ -109,18 +126,19 @@ class CLI:
 
         for p in self.process_manager.list_processes():
             state_color = {
+                "new": "cyan",
                 "ready": "blue",
                 "running": "green",
                 "waiting": "yellow",
                 "terminated": "red"
             }.get(p.state, "white")
 
-            msg_count = message_system.get_queue_size(p.pid)
+            msg_count = self.message_system.get_queue_size(p.pid)
             msg_display = f"[green]{msg_count}[/green]" if msg_count > 0 else "0"
 
             table.add_row(
                 str(p.pid),
-                f"[{state_color}]{p.state}[/{state_color}]",
+                f"[{state_color}]{self._state_label(p)}[/{state_color}]",
                 str(p.priority),
                 str(p.memory),
                 str(p.burst_time),
@@ -128,6 +146,8 @@ class CLI:
             )
 
         console.print(table)
+        if len(self.process_manager.archive):
+            console.print(f"[dim]{len(self.process_manager.archive)} procesos terminados archivados[/dim]")
 
         # Mostrar cola de procesos listos
         if self.process_manager.ready_queue:
@@ -154,12 +174,26 @@ class CLI:
         elif memory_percentage > 50:
             memory_color = "yellow"
 
-        table.add_row("CPU", f"[{cpu_color}]{cpu_status}[/{cpu_color}]", "1 núcleo")
+        if self.resources.cpu_cores == 1:
+            table.add_row("CPU", f"[{cpu_color}]{cpu_status}[/{cpu_color}]", "1 núcleo")
+        else:
+            owners = ", ".join(f"{core}: {'libre' if pid is None else f'P{pid}'}"
+                               for core, pid in enumerate(self.resources.core_owners))
+            table.add_row("CPU", f"[{cpu_color}]{status['Núcleos']}[/{cpu_color}]",
+                          f"{self.resources.cpu_cores} núcleos ({owners})")
         table.add_row(
             "Memoria",
             f"[{memory_color}]{self.resources.available_memory}/{self.resources.total_memory} MB libre[/{memory_color}]",
             f"Usado: {memory_used} MB ({memory_percentage:.1f}%)"
         )
+        memory_stats = self.resources.get_memory_stats()
+        table.add_row(
+            "Asignador",
+            memory_stats["allocator"],
+            f"Mayor bloque libre: {memory_stats['largest_free_block']} MB, "
+            f"fragmentación externa: {memory_stats['external_fragmentation']:.1%}, "
+            f"interna: {memory_stats['internal_fragmentation']} MB"
+        )
 
         console.print(table)
 
@@ -169,55 +203,74 @@ class CLI:
         console.print("2. SJF (Shortest Job First)")
         console.print("3. Prioridad")
         console.print("4. Round Robin")
+        console.print("5. SRTF (Shortest Remaining Time First, expropiativo)")
+        console.print("6. Prioridad expropiativa con envejecimiento")
+        console.print("7. MLFQ (colas multinivel con realimentación)")
+        console.print("8. CFS (reparto justo por tiempo virtual)")
+        console.print("9. Stride (reparto proporcional por zancadas)")
+        console.print("10. Lotería")
 
-        option = Prompt.ask("Seleccione un algoritmo", choices=["1", "2", "3", "4"])
-
-        # Guardar el algoritmo anterior para liberar recursos si es necesario
-        old_algorithm = self.scheduler_algorithm
-        old_scheduler = self.scheduler
+        option = Prompt.ask("Seleccione un algoritmo", choices=[str(n) for n in range(1, 11)])
 
+        # Los parámetros que no se preguntan conservan su valor actual
+        quantum = aging_interval = levels = boost_interval = None
         if option == "1":
-            self.scheduler_algorithm = "fcfs"
+            algorithm = "fcfs"
         elif option == "2":
-            self.scheduler_algorithm = "sjf"
+            algorithm = "sjf"
         elif option == "3":
-            self.scheduler_algorithm = "priority"
+            algorithm = "priority"
         elif option == "4":
-            self.scheduler_algorithm = "round_robin"
+            algorithm = "round_robin"
             console.print(
                 "[italic]El quantum determina cuántos ciclos se ejecuta cada proceso antes de ser interrumpido.[/italic]")
-            self.quantum = IntPrompt.ask(
+            quantum = IntPrompt.ask(
                 "Valor del quantum [dim](Recomendado: 2, puedes usar cualquier valor positivo)[/dim]", default=2)
-            if self.quantum < 1:
+            if quantum < 1:
                 console.print("[yellow]⚠ Advertencia: El quantum se ha ajustado al valor mínimo (1)[/yellow]")
-                self.quantum = 1
-
-        # Configurar el nuevo planificador
-        self._setup_scheduler()
-
-        # Limpiar estado previo y reiniciar estados si es necesario
-        self._reset_process_states()
-
+                quantum = 1
+        elif option == "5":
+            algorithm = "srtf"
+        elif option == "6":
+            algorithm = "priority_preemptive"
+            console.print("[italic]Cada intervalo de envejecimiento que un proceso pasa esperando "
+                          "mejora su prioridad en un nivel.[/italic]")
+            aging_interval = IntPrompt.ask("Intervalo de envejecimiento (ciclos)", default=self.aging_interval)
+        elif option == "7":
+            algorithm = "mlfq"
+            console.print("[italic]El quantum del nivel 0 se duplica en cada nivel inferior; el boost "
+                          "devuelve periódicamente todos los procesos al nivel 0.[/italic]")
+            levels = IntPrompt.ask("Número de niveles", default=self.mlfq_levels)
+            quantum = IntPrompt.ask("Quantum del nivel 0", default=self.quantum)
+            boost_interval = IntPrompt.ask("Intervalo de boost (ciclos)", default=self.boost_interval)
+        else:
+            algorithm = {"8": "cfs", "9": "stride", "10": "lottery"}[option]
+            console.print("[italic]Cada proceso recibe CPU en proporción a un peso derivado de su prioridad "
+                          "(prioridad 1 = mayor peso).[/italic]")
+            quantum = IntPrompt.ask("Porción base en ciclos", default=self.quantum)
+
+        cores = IntPrompt.ask("Número de núcleos de CPU [dim](Recomendado: 1)[/dim]", default=self.resources.cpu_cores)
+        if cores < 1:
+            console.print("[yellow]⚠ Advertencia: El número de núcleos se ha ajustado al valor mínimo (1)[/yellow]")
+            cores = 1
+        per_core_queues = cores > 1 and Confirm.ask(
+            "¿Usar una cola de listos por núcleo con robo de trabajo?", default=False)
+
+        self.set_algorithm(algorithm, quantum, cores, per_core_queues, aging_interval, levels, boost_interval)
         console.print(f"[green]✓ Algoritmo cambiado a: {self.scheduler.name}[/green]")
-        self.logs.append(f"Algoritmo cambiado a {self.scheduler.name}")
 
-    def _reset_process_states(self) -> None:
-        # Asegurarse de que la CPU esté disponible para el nuevo algoritmo
-        self.resources.cpu_available = True
+    def change_memory_allocator(self) -> None:
+        console.print("[italic]Ajuste primero/mejor/peor/siguiente: particiones variables con lista de huecos. "
+                      "buddy: bloques de potencias de dos. paging: marcos de 4 MB con tabla de páginas.[/italic]")
+        allocator = Prompt.ask("Asignador de memoria", choices=list(ALLOCATORS), default=self.resources.memory.name)
 
-        # Verificar si hay algún proceso en estado "running" y pasarlo a "ready"
-        for process in self.process_manager.processes:
-            if process.state == "running":
-                process.state = "ready"
-                self.logs.append(f"Proceso {process.pid} cambiado de running a ready al cambiar de algoritmo")
-
-        # Reiniciar el proceso actual en el planificador
-        if hasattr(self.scheduler, 'current_process'):
-            self.scheduler.current_process = None
+        try:
+            self.set_allocator(allocator)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
 
-        # Si es Round Robin, reiniciar el contador de quantum
-        if hasattr(self.scheduler, 'current_quantum'):
-            self.scheduler.current_quantum = 0
+        console.print(f"[green]✓ Asignador de memoria cambiado a: {allocator}[/green]")
 
     def run_simulation(self) -> None:
 
@@ -229,6 +282,15 @@ class CLI:
             console.print("[yellow]⚠ Advertencia: El número de ciclos se ha ajustado al valor mínimo (1)[/yellow]")
             cycles = 1
 
+        console.print(
+            "[italic]Detallado: muestra el estado en cada ciclo. Muestreo: solo cada N ciclos. "
+            "Resumen: solo el resultado final (recomendado para simulaciones largas).[/italic]")
+        mode = Prompt.ask("Modo de visualización", choices=["detallado", "muestreo", "resumen"],
+                          default="detallado")
+        if mode != "detallado":
+            self._run_headless_simulation(cycles, sampled=(mode == "muestreo"))
+            return
+
         # Mostrar tabla de estado inicial
         console.print("\n[bold]Estado inicial (Ciclo 0):[/bold]")
         self.list_processes_table()
@@ -242,161 +304,465 @@ class CLI:
 
             # Ejecutar un ciclo
             result = self.scheduler.execute_cycle()
-            event_type = result.get("event")
-            process = result.get("process")
-
-            # Generar descripción detallada del evento
-            event_desc = f"[yellow]→ Evento:[/yellow] "
-            if event_type == "process_started":
-                event_desc += f"Proceso {process.pid} iniciado (tiempo restante: {process.burst_time})"
-            elif event_type == "process_running":
-                event_desc += f"Proceso {process.pid} en ejecución (tiempo restante: {process.burst_time})"
-            elif event_type == "process_completed":
-                event_desc += f"Proceso {process.pid} completado"
-            elif event_type == "process_preempted":
-                event_desc += f"Proceso {process.pid} interrumpido por quantum (tiempo restante: {process.burst_time})"
-            elif event_type == "idle":
-                event_desc += "CPU inactiva"
-
-            # Mostrar evento actual
-            console.print(event_desc)
-
-            # Si estamos usando Round Robin, mostrar información del quantum
-            if isinstance(self.scheduler, RoundRobinScheduler) and process and event_type in ["process_running",
+
+            # Un evento por núcleo
+            for core_event in result["events"]:
+                event_type = core_event.get("event")
+                process = core_event.get("process")
+                core = core_event["core"]
+
+                # Generar descripción detallada del evento
+                event_desc = f"[yellow]→ Evento:[/yellow] "
+                if self.scheduler.cores > 1:
+                    event_desc += f"[dim]Núcleo {core}:[/dim] "
+                if event_type == "process_started":
+                    event_desc += f"Proceso {process.pid} iniciado (tiempo restante: {process.burst_time})"
+                elif event_type == "process_running":
+                    event_desc += f"Proceso {process.pid} en ejecución (tiempo restante: {process.burst_time})"
+                elif event_type == "process_completed":
+                    event_desc += f"Proceso {process.pid} completado"
+                elif event_type == "process_preempted":
+                    event_desc += (f"Proceso {process.pid} interrumpido por {self._interruption_cause()} "
+                                   f"(tiempo restante: {process.burst_time})")
+                elif event_type == "idle":
+                    event_desc += "CPU inactiva"
+
+                # Mostrar evento actual
+                console.print(event_desc)
+
+                # Si estamos usando Round Robin o MLFQ, mostrar información del quantum
+                if isinstance(self.scheduler, RoundRobinScheduler) and process and event_type in ["process_running",
+                                                                                                  "process_started"]:
+                    console.print(
+                        f"[dim]   Quantum actual: {self.scheduler.quantum_used[core]}/{self.scheduler.quantum}[/dim]")
+                elif isinstance(self.scheduler, MLFQScheduler) and process and event_type in ["process_running",
                                                                                               "process_started"]:
-                console.print(
-                    f"[dim]   Quantum actual: {self.scheduler.current_quantum}/{self.scheduler.quantum}[/dim]")
+                    level = self.scheduler.level_of(process)
+                    console.print(f"[dim]   Nivel {level}, quantum actual: "
+                                  f"{self.scheduler.quantum_used[core]}/{self.scheduler.quanta[level]}[/dim]")
+
+                # Registrar en logs
+                self._handle_simulation_event(core_event)
 
             # Mostrar estado actual después de cada ciclo
             console.print("\n[bold]Estado después del ciclo {0}:[/bold]".format(current_cycle))
             self.list_processes_table()
             self.show_resources()
 
-            # Registrar en logs
-            self._handle_simulation_event(result)
-
         console.print(f"\n[green]✓ Simulación completada: {current_cycle} ciclos ejecutados[/green]")
 
-    def _handle_simulation_event(self, event_info: dict) -> None:
-        event_type = event_info.get("event")
-
-        if event_type == "process_started":
-            process = event_info.get("process")
-            self.logs.append(
-                f"Ciclo {self.scheduler.time}: Proceso {process.pid} inició ejecución (tiempo restante: {process.burst_time})")
-
-        elif event_type == "process_running":
-            process = event_info.get("process")
-            self.logs.append(
-                f"Ciclo {self.scheduler.time}: Proceso {process.pid} en ejecución (tiempo restante: {process.burst_time})")
+    def _run_headless_simulation(self, cycles: int, sampled: bool = False) -> None:
+        interval = 0
+        if sampled:
+            interval = IntPrompt.ask("Mostrar el estado cada N ciclos", default=max(1, cycles // 10))
+            if interval < 1:
+                console.print("[yellow]⚠ Advertencia: El intervalo se ha ajustado al valor mínimo (1)[/yellow]")
+                interval = 1
+
+        executed = 0
+
+        def on_event(event_info: dict) -> None:
+            nonlocal executed
+            executed += event_info.get("cycles", 1)
+            if interval and executed % interval == 0:
+                console.print(f"\n[bold cyan]Ciclo {executed}/{cycles} - Tiempo global: {self.scheduler.time}[/bold cyan]")
+                self.list_processes_table()
+                self.show_resources()
+
+        # Sin muestreo no hace falta detenerse en cada ciclo: el tiempo avanza por eventos
+        try:
+            result = self.run(cycles, event_driven=not sampled, on_event=on_event)
+        except ValueError as e:
+            # Una carga importada con una fila no válida se detecta al llegar a ella
+            console.print(f"[red]✗ {e}[/red]")
+            return
 
-        elif event_type == "process_completed":
-            process = event_info.get("process")
-            self.logs.append(f"Ciclo {self.scheduler.time}: Proceso {process.pid} completado")
+        self._show_simulation_summary(result.summary)
+        self.events.note(
+            f"Simulación sin interfaz: {result.summary['cycles']} ciclos, "
+            f"{result.summary['completed']} procesos completados")
+
+    def _show_simulation_summary(self, summary: dict) -> None:
+        table = Table(title="Resumen de la simulación")
+        table.add_column("Métrica")
+        table.add_column("Valor")
+
+        events = summary["events"]
+        table.add_row("Algoritmo", summary["algorithm"])
+        table.add_row("Núcleos", str(summary["cores"]))
+        table.add_row("Ciclos ejecutados", str(summary["cycles"]))
+        table.add_row("Tiempo global", f"{summary['start_time']} → {summary['end_time']}")
+        table.add_row("Procesos iniciados", str(events.get("process_started", 0)))
+        table.add_row("Procesos completados", str(summary["completed"]))
+        table.add_row("Interrupciones (quantum o expropiación)", str(events.get("process_preempted", 0)))
+        table.add_row("Ciclos inactivos" if summary["cores"] == 1 else "Ciclos de núcleo inactivos",
+                      str(summary["idle_cycles"]))
+        table.add_row("Uso de CPU", f"{summary['cpu_utilization'] * 100:.1f}%")
+        table.add_row("Tiempo real", f"{summary['elapsed_seconds']:.3f} s")
+        memory = summary["memory"]
+        table.add_row("Asignador de memoria", memory["allocator"])
+        table.add_row("Fragmentación externa / interna",
+                      f"{memory['external_fragmentation']:.1%} / {memory['internal_fragmentation']} MB")
+        table.add_row("Asignaciones fallidas", f"{memory['failures']} de {memory['allocations'] + memory['failures']}")
+        table.add_row("Latencia media de asignación", f"{memory['mean_alloc_us']:.2f} µs")
 
-        elif event_type == "process_preempted":
-            process = event_info.get("process")
-            self.logs.append(
-                f"Ciclo {self.scheduler.time}: Proceso {process.pid} interrumpido por quantum (tiempo restante: {process.burst_time})")
+        console.print(table)
+        self._show_metrics_table(summary["metrics"])
+        console.print(f"[green]✓ Simulación completada: {summary['cycles']} ciclos ejecutados[/green]")
 
-        elif event_type == "idle":
-            self.logs.append(f"Ciclo {self.scheduler.time}: CPU inactiva")
+    def show_metrics(self) -> None:
+        report = self.scheduler.metrics.report()
+        if report["cycles"] == 0:
+            console.print("[yellow]Aún no se ha ejecutado ningún ciclo con el algoritmo actual[/yellow]")
+            return
+        self._show_metrics_table(report)
 
-    def suspend_process(self) -> None:
-        pid = IntPrompt.ask("PID del proceso a suspender")
+    def compare_algorithms_interactive(self) -> None:
+        try:
+            workload = snapshot_workload(self.process_manager)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
+        if not workload:
+            console.print("[yellow]No hay procesos pendientes que comparar[/yellow]")
+            return
 
-        process = next((p for p in self.process_manager.processes if p.pid == pid), None)
-        if not process:
-            console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
+        console.print("[italic]Se ejecuta una copia de la carga actual con cada algoritmo en paralelo; "
+                      "el estado de la simulación no se modifica.[/italic]")
+        quanta_text = Prompt.ask("Quantums de Round Robin y MLFQ separados por comas", default="1,2,4,8")
+        try:
+            quanta = sorted({max(1, int(q)) for q in quanta_text.split(",") if q.strip()})
+        except ValueError:
+            console.print("[red]✗ Los quantums deben ser números enteros[/red]")
             return
 
-        if process.state not in ["running", "ready"]:
-            console.print(
-                f"[red]✗ El proceso {pid} no está en ejecución o listo (estado actual: {process.state})[/red]")
+        cores_text = Prompt.ask("Números de núcleos separados por comas", default=str(self.resources.cpu_cores))
+        try:
+            core_counts = sorted({max(1, int(c)) for c in cores_text.split(",") if c.strip()})
+        except ValueError:
+            console.print("[red]✗ Los números de núcleos deben ser enteros[/red]")
             return
 
-        # Si el proceso está ejecutándose, liberar la CPU
-        if process.state == "running":
-            self.resources.cpu_available = True
-            # Si es el proceso actual del planificador, resetear
-            if self.scheduler.current_process and self.scheduler.current_process.pid == pid:
-                self.scheduler.current_process = None
+        with console.status("Ejecutando simulaciones..."):
+            rows = compare_algorithms(workload, quanta=quanta or [self.quantum],
+                                      core_counts=core_counts or [self.resources.cpu_cores],
+                                      per_core_queues=self.per_core_queues,
+                                      allocator=self.resources.memory.name)
 
-        process.state = "waiting"
-        console.print(f"[yellow]⏸ Proceso {pid} suspendido[/yellow]")
-        self.logs.append(f"Proceso {pid} suspendido")
+        table = Table(title=f"Comparación de algoritmos ({len(workload)} procesos)")
+        table.add_column("Algoritmo")
+        for _, header, _ in COLUMNS:
+            table.add_column(header, justify="right")
+        for row in rows:
+            table.add_row(row["name"], *(fmt.format(row[key]) for key, _, fmt in COLUMNS))
 
-    def resume_process(self) -> None:
-        pid = IntPrompt.ask("PID del proceso a reanudar")
+        console.print(table)
+        self.events.note(f"Comparación de {len(rows)} configuraciones sobre {len(workload)} procesos")
+
+    def _show_metrics_table(self, report: dict) -> None:
+        table = Table(title=f"Métricas de planificación - {self.scheduler.name}")
+        table.add_column("Métrica")
+        table.add_column("Valor")
+
+        table.add_row("Procesos completados", str(report["completed"]))
+        table.add_row("Núcleos", str(report["cores"]))
+        table.add_row("Throughput", f"{report['throughput']:.4f} procesos/ciclo")
+        table.add_row("Uso de CPU", f"{report['cpu_utilization'] * 100:.1f}%")
+        table.add_row("Espera media", f"{report['mean_waiting']:.2f} ciclos")
+        table.add_row("Espera p95 / p99", f"{report['p95_waiting']:.0f} / {report['p99_waiting']:.0f} ciclos")
+        table.add_row("Retorno medio", f"{report['mean_turnaround']:.2f} ciclos")
+        table.add_row("Respuesta media / p99", f"{report['mean_response']:.2f} / {report['p99_response']:.0f} ciclos")
+        table.add_row("Cambios de contexto", str(report["context_switches"]))
+        table.add_row("Expropiaciones", str(report["preemptions"]))
+        table.add_row("Índice de equidad (Jain)", f"{report['fairness']:.3f}")
+        table.add_row("Equidad ponderada por prioridad", f"{report['weighted_fairness']:.3f}")
 
-        process = next((p for p in self.process_manager.processes if p.pid == pid), None)
-        if not process:
-            console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
-            return
+        console.print(table)
 
-        if process.state != "waiting":
-            console.print(f"[red]✗ El proceso {pid} no está suspendido (estado actual: {process.state})[/red]")
+    def suspend_process(self) -> None:
+        pid = IntPrompt.ask("PID del proceso a suspender")
+        try:
+            self.suspend(pid)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
             return
+        console.print(f"[yellow]⏸ Proceso {pid} suspendido[/yellow]")
 
-        process.state = "ready"
+    def resume_process(self) -> None:
+        pid = IntPrompt.ask("PID del proceso a reanudar")
+        try:
+            self.resume(pid)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
         console.print(f"[green]▶ Proceso {pid} reanudado[/green]")
-        self.logs.append(f"Proceso {pid} reanudado")
 
     def terminate_process(self) -> None:
         pid = IntPrompt.ask("PID del proceso a terminar")
-
-        process = next((p for p in self.process_manager.processes if p.pid == pid), None)
-        if not process:
-            console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
-            return
-
-        if process.state == "terminated":
-            console.print(f"[red]✗ El proceso {pid} ya está terminado[/red]")
+        try:
+            process = self.kill(pid)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
             return
-
-        # Si el proceso está ejecutándose, liberar la CPU
-        if process.state == "running":
-            self.resources.cpu_available = True
-            # Si es el proceso actual del planificador, resetear
-            if self.scheduler.current_process and self.scheduler.current_process.pid == pid:
-                self.scheduler.current_process = None
-
-        # Liberar memoria
-        self.resources.release_memory(process.pid, process.memory)
-
-        process.state = "terminated"
         console.print(f"[red]⏹ Proceso {pid} terminado forzadamente[/red]")
         console.print(
             f"[dim]Memoria liberada: {process.memory} MB. Memoria restante: {self.resources.available_memory} MB[/dim]")
-        self.logs.append(f"Proceso {pid} terminado forzadamente")
 
     def show_logs(self) -> None:
-        if not self.logs:
+        if not len(self.events):
             console.print("[yellow]No hay eventos registrados[/yellow]")
             return
 
         # Crear tabla para mejor visualización
         table = Table(title="Registro de Eventos")
         table.add_column("#", style="dim")
+        table.add_column("Ciclo", style="dim", justify="right")
         table.add_column("Evento")
 
-        # Determinar cuántos logs mostrar
-        max_logs = 15  # Mostrar más logs que antes
-        start_idx = max(0, len(self.logs) - max_logs)
-
-        for i, log in enumerate(self.logs[start_idx:], start=start_idx + 1):
-            table.add_row(str(i), log)
+        # Solo se formatean los eventos que se muestran
+        max_logs = 15
+        shown = self.events.tail(max_logs)
+        first = self.events.total - len(shown) + 1
+        for i, record in enumerate(shown, start=first):
+            table.add_row(str(i), "" if record.cycle is None else str(record.cycle), format_record(record))
 
         console.print(table)
 
         # Indicar si hay más logs
-        if start_idx > 0:
-            console.print(f"[dim]... {start_idx} eventos anteriores no mostrados[/dim]")
+        hidden = first - 1 - self.events.cleared
+        if hidden > 0:
+            console.print(f"[dim]... {hidden} eventos anteriores no mostrados "
+                          f"({self.events.dropped} ya descartados del registro, capacidad {self.events.capacity})[/dim]")
+        if self.events.writing:
+            console.print(f"[dim]Volcado a disco activo: {self.events.written} eventos escritos[/dim]")
+
+    def toggle_log_writer(self) -> None:
+        if self.events.writing:
+            self.events.stop_writer()
+            console.print(f"[green]✓ Volcado detenido: {self.events.written} eventos escritos[/green]")
+            return
+
+        console.print("[italic]Un hilo en segundo plano añadirá los eventos nuevos al archivo (JSON Lines) "
+                      "por lotes.[/italic]")
+        path = Prompt.ask("Archivo de destino", default="eventos.jsonl")
+        try:
+            self.events.start_writer(path)
+        except OSError as e:
+            console.print(f"[red]✗ No se pudo abrir el archivo: {e}[/red]")
+            return
+        console.print(f"[green]✓ Volcando eventos a {path}[/green]")
+
+    def journal_menu(self) -> None:
+        # bitacora usa NumPy si está instalado: se carga al abrir el menú, no al arrancar la interfaz
+        from bitacora import Journal, JournalReader
+
+        console.print("[bold]Diario binario de eventos:[/bold]")
+        console.print("1. " + ("Desactivar" if self.journal is not None else "Activar") + " el diario")
+        console.print("2. Consultar eventos de un proceso")
+        console.print("3. Consultar eventos de un rango de ciclos")
+        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3"])
+
+        if option == "1":
+            if self.journal is not None:
+                self.events.remove_sink(self.journal.append)
+                self.journal.close()
+                console.print(f"[green]✓ Diario cerrado: {self.journal.records} eventos en "
+                              f"{self.journal.path}[/green]")
+                self.journal = None
+                return
+
+            console.print("[italic]Los eventos se anexan a un archivo binario de registros de tamaño fijo; "
+                          "si ya existe, se continúa.[/italic]")
+            path = Prompt.ask("Archivo del diario", default="eventos.diario")
+            try:
+                self.journal = Journal(path)
+            except (OSError, ValueError) as e:
+                console.print(f"[red]✗ No se pudo abrir el diario: {e}[/red]")
+                return
+            self.events.add_sink(self.journal.append)
+            console.print(f"[green]✓ Diario activo en {path} ({self.journal.records} eventos previos)[/green]")
+            return
+
+        default_path = self.journal.path if self.journal is not None else "eventos.diario"
+        path = Prompt.ask("Archivo del diario", default=default_path)
+        if self.journal is not None and path == self.journal.path:
+            self.journal.flush()
+        try:
+            reader = JournalReader(path)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]✗ No se pudo leer el diario: {e}[/red]")
+            return
+
+        with reader:
+            if option == "2":
+                pid = IntPrompt.ask("PID del proceso")
+                matches = reader.by_pid(pid)
+                title = f"Eventos del proceso {pid}"
+            else:
+                low, high = reader.cycle_range()
+                start = IntPrompt.ask("Ciclo inicial", default=low or 0)
+                end = IntPrompt.ask("Ciclo final", default=start)
+                matches = reader.by_cycle(start, end)
+                title = f"Eventos de los ciclos {start} a {end}"
+
+            # Solo se decodifican los eventos que se muestran (y uno más para saber si hay otros)
+            limit = 30
+            shown = []
+            for record in matches:
+                shown.append(record)
+                if len(shown) > limit:
+                    break
+
+            if not shown:
+                console.print(f"[yellow]No hay eventos en el diario ({len(reader)} registros)[/yellow]")
+                return
+
+            table = Table(title=f"{title} ({len(reader)} registros en el diario)")
+            table.add_column("Ciclo", style="dim", justify="right")
+            table.add_column("PID", justify="right")
+            table.add_column("Evento")
+            for record in shown[:limit]:
+                table.add_row("" if record.cycle is None else str(record.cycle),
+                              "" if record.pid is None else str(record.pid), format_record(record))
+            console.print(table)
+            if len(shown) > limit:
+                console.print(f"[dim]... se muestran solo los primeros {limit} eventos[/dim]")
+
+    def snapshot_menu(self) -> None:
+        console.print("[bold]Instantáneas del simulador:[/bold]")
+        console.print("1. Guardar instantánea")
+        console.print("2. Restaurar instantánea")
+        console.print("3. " + ("Desactivar" if self.checkpoint is not None else "Activar") +
+                      " puntos de control automáticos (simulación sin interfaz)")
+        console.print("4. Comparar algoritmos continuando desde el estado actual")
+        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3", "4"])
+
+        if option == "1":
+            path = Prompt.ask("Archivo de la instantánea", default="simulador.snap")
+            try:
+                size = self.save_snapshot(path)
+            except (OSError, ValueError) as e:
+                console.print(f"[red]✗ No se pudo guardar la instantánea: {e}[/red]")
+                return
+            console.print(f"[green]✓ Instantánea guardada en {path} (ciclo {self.scheduler.time}, "
+                          f"{size / 1024:.1f} KB)[/green]")
+            self.events.note(f"Instantánea guardada en {path}")
+
+        elif option == "2":
+            path = Prompt.ask("Archivo de la instantánea", default="simulador.snap")
+            try:
+                self.load_snapshot(path)
+            except (OSError, ValueError) as e:
+                console.print(f"[red]✗ No se pudo restaurar la instantánea: {e}[/red]")
+                return
+            console.print(f"[green]✓ Instantánea restaurada: {self.scheduler.name}, ciclo {self.scheduler.time}, "
+                          f"{len(self.process_manager.list_processes())} procesos[/green]")
+            self.events.note(f"Instantánea restaurada desde {path} (ciclo {self.scheduler.time})")
+
+        elif option == "3":
+            if self.checkpoint is not None:
+                console.print(f"[green]✓ Puntos de control desactivados ({self.checkpoint.saved} guardados "
+                              f"en {self.checkpoint.path})[/green]")
+                self.checkpoint = None
+                return
+
+            console.print("[italic]Durante las simulaciones en modo muestreo o resumen se guarda el estado cada "
+                          "N ciclos; tras una interrupción se puede restaurar con la opción 2.[/italic]")
+            path = Prompt.ask("Archivo de los puntos de control", default="punto_control.snap")
+            every = IntPrompt.ask("Guardar cada N ciclos", default=1000)
+            if every < 1:
+                console.print("[yellow]⚠ Advertencia: El intervalo se ha ajustado al valor mínimo (1)[/yellow]")
+                every = 1
+            self.enable_checkpoints(path, every)
+            console.print(f"[green]✓ Puntos de control activos en {path} cada {every} ciclos[/green]")
+
+        else:
+            cycles = IntPrompt.ask("Ciclos a simular desde el estado actual (0 = hasta completar)", default=0)
+            # Basta con el planificador y sus procesos y recursos; cada configuración parte de una copia
+            data = instantanea.dumps(instantanea.capture_simulation(self.scheduler))
+            with console.status("Simulando cada configuración desde la instantánea..."):
+                rows = compare_from_snapshot(data, quanta=[self.quantum], max_cycles=cycles or None,
+                                             per_core_queues=self.per_core_queues)
+
+            table = Table(title=f"Comparación de algoritmos desde el ciclo {self.scheduler.time}")
+            table.add_column("Algoritmo")
+            for _, header, _ in COLUMNS:
+                table.add_column(header, justify="right")
+            for row in rows:
+                table.add_row(row["name"], *(fmt.format(row[key]) for key, _, fmt in COLUMNS))
+            console.print(table)
+            self.events.note(f"Comparación de {len(rows)} configuraciones desde el ciclo {self.scheduler.time}")
+
+    def trace_menu(self) -> None:
+        console.print("[bold]Trazas:[/bold]")
+        console.print("1. Importar una carga de trabajo (CSV o JSONL)")
+        console.print("2. " + ("Detener" if self.recorder is not None else "Iniciar") +
+                      " la grabación de una traza de la sesión")
+        console.print("3. Reproducir una traza")
+        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3"])
+
+        if option == "1":
+            console.print("[italic]Columnas: time (o arrival), priority, memory y burst; id es opcional. "
+                          "Los trabajos se leen del archivo a medida que el reloj alcanza su llegada, "
+                          "así que el tamaño del archivo no importa.[/italic]")
+            path = Prompt.ask("Archivo de la carga", default="carga.csv")
+            shift = Confirm.ask(f"¿Desplazar las llegadas al instante actual ({self.scheduler.time})?",
+                                default=True)
+            try:
+                self.import_workload(path, offset=self.scheduler.time if shift else 0)
+            except (OSError, ValueError) as e:
+                console.print(f"[red]✗ No se pudo importar la carga: {e}[/red]")
+                return
+            console.print(f"[green]✓ Carga de {path} programada[/green]")
+
+        elif option == "2":
+            if self.recorder is not None:
+                path = self.recorder.path
+                rows = self.stop_recording()
+                console.print(f"[green]✓ Traza grabada en {path} ({rows} operaciones)[/green]")
+                return
+
+            console.print("[italic]Se guarda el estado actual junto a la traza y después cada operación con su "
+                          "instante (procesos, mensajes directos, buzones, sincronización, cargas y cambios "
+                          "de algoritmo o asignador).[/italic]")
+            path = Prompt.ask("Archivo de la traza", default="sesion.jsonl")
+            try:
+                self.start_recording(path)
+            except (OSError, ValueError) as e:
+                console.print(f"[red]✗ No se pudo iniciar la grabación: {e}[/red]")
+                return
+            console.print(f"[green]✓ Grabando la sesión en {path}[/green]")
+
+        else:
+            if self.recorder is not None:
+                console.print("[red]✗ Detenga antes la grabación en curso[/red]")
+                return
+            console.print("[italic]La reproducción sustituye el estado actual: si la traza se grabó, parte del "
+                          "estado guardado al iniciar la grabación.[/italic]")
+            path = Prompt.ask("Archivo de la traza", default="sesion.jsonl")
+            try:
+                with console.status("Reproduciendo la traza..."):
+                    report = TraceReplay(self, path).run()
+            except (OSError, ValueError) as e:
+                console.print(f"[red]✗ No se pudo reproducir la traza: {e}[/red]")
+                return
+
+            console.print(f"[green]✓ Traza reproducida: {report['rows']} filas aplicadas, "
+                          f"ciclo {report['time']}[/green]")
+            for time, op, reason in report["errors"][:10]:
+                console.print(f"[yellow]⚠ Ciclo {time}, {op}: {reason}[/yellow]")
+            if len(report["errors"]) > 10:
+                console.print(f"[dim]... {len(report['errors']) - 10} errores más[/dim]")
+            if report["matches"] is True:
+                console.print("[green]✓ El estado final coincide con el de la ejecución grabada[/green]")
+            elif report["matches"] is False:
+                console.print("[red]✗ El estado final difiere del de la ejecución grabada[/red]")
+            self.events.note(f"Traza reproducida desde {path} ({report['rows']} filas)")
 
     def send_message(self) -> None:
         # Mostrar procesos activos
         active_processes = [p for p in self.process_manager.processes
-                            if p.state != "terminated"]
+                            if p.state not in ("terminated", "new")]
 
         if len(active_processes) < 2:
             console.print("[red]✗ Se necesitan al menos dos procesos activos para enviar mensajes[/red]")
@@ -419,54 +785,52 @@ class CLI:
             }.get(p.state, "white")
 
             # Contar mensajes en la cola
-            msg_count = message_system.get_queue_size(p.pid)
+            msg_count = self.message_system.get_queue_size(p.pid)
             msg_display = f"[green]{msg_count}[/green]" if msg_count > 0 else "0"
 
             table.add_row(
                 str(p.pid),
-                f"[{state_color}]{p.state}[/{state_color}]",
+                f"[{state_color}]{self._state_label(p)}[/{state_color}]",
                 msg_display
             )
 
         console.print(table)
 
-        # Seleccionar proceso emisor
         sender_pid = IntPrompt.ask("PID del proceso emisor")
-        sender = next((p for p in active_processes if p.pid == sender_pid), None)
-        if not sender:
-            console.print(f"[red]✗ No se encontró proceso con PID {sender_pid}[/red]")
-            return
-
-        # Seleccionar proceso receptor
         receiver_pid = IntPrompt.ask("PID del proceso receptor")
-        receiver = next((p for p in active_processes if p.pid == receiver_pid), None)
-        if not receiver:
-            console.print(f"[red]✗ No se encontró proceso con PID {receiver_pid}[/red]")
-            return
-
-        # Introducir mensaje
         message = Prompt.ask("Mensaje")
 
-        # Enviar mensaje
-        result = message_system.send_message(sender_pid, receiver_pid, message)
-        if result:
+        try:
+            outcome = self.send(sender_pid, receiver_pid, message)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
+
+        if outcome == "blocked":
+            console.print(f"[yellow]⏸ Buzón de {receiver_pid} lleno: el proceso {sender_pid} queda bloqueado "
+                          f"hasta que haya sitio[/yellow]")
+        elif outcome == "sent":
             console.print(f"[green]✓ Mensaje enviado de proceso {sender_pid} a proceso {receiver_pid}[/green]")
-            self.logs.append(f"Mensaje enviado: {sender_pid} → {receiver_pid}")
         else:
-            console.print(f"[red]✗ Error al enviar mensaje[/red]")
+            console.print(f"[red]✗ Buzón de {receiver_pid} lleno: mensaje rechazado[/red]")
 
     def view_messages(self) -> None:
         pid = IntPrompt.ask("PID del proceso")
 
-        process = next((p for p in self.process_manager.processes if p.pid == pid), None)
+        process = self.process_manager.get_process_by_pid(pid)
         if not process:
             console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
             return
 
         # Verificar si hay mensajes
-        queue_size = message_system.get_queue_size(pid)
+        queue_size = self.message_system.get_queue_size(pid)
         if queue_size == 0:
             console.print(f"[yellow]El proceso {pid} no tiene mensajes[/yellow]")
+            if process.state in ("ready", "running") and Confirm.ask(
+                    "¿Bloquear el proceso hasta que llegue un mensaje?", default=False):
+                self.receive(pid, blocking=True)
+                if pid in self.process_manager.blocked:
+                    console.print(f"[yellow]⏸ Proceso {pid} bloqueado esperando un mensaje[/yellow]")
             return
 
         # Mostrar mensajes
@@ -474,21 +838,172 @@ class CLI:
 
         table = Table(title=f"Cola de mensajes: Proceso {pid}")
         table.add_column("De")
+        table.add_column("Canal")
         table.add_column("Mensaje")
         table.add_column("Acción", style="dim")
 
         # Recibir y mostrar todos los mensajes
-        for _ in range(queue_size):
-            message = message_system.receive_message(pid)
-            if message:
-                table.add_row(
-                    str(message["sender"]),
-                    message["content"],
-                    "Mensaje leído y eliminado de la cola"
-                )
+        for message in self.receive(pid):
+            table.add_row(
+                str(message.sender),
+                {None: "directo", BROADCAST: "difusión"}.get(message.channel, message.channel),
+                str(message.content),
+                "Mensaje leído y eliminado de la cola"
+            )
 
         console.print(table)
 
+    def configure_mailbox_interactive(self) -> None:
+        pid = IntPrompt.ask("PID del proceso")
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process or process.state == "terminated":
+            console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
+            return
+
+        self.message_system.create_queue(pid)
+        stats = self.message_system.get_queue_stats(pid)
+        console.print("[italic]block: el emisor se bloquea hasta que haya sitio; drop_oldest: se descarta el "
+                      "mensaje más antiguo; reject: se rechaza el nuevo. Capacidad 0 = sin límite.[/italic]")
+        capacity = IntPrompt.ask("Capacidad del buzón", default=stats["capacity"] or 0)
+        policy = Prompt.ask("Política de desbordamiento", choices=list(OVERFLOW_POLICIES), default=stats["policy"])
+
+        self.configure_mailbox(pid, capacity if capacity > 0 else None, policy)
+        stats = self.message_system.get_queue_stats(pid)
+        console.print(f"[green]✓ Buzón de {pid}: {stats['size']}/{stats['capacity'] or '∞'} mensajes, "
+                      f"política {policy} (descartados: {stats['dropped']}, rechazados: {stats['rejected']})[/green]")
+
+    def group_messaging(self) -> None:
+        console.print("[bold]Difusión, grupos y temas:[/bold]")
+        console.print("1. Unir proceso a un grupo")
+        console.print("2. Suscribir proceso a un tema")
+        console.print("3. Difundir a todos los procesos")
+        console.print("4. Enviar a un grupo")
+        console.print("5. Publicar en un tema")
+        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3", "4", "5"])
+
+        pid = IntPrompt.ask("PID del proceso" if option in ("1", "2") else "PID del proceso emisor")
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process or process.state in ("terminated", "new"):
+            console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
+            return
+        if option in ("3", "4", "5") and pid in self.process_manager.blocked:
+            console.print(f"[red]✗ El proceso {pid} está bloqueado y no puede enviar[/red]")
+            return
+
+        if option in ("1", "2"):
+            kind = "grupo" if option == "1" else "tema"
+            channel = Prompt.ask(f"Nombre del {kind}")
+            if option == "1":
+                self.join_group(pid, channel)
+            else:
+                self.subscribe(pid, channel)
+            console.print(f"[green]✓ Proceso {pid} añadido al {kind} '{channel}'[/green]")
+            return
+
+        channel = None
+        if option == "4":
+            channel = Prompt.ask("Nombre del grupo", choices=sorted(self.message_system.groups) or None)
+        elif option == "5":
+            channel = Prompt.ask("Nombre del tema")
+        message = Prompt.ask("Mensaje")
+
+        try:
+            if option == "3":
+                delivered = self.broadcast(pid, message)
+            elif option == "4":
+                delivered = self.multicast(pid, channel, message)
+            else:
+                delivered = self.publish(pid, channel, message)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
+
+        target = f"'{channel}'" if channel else "todos"
+        console.print(f"[green]✓ Mensaje de {pid} entregado a {delivered} procesos ({target})[/green]")
+
+    def synchronization(self) -> None:
+        console.print("[bold]Semáforos, mutex y variables de condición:[/bold]")
+        console.print("1. Crear semáforo")
+        console.print("2. Crear mutex")
+        console.print("3. Crear variable de condición")
+        console.print("4. wait / lock (esperar en semáforo, mutex o condición)")
+        console.print("5. signal / unlock / notify")
+        console.print("6. Ver estado")
+        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3", "4", "5", "6"])
+
+        if option in ("1", "2", "3"):
+            name = Prompt.ask("Nombre")
+            if name in self.sync_objects:
+                console.print(f"[red]✗ Ya existe un objeto llamado '{name}'[/red]")
+                return
+            if option == "1":
+                kind, value = "semaphore", IntPrompt.ask("Valor inicial", default=1)
+            elif option == "2":
+                kind, value = "mutex", None
+            else:
+                mutexes = [key for key, sync in self.sync_objects.items() if isinstance(sync, Mutex)]
+                if not mutexes:
+                    console.print("[red]✗ Cree primero un mutex para asociarlo a la condición[/red]")
+                    return
+                kind, value = "condition", Prompt.ask("Mutex asociado", choices=mutexes)
+            try:
+                self.create_sync(kind, name, value)
+            except ValueError as e:
+                console.print(f"[red]✗ {e}[/red]")
+                return
+            console.print(f"[green]✓ '{name}' creado[/green]")
+            return
+
+        if not self.sync_objects:
+            console.print("[yellow]No hay semáforos, mutex ni condiciones creados[/yellow]")
+            return
+
+        if option == "6":
+            table = Table(title="Objetos de sincronización")
+            table.add_column("Nombre", style="cyan")
+            table.add_column("Tipo")
+            table.add_column("Valor / dueño")
+            table.add_column("Cola de espera (FIFO)", style="yellow")
+            table.add_column("Adquisiciones")
+            table.add_column("Esperas")
+            for name, sync in self.sync_objects.items():
+                waiting = ", ".join(map(str, sync.get_waiting_processes())) or "-"
+                if isinstance(sync, ConditionVariable):
+                    table.add_row(name, f"condición ({sync.mutex.name})", "-", waiting, "-", "-")
+                    continue
+                stats = sync.get_stats()
+                if isinstance(sync, Mutex):
+                    kind, value = "mutex", f"PID {sync.owner}" if sync.owner is not None else "libre"
+                else:
+                    kind, value = "semáforo", str(stats["value"])
+                table.add_row(name, kind, value, waiting, str(stats["acquisitions"]), str(stats["contentions"]))
+            console.print(table)
+            return
+
+        name = Prompt.ask("Nombre", choices=list(self.sync_objects))
+        pid = IntPrompt.ask("PID del proceso")
+
+        try:
+            if option == "4":
+                if self.sync_wait(name, pid):
+                    console.print(f"[green]✓ Proceso {pid} adquirió '{name}'[/green]")
+                else:
+                    console.print(f"[yellow]⚠ Proceso {pid} bloqueado en '{name}' hasta que se le despierte[/yellow]")
+            else:
+                woken = self.sync_signal(name, pid)
+                if woken:
+                    console.print(f"[green]✓ Permiso de '{name}' entregado al proceso {woken[0]}, que pasa a "
+                                  f"listo[/green]")
+                else:
+                    console.print(f"[green]✓ Proceso {pid} liberó '{name}' (sin procesos en espera)[/green]")
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+
+    def _state_label(self, process) -> str:
+        # Estado del proceso y, si está bloqueado, el evento que espera
+        reason = self.process_manager.blocked.get(process.pid)
+        return process.state if reason is None else f"{process.state} ({reason})"
+
     def run_producer_consumer(self) -> None:
         console.print("[bold]Simulación del problema Productor-Consumidor[/bold]")
         console.print("[italic]Este problema demuestra sincronización entre procesos usando semáforos.[/italic]")
@@ -496,38 +1011,19 @@ class CLI:
         # Mostrar menú de opciones
         console.print("1. Registrar un proceso como productor")
         console.print("2. Registrar un proceso como consumidor")
-        console.print("3. Producir un item")
-        console.print("4. Consumir un item")
+        console.print("3. Producir items")
+        console.print("4. Consumir items")
         console.print("5. Ver estado del buffer y semáforos")
-        console.print("6. Ver logs de la simulación")
-        console.print("7. Volver al menú principal")
-
-        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3", "4", "5", "6", "7"])
-
-        if option == "1":
-            # Listar procesos activos
-            active_processes = [p for p in self.process_manager.processes if p.state != "terminated"]
-            if not active_processes:
-                console.print("[red]✗ No hay procesos activos disponibles[/red]")
-                return
+        console.print("6. Ver estadísticas por productor y consumidor")
+        console.print("7. Ver logs de la simulación")
+        console.print("8. Medir rendimiento con hilos reales o asyncio")
+        console.print("9. Volver al menú principal")
 
-            # Mostrar procesos para seleccionar
-            console.print("[bold]Procesos disponibles:[/bold]")
-            for p in active_processes:
-                console.print(f"PID: {p.pid} - Estado: {p.state}")
+        option = Prompt.ask("Seleccione una opción", choices=["1", "2", "3", "4", "5", "6", "7", "8", "9"])
 
-            # Seleccionar proceso
-            pid = IntPrompt.ask("PID del proceso a registrar como productor")
-            process = next((p for p in active_processes if p.pid == pid), None)
-            if not process:
-                console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
-                return
-
-            # Registrar como productor
-            producer_consumer.set_producer(pid)
-            console.print(f"[green]✓ Proceso {pid} registrado como productor[/green]")
+        if option in ("1", "2"):
+            role = "productor" if option == "1" else "consumidor"
 
-        elif option == "2":
             # Listar procesos activos
             active_processes = [p for p in self.process_manager.processes if p.state != "terminated"]
             if not active_processes:
@@ -540,79 +1036,62 @@ class CLI:
                 console.print(f"PID: {p.pid} - Estado: {p.state}")
 
             # Seleccionar proceso
-            pid = IntPrompt.ask("PID del proceso a registrar como consumidor")
-            process = next((p for p in active_processes if p.pid == pid), None)
-            if not process:
+            pid = IntPrompt.ask(f"PID del proceso a registrar como {role}")
+            process = self.process_manager.get_process_by_pid(pid)
+            if not process or process.state == "terminated":
                 console.print(f"[red]✗ No se encontró proceso con PID {pid}[/red]")
                 return
 
-            # Registrar como consumidor
-            producer_consumer.set_consumer(pid)
-            console.print(f"[green]✓ Proceso {pid} registrado como consumidor[/green]")
+            # Puede haber cualquier número de productores y consumidores
+            if option == "1":
+                self.add_producer(pid)
+            else:
+                self.add_consumer(pid)
+            console.print(f"[green]✓ Proceso {pid} registrado como {role}[/green]")
 
         elif option == "3":
-            # Verificar si hay un productor registrado
-            producer_pid = producer_consumer.producer_pid
+            producer_pid = self._pick_party(self.producer_consumer.producers, "productor", 1)
             if producer_pid is None:
-                console.print("[yellow]⚠ No hay ningún proceso registrado como productor[/yellow]")
-                console.print("[yellow]⚠ Utilice la opción 1 para registrar un productor primero[/yellow]")
                 return
 
-            # Verificar si el productor existe y está activo
-            producer = next((p for p in self.process_manager.processes if p.pid == producer_pid), None)
-            if not producer or producer.state == "terminated":
-                console.print(f"[red]✗ El productor (PID {producer_pid}) ya no está disponible[/red]")
+            # Varios items separados por comas se producen como un lote
+            items = [item.strip() for item in Prompt.ask("Items a producir (separados por comas)").split(",")
+                     if item.strip()]
+            if not items:
+                console.print("[red]✗ No se indicó ningún item[/red]")
                 return
 
-            # Solicitar item a producir
-            item = Prompt.ask("Item a producir")
-
-            # Intentar producir
-            result = producer_consumer.produce(producer_pid, item)
-            if result:
-                console.print(f"[green]✓ Item '{item}' producido correctamente por proceso {producer_pid}[/green]")
-
-                # Actualizar registro
-                self.logs.append(f"Productor {producer_pid} produjo item '{item}'")
-            else:
-                console.print(f"[yellow]⚠ No se pudo producir el item (buffer lleno o proceso bloqueado)[/yellow]")
+            produced = self.produce(producer_pid, items)
+            if produced:
+                console.print(f"[green]✓ {produced} items producidos por proceso {producer_pid}[/green]")
+            if produced < len(items):
+                console.print(f"[yellow]⚠ Buffer lleno: el productor {producer_pid} queda bloqueado y producirá "
+                              f"los items pendientes ({len(items) - produced}) a medida que se consuman[/yellow]")
 
-                # Mostrar estado del buffer
-                status = producer_consumer.get_buffer_status()
-                console.print(
-                    f"[dim]Estado del buffer: {len(status['buffer_content'])}/{status['buffer_size']} items[/dim]")
+            # Mostrar estado del buffer
+            status = self.producer_consumer.get_buffer_status()
+            console.print(f"[dim]Estado del buffer: {status['items_in_buffer']}/{status['buffer_size']} items[/dim]")
 
         elif option == "4":
-            # Verificar si hay un consumidor registrado
-            consumer_pid = producer_consumer.consumer_pid
+            consumer_pid = self._pick_party(self.producer_consumer.consumers, "consumidor", 2)
             if consumer_pid is None:
-                console.print("[yellow]⚠ No hay ningún proceso registrado como consumidor[/yellow]")
-                console.print("[yellow]⚠ Utilice la opción 2 para registrar un consumidor primero[/yellow]")
-                return
-
-            # Verificar si el consumidor existe y está activo
-            consumer = next((p for p in self.process_manager.processes if p.pid == consumer_pid), None)
-            if not consumer or consumer.state == "terminated":
-                console.print(f"[red]✗ El consumidor (PID {consumer_pid}) ya no está disponible[/red]")
                 return
 
-            # Intentar consumir
-            item = producer_consumer.consume(consumer_pid)
-            if item:
-                console.print(f"[green]✓ Item '{item}' consumido correctamente por proceso {consumer_pid}[/green]")
-
-                # Actualizar registro
-                self.logs.append(f"Consumidor {consumer_pid} consumió item '{item}'")
+            count = IntPrompt.ask("Número máximo de items a consumir", default=1)
+            items = self.consume(consumer_pid, max(1, count))
+            if items:
+                console.print(f"[green]✓ Items consumidos por proceso {consumer_pid}: "
+                              f"{', '.join(map(str, items))}[/green]")
             else:
-                console.print(f"[yellow]⚠ No se pudo consumir ningún item (buffer vacío o proceso bloqueado)[/yellow]")
+                console.print(f"[yellow]⚠ Buffer vacío: el consumidor {consumer_pid} queda bloqueado y consumirá "
+                              f"el próximo item producido[/yellow]")
 
-                # Mostrar estado del buffer
-                status = producer_consumer.get_buffer_status()
-                console.print(
-                    f"[dim]Estado del buffer: {len(status['buffer_content'])}/{status['buffer_size']} items[/dim]")
+            # Mostrar estado del buffer
+            status = self.producer_consumer.get_buffer_status()
+            console.print(f"[dim]Estado del buffer: {status['items_in_buffer']}/{status['buffer_size']} items[/dim]")
 
         elif option == "5":
-            status = producer_consumer.get_buffer_status()
+            status = self.producer_consumer.get_buffer_status()
 
             # Crear representación visual del buffer
             buffer_visual = "["
@@ -624,8 +1103,8 @@ class CLI:
             buffer_visual += "]"
 
             # Información sobre procesos registrados
-            producer_info = f"PID {status['producer_pid']}" if status['producer_pid'] else "Ninguno"
-            consumer_info = f"PID {status['consumer_pid']}" if status['consumer_pid'] else "Ninguno"
+            producer_info = ", ".join(f"PID {pid}" for pid in status["producers"]) or "Ninguno"
+            consumer_info = ", ".join(f"PID {pid}" for pid in status["consumers"]) or "Ninguno"
 
             # Información sobre semáforos
             mutex_info = f"Valor: {status['mutex_value']}"
@@ -649,15 +1128,37 @@ class CLI:
                 f"empty: {empty_info}\n"
                 f"full: {full_info}\n\n"
                 f"[bold]Procesos:[/bold]\n"
-                f"Productor: {producer_info}\n"
-                f"Consumidor: {consumer_info}",
+                f"Productores: {producer_info}\n"
+                f"Consumidores: {consumer_info}",
                 title="Estado del Productor-Consumidor",
                 expand=False
             ))
 
         elif option == "6":
-            logs = producer_consumer.get_logs()
-            if not logs:
+            party_stats = self.producer_consumer.get_party_stats()
+            if not party_stats["producers"] and not party_stats["consumers"]:
+                console.print("[yellow]No hay productores ni consumidores registrados[/yellow]")
+                return
+
+            table = Table(title="Estadísticas por proceso (tiempos en ciclos)")
+            table.add_column("PID", style="cyan")
+            table.add_column("Papel")
+            table.add_column("Items", justify="right")
+            table.add_column("Lotes", justify="right")
+            table.add_column("Items/ciclo", justify="right")
+            table.add_column("Esperas", justify="right")
+            table.add_column("Ciclos bloqueado", justify="right")
+            table.add_column("Estado")
+            for role, key in (("productor", "producers"), ("consumidor", "consumers")):
+                for pid, stats in party_stats[key].items():
+                    table.add_row(str(pid), role, str(stats["items"]), str(stats["batches"]),
+                                  f"{stats['throughput']:.2f}", str(stats["waits"]), str(stats["wait_cycles"]),
+                                  "[yellow]bloqueado[/yellow]" if stats["blocked"] else "activo")
+            console.print(table)
+
+        elif option == "7":
+            events = self.producer_consumer.events
+            if not len(events):
                 console.print("[yellow]No hay eventos registrados en la simulación[/yellow]")
             else:
                 # Crear tabla para mejor visualización
@@ -665,11 +1166,72 @@ class CLI:
                 table.add_column("#", style="dim")
                 table.add_column("Evento")
 
-                for i, log in enumerate(logs[-20:], start=max(1, len(logs) - 20)):
-                    table.add_row(str(i), log)
+                shown = events.tail(20)
+                first = events.total - len(shown) + 1
+                for i, record in enumerate(shown, start=first):
+                    table.add_row(str(i), format_record(record))
 
                 console.print(table)
 
                 # Indicar si hay más eventos no mostrados
-                if len(logs) > 20:
-                    console.print(f"[dim]... {len(logs) - 20} eventos anteriores no mostrados[/dim]")
\ No newline at end of file
+                hidden = first - 1 - events.cleared
+                if hidden > 0:
+                    console.print(f"[dim]... {hidden} eventos anteriores no mostrados[/dim]")
+
+        elif option == "8":
+            self._benchmark_producer_consumer()
+
+    def _benchmark_producer_consumer(self) -> None:
+        console.print("[italic]Se crea un buffer nuevo por cada tamaño; la simulación actual no se modifica.[/italic]")
+        mode = Prompt.ask("Modo", choices=list(rendimiento.MODES), default="threads")
+        producers = IntPrompt.ask("Productores", default=2)
+        consumers = IntPrompt.ask("Consumidores", default=2)
+        items = IntPrompt.ask("Items en total", default=20000)
+        batch = IntPrompt.ask("Tamaño de lote", default=1)
+        sizes_text = Prompt.ask("Tamaños de buffer separados por comas",
+                                default=",".join(map(str, rendimiento.DEFAULT_BUFFER_SIZES)))
+        try:
+            sizes = sorted({int(size) for size in sizes_text.split(",") if size.strip()})
+            with console.status("Midiendo..."):
+                rows = rendimiento.benchmark_grid(sizes, producers, consumers, items, batch, mode)
+        except ValueError as e:
+            console.print(f"[red]✗ Parámetros no válidos: {e}[/red]")
+            return
+
+        table = Table(title=f"Rendimiento del productor-consumidor ({mode}, {items} items)")
+        for _, header, _ in rendimiento.COLUMNS:
+            table.add_column(header, justify="right")
+        for row in rows:
+            table.add_row(*(fmt.format(row[key]) for key, _, fmt in rendimiento.COLUMNS))
+        console.print(table)
+
+        path = Prompt.ask("Archivo JSON para guardar los resultados (vacío para no guardar)", default="")
+        if path:
+            try:
+                rendimiento.save_results(rows, path)
+            except OSError as e:
+                console.print(f"[red]✗ No se pudo guardar: {e}[/red]")
+                return
+            console.print(f"[green]✓ Resultados guardados en {path}[/green]")
+        self.events.note(f"Benchmark productor-consumidor ({mode}) con buffers {', '.join(map(str, sizes))}")
+
+    def _pick_party(self, parties, role: str, register_option: int):
+        # Elige el productor o consumidor que opera; si solo hay uno no pregunta
+        if not parties:
+            console.print(f"[yellow]⚠ No hay ningún proceso registrado como {role}[/yellow]")
+            console.print(f"[yellow]⚠ Utilice la opción {register_option} para registrar un {role} primero[/yellow]")
+            return None
+
+        pids = list(parties)
+        pid = pids[0] if len(pids) == 1 else int(Prompt.ask(f"PID del {role}", choices=list(map(str, pids))))
+
+        # Verificar si el proceso existe y está activo
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process or process.state == "terminated":
+            console.print(f"[red]✗ El {role} (PID {pid}) ya no está disponible[/red]")
+            return None
+        if pid in self.process_manager.blocked:
+            console.print(f"[yellow]⚠ El {role} (PID {pid}) está bloqueado: "
+                          f"{self.process_manager.blocked[pid]}[/yellow]")
+            return None
+        return pid
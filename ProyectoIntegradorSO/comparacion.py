@@ -0,0 +1,221 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+from procesos import ProcessManager
+from recursos import SystemResources
+from planificador import SchedulerFactory
+from simulacion import SimulationEngine
+from carga import generate_workload
+import instantanea
+
+ALGORITHMS = ("fcfs", "sjf", "priority", "round_robin", "srtf", "priority_preemptive", "mlfq",
+              "cfs", "stride", "lottery")
+# Algoritmos que se comparan con cada quantum (en MLFQ, el del nivel superior)
+QUANTUM_ALGORITHMS = ("round_robin", "mlfq")
+DEFAULT_QUANTA = (1, 2, 4, 8)
+# Procesos como máximo que snapshot_workload copia (una carga sintética puede no tener fin)
+SNAPSHOT_LIMIT = 1_000_000
+
+# Columnas de la tabla comparativa: (clave del informe, encabezado, formato)
+COLUMNS = (
+    ("cores", "Núcleos", "{:d}"),
+    ("completed", "Completados", "{:d}"),
+    ("cycles", "Ciclos", "{:d}"),
+    ("throughput", "Throughput", "{:.4f}"),
+    ("cpu_utilization", "CPU", "{:.1%}"),
+    ("mean_waiting", "Espera media", "{:.2f}"),
+    ("p95_waiting", "Espera p95", "{:.0f}"),
+    ("p99_waiting", "Espera p99", "{:.0f}"),
+    ("mean_response", "Respuesta media", "{:.2f}"),
+    ("p99_response", "Respuesta p99", "{:.0f}"),
+    ("context_switches", "Cambios ctx", "{:d}"),
+    ("fairness", "Equidad", "{:.3f}"),
+    ("weighted_fairness", "Equidad pond.", "{:.3f}"),
+)
+
+
+def snapshot_workload(process_manager: ProcessManager, limit: int = SNAPSHOT_LIMIT) -> List[tuple]:
+    """
+    Copia la carga de trabajo pendiente de un ProcessManager como tuplas
+    (llegada, prioridad, memoria, tiempo restante) ordenadas por llegada, sin
+    modificar el estado original. Incluye lo que falta de la carga perezosa
+    conectada (attach_workload), leído de una copia, hasta limit procesos.
+    Las llegadas se desplazan para que la primera ocurra en el instante 0.
+    """
+    pending = [p for p in process_manager.list_processes() if p.state != "terminated" and p.burst_time > 0]
+    specs = [(p.arrival_time, p.priority, p.memory, p.burst_time) for p in pending]
+    specs.extend(itertools.islice(process_manager.upcoming_workload(), limit + 1 - len(specs)))
+    if len(specs) > limit:
+        raise ValueError(f"La carga pendiente supera los {limit} procesos y no se puede copiar completa")
+    if not specs:
+        return []
+
+    base = min(spec[0] for spec in specs)
+    specs = [(arrival - base, priority, memory, burst) for arrival, priority, memory, burst in specs]
+    specs.sort(key=lambda spec: spec[0])
+    return specs
+
+
+def run_configuration(workload: Union[Sequence[tuple], Dict], algorithm: str, quantum: int = 2,
+                      max_cycles: Optional[int] = None, cores: int = 1, per_core_queues: bool = False,
+                      allocator: str = "first_fit", batch: bool = True) -> Dict:
+    """
+    Ejecuta una carga completa con un algoritmo sobre un sistema nuevo de
+    cores núcleos y con el asignador de memoria indicado. Las políticas no
+    expropiativas se calculan en lote (lotes.py) cuando nada puede alterar
+    el plan: sin límite de ciclos, con cola compartida y sin esperas de
+    memoria; si no, se simula ciclo a ciclo. Es el único camino que usa
+    el cálculo en lote, y solo FCFS con un núcleo está vectorizado.
+    workload puede ser una lista de tuplas o un diccionario de argumentos
+    para generate_workload (cada proceso trabajador la regenera a partir de
+    la semilla en lugar de recibirla serializada).
+    """
+    process_manager = ProcessManager()
+    resources = SystemResources(cores, allocator)
+    scheduler = SchedulerFactory.create_scheduler(algorithm, process_manager, resources, quantum, per_core_queues)
+    row = {
+        "algorithm": algorithm,
+        "quantum": quantum if algorithm in QUANTUM_ALGORITHMS else None,
+        "name": scheduler.name
+    }
+    started_at = time.perf_counter()
+
+    if batch and max_cycles is None and not per_core_queues:
+        # lotes usa NumPy si está instalado: se carga al comparar, no al arrancar la interfaz
+        from lotes import BATCH_ALGORITHMS, run_batch
+
+        if algorithm in BATCH_ALGORITHMS:
+            specs = list(generate_workload(**workload)) if isinstance(workload, dict) else workload
+            planned = run_batch(specs, algorithm, cores, allocator, resources.total_memory)
+            if planned is not None:
+                row["wall_seconds"] = time.perf_counter() - started_at
+                row["batch"] = True
+                row.update(planned.metrics.report())
+                row["external_fragmentation"] = planned.memory["external_fragmentation"]
+                return row
+            workload = specs
+
+    if isinstance(workload, dict):
+        process_manager.attach_workload(generate_workload(**workload))
+    else:
+        process_manager.attach_workload(workload)
+
+    result = SimulationEngine(scheduler).run(max_cycles, until_complete=True, record_events=False,
+                                             event_driven=True)
+    row["wall_seconds"] = time.perf_counter() - started_at
+    row["batch"] = False
+    row.update(result.summary["metrics"])
+    row["external_fragmentation"] = result.summary["memory"]["external_fragmentation"]
+    return row
+
+
+def run_from_snapshot(data: bytes, algorithm: str, quantum: int = 2, max_cycles: Optional[int] = None,
+                      per_core_queues: bool = False) -> Dict:
+    """
+    Continúa la simulación de una instantánea (instantanea.dumps) con otro
+    algoritmo, sobre su propia copia del estado. Se conservan el reloj y
+    las métricas acumuladas, y los procesos en ejecución vuelven a la cola
+    de listos, igual que al cambiar de algoritmo desde la interfaz.
+    """
+    state = instantanea.fork(data)
+    process_manager, resources, previous = state["process_manager"], state["resources"], state["scheduler"]
+    resources.release_all_cores()
+    scheduler = SchedulerFactory.create_scheduler(algorithm, process_manager, resources, quantum, per_core_queues)
+    scheduler.time = previous.time
+    scheduler.metrics = previous.metrics
+    for process in process_manager.processes:
+        if process.state == "running":
+            process.state = "ready"
+            process_manager.ready_queue.refresh(process)
+
+    row = {
+        "algorithm": algorithm,
+        "quantum": quantum if algorithm in QUANTUM_ALGORITHMS else None,
+        "name": scheduler.name,
+        "batch": False
+    }
+    started_at = time.perf_counter()
+    result = SimulationEngine(scheduler).run(max_cycles, until_complete=True, record_events=False,
+                                             event_driven=True)
+    row["wall_seconds"] = time.perf_counter() - started_at
+    row.update(result.summary["metrics"])
+    row["external_fragmentation"] = result.summary["memory"]["external_fragmentation"]
+    return row
+
+
+def compare_from_snapshot(data: bytes, algorithms: Sequence[str] = ALGORITHMS,
+                          quanta: Sequence[int] = DEFAULT_QUANTA, max_cycles: Optional[int] = None,
+                          workers: Optional[int] = None, per_core_queues: bool = False) -> List[Dict]:
+    """
+    Barrido de algoritmos a partir de un estado ya caliente: el
+    calentamiento se simula una sola vez y cada configuración continúa
+    desde la misma instantánea (los trabajadores reciben los bytes ya
+    serializados). Los núcleos y el asignador son los de la instantánea.
+    """
+    configurations = []
+    for algorithm in algorithms:
+        if algorithm in QUANTUM_ALGORITHMS:
+            configurations.extend((algorithm, quantum) for quantum in quanta)
+        else:
+            configurations.append((algorithm, 2))
+
+    workers = workers or min(len(configurations), os.cpu_count() or 1)
+    if workers <= 1:
+        return [run_from_snapshot(data, algorithm, quantum, max_cycles, per_core_queues)
+                for algorithm, quantum in configurations]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_from_snapshot, data, algorithm, quantum, max_cycles, per_core_queues)
+                   for algorithm, quantum in configurations]
+        return [future.result() for future in futures]
+
+
+def compare_algorithms(workload: Union[Sequence[tuple], Dict], algorithms: Sequence[str] = ALGORITHMS,
+                       quanta: Sequence[int] = DEFAULT_QUANTA, max_cycles: Optional[int] = None,
+                       workers: Optional[int] = None, core_counts: Sequence[int] = (1,),
+                       per_core_queues: bool = False, allocator: str = "first_fit") -> List[Dict]:
+    """
+    Ejecuta la misma carga con cada algoritmo (con cada quantum para Round
+    Robin y MLFQ, y con cada número de núcleos de core_counts, para medir
+    cómo escala cada política) en procesos trabajadores paralelos. Cada
+    configuración trabaja sobre su propia copia, así que no se toca el
+    estado de la simulación interactiva. Devuelve una fila de métricas por
+    configuración, en el orden solicitado.
+    """
+    if not isinstance(workload, dict):
+        workload = list(workload)
+
+    configurations = []
+    for algorithm in algorithms:
+        for cores in core_counts:
+            if algorithm in QUANTUM_ALGORITHMS:
+                configurations.extend((algorithm, quantum, cores) for quantum in quanta)
+            else:
+                configurations.append((algorithm, 2, cores))
+
+    workers = workers or min(len(configurations), os.cpu_count() or 1)
+    if workers <= 1:
+        return [run_configuration(workload, algorithm, quantum, max_cycles, cores, per_core_queues, allocator)
+                for algorithm, quantum, cores in configurations]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_configuration, workload, algorithm, quantum, max_cycles, cores,
+                                   per_core_queues, allocator)
+                   for algorithm, quantum, cores in configurations]
+        return [future.result() for future in futures]
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    # Tabla comparativa en texto plano, para uso sin rich
+    headers = ["Algoritmo"] + [header for _, header, _ in COLUMNS]
+    lines = [[row["name"]] + [fmt.format(row[key]) for key, _, fmt in COLUMNS] for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *lines)]
+
+    def render(cells) -> str:
+        return "  ".join(str(cell).ljust(width) for cell, width in zip(cells, widths))
+
+    output = [render(headers), "  ".join("-" * width for width in widths)]
+    output.extend(render(line) for line in lines)
+    return "\n".join(output)
@@ -1,109 +1,649 @@
-import queue
 import time
 import threading
-from typing import Dict, Any, List, Optional, Union, Tuple
+from collections import deque
+from functools import partial
+from itertools import repeat
+from typing import Callable, Dict, Any, Iterable, List, NamedTuple, Optional
+from registro import EventLog, format_record, register_formats
+
+class Message(NamedTuple):
+    """
+    Mensaje entre procesos.
+    Es una tupla con nombre: unas pocas decenas de bytes por mensaje, sin
+    diccionario, e inmutable, así que puede compartirse sin copiarla.
+    """
+    id: int
+    sender: int
+    content: Any
+    timestamp: float
+    channel: Optional[str] = None  # Grupo o tema por el que llegó; None en los directos, "*" en las difusiones
+
+
+# Construye un Message a partir de una tupla (id, emisor, contenido, marca, canal) sin pasar por __new__ en Python
+_new_message = partial(tuple.__new__, Message)
+
+
+class IdAllocator:
+    """
+    Generador de identificadores seguro entre hilos.
+    reserve entrega un bloque contiguo con un solo bloqueo, de modo que un
+    envío por lotes no paga la sincronización por cada mensaje.
+    """
+
+    __slots__ = ("_lock", "_next")
+
+    def __init__(self, start: int = 1):
+        self._lock = threading.Lock()
+        self._next = start
+
+    def next_id(self) -> int:
+        with self._lock:
+            value = self._next
+            self._next += 1
+            return value
+
+    def reserve(self, count: int) -> range:
+        with self._lock:
+            first = self._next
+            self._next += count
+            return range(first, first + count)
+
+    @property
+    def last(self) -> int:
+        # Último identificador entregado (0 si todavía no se entregó ninguno)
+        return self._next - 1
+
+    # El candado no se serializa: al restaurar se crea uno nuevo
+    def __getstate__(self) -> int:
+        return self._next
+
+    def __setstate__(self, state: int) -> None:
+        self._lock = threading.Lock()
+        self._next = state
+
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "reject")
+BROADCAST = "*"  # Canal de los mensajes difundidos a todos los procesos
+
+
+class Mailbox:
+    """
+    Buzón de un proceso, opcionalmente acotado.
+    Con el buzón lleno, la política decide qué pasa con un envío: "block"
+    bloquea al emisor (el mensaje espera en blocked_senders hasta que haya
+    hueco), "drop_oldest" descarta el mensaje más antiguo y "reject"
+    rechaza el nuevo. Así la memoria queda acotada ante ráfagas de envíos.
+    """
+
+    __slots__ = ("messages", "capacity", "policy", "blocked_senders", "receiver_blocked",
+                 "dropped", "rejected", "blocked_sends")
+
+    def __init__(self, capacity: Optional[int] = None, policy: str = "block"):
+        self.messages = deque()
+        self.configure(capacity, policy)
+        self.blocked_senders = deque()  # (pid, mensaje) de emisores bloqueados, en orden FIFO
+        self.receiver_blocked = False  # El dueño del buzón espera un mensaje
+        self.dropped = 0
+        self.rejected = 0
+        self.blocked_sends = 0
+
+    def configure(self, capacity: Optional[int], policy: str) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de desbordamiento desconocida: {policy}")
+        if capacity is not None and capacity < 1:
+            raise ValueError("La capacidad del buzón debe ser al menos 1")
+        self.capacity = capacity
+        self.policy = policy
+
+    @property
+    def full(self) -> bool:
+        return self.capacity is not None and len(self.messages) >= self.capacity
+
+    def free_slots(self) -> Optional[int]:
+        return None if self.capacity is None else self.capacity - len(self.messages)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.messages),
+            "capacity": self.capacity,
+            "policy": self.policy,
+            "blocked_senders": [pid for pid, _ in self.blocked_senders],
+            "receiver_blocked": self.receiver_blocked,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "blocked_sends": self.blocked_sends
+        }
+
 
 class MessageQueue:
     """
     Sistema de mensajes entre procesos.
     Implementa comunicación por paso de mensajes, donde cada proceso tiene su
     propia cola de mensajes y puede enviar/recibir mensajes a/de otros procesos.
+    Cada buzón es una deque: encolar, retirar y consultar el primero son O(1)
+    y seguros entre hilos sin bloqueos. send_many y receive_many mueven lotes
+    de mensajes en una sola llamada.
+
+    Con un planificador vinculado (bind_scheduler), los envíos y recepciones
+    bloqueantes no detienen el hilo: el proceso simulado pasa a "waiting" y
+    el planificador lo despierta cuando hay hueco o llega un mensaje. Sin
+    planificador, una recepción bloqueante espera en el hilo (para usar el
+    sistema desde hilos reales) y un envío a un buzón lleno se rechaza.
     """
 
-    def __init__(self):
-        self.process_queues = {}  # Diccionario de colas para cada proceso
-        self.message_id_counter = 0  # Contador global de IDs de mensajes
+    def __init__(self, default_capacity: Optional[int] = None, default_policy: str = "block"):
+        self.process_queues: Dict[int, Mailbox] = {}  # Buzón de cada proceso
+        self.default_capacity = default_capacity
+        self.default_policy = default_policy
+        self.scheduler = None
+        self._ids = IdAllocator()
+        # Solo los receptores bloqueantes usan la condición; los envíos la notifican si hay alguno esperando
+        self._arrival = threading.Condition()
+        self._blocked_receivers = 0
+        # Índices de suscripción: canal -> miembros en orden de alta (dict como conjunto ordenado)
+        self.groups: Dict[str, Dict[int, None]] = {}
+        self.topics: Dict[str, Dict[int, None]] = {}
+        self._channels: Dict[int, set] = {}  # pid -> (tipo, canal) al que pertenece, para darlo de baja en bloque
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Los hilos reales bloqueados en una recepción no forman parte de la instantánea
+        state = self.__dict__.copy()
+        del state["_arrival"]
+        state["_blocked_receivers"] = 0
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._arrival = threading.Condition()
+
+    @property
+    def message_id_counter(self) -> int:
+        return self._ids.last
+
+    def bind_scheduler(self, scheduler) -> None:
+        # Planificador que bloquea y despierta a los procesos simulados
+        self.scheduler = scheduler
 
-    def create_queue(self, pid: int) -> None:
+    def create_queue(self, pid: int, capacity: Optional[int] = None, policy: Optional[str] = None) -> None:
         if pid not in self.process_queues:
-            self.process_queues[pid] = queue.Queue()
+            self.process_queues[pid] = Mailbox(capacity if capacity is not None else self.default_capacity,
+                                               policy or self.default_policy)
+
+    def configure_queue(self, pid: int, capacity: Optional[int], policy: str) -> bool:
+        # Cambia la capacidad y la política de un buzón existente sin perder sus mensajes
+        mailbox = self.process_queues.get(pid)
+        if mailbox is None:
+            return False
+
+        mailbox.configure(capacity, policy)
+        self._refill(mailbox)
+        return True
 
     def remove_queue(self, pid: int) -> None:
-        if pid in self.process_queues:
-            del self.process_queues[pid]
+        mailbox = self.process_queues.pop(pid, None)
+        if mailbox is None:
+            return
 
-    def send_message(self, sender_pid: int, receiver_pid: int, message: str) -> bool:
+        # Los emisores bloqueados en este buzón ya no tienen dónde entregar: se despiertan
+        while mailbox.blocked_senders:
+            self._wake(mailbox.blocked_senders.popleft()[0])
+        for kind, channel in list(self._channels.pop(pid, ())):
+            self._unsubscribe(kind, channel, pid)
+        self._notify_receivers()
 
-        if sender_pid not in self.process_queues:
+    def send_message(self, sender_pid: int, receiver_pid: int, message: Any) -> bool:
+        """
+        Envía un mensaje. Devuelve False si no se pudo entregar ni dejar
+        pendiente (buzón inexistente o lleno con política "reject"). Con la
+        política "block" y el buzón lleno, el emisor queda bloqueado y el
+        mensaje se entrega en cuanto el receptor libere sitio.
+        """
+        mailbox = self.process_queues.get(receiver_pid)
+        if mailbox is None or sender_pid not in self.process_queues:
             return False
 
-        if receiver_pid not in self.process_queues:
+        record = _new_message((self._ids.next_id(), sender_pid, message, time.time(), None))
+        if mailbox.full and not self._overflow(mailbox, sender_pid, receiver_pid, record):
             return False
+        if not mailbox.full:
+            mailbox.messages.append(record)
+        self._message_arrived(receiver_pid, mailbox)
+        return True
 
-        self.message_id_counter += 1
+    def send_many(self, sender_pid: int, receiver_pid: int, messages: Iterable[Any]) -> int:
+        """
+        Envía varios mensajes del mismo emisor al mismo receptor validando
+        una sola vez, con un bloque de identificadores y una sola marca de
+        tiempo para todo el lote. Devuelve el número de mensajes enviados.
+        En un buzón acotado el lote se corta en el primer mensaje que no
+        cabe, salvo con la política "drop_oldest"; los mensajes cortados
+        cuentan como rechazados (o como envíos bloqueados con "block"), igual
+        que en send_message.
+        """
+        mailbox = self.process_queues.get(receiver_pid)
+        if mailbox is None or sender_pid not in self.process_queues:
+            return 0
 
-        formatted_message = {
-            "id": self.message_id_counter,
-            "sender": sender_pid,
-            "content": message,
-            "timestamp": time.time()
-        }
-        self.process_queues[receiver_pid].put(formatted_message)
+        contents = messages if isinstance(messages, (list, tuple)) else list(messages)
+        slots = mailbox.free_slots()
+        if slots is not None and mailbox.policy != "drop_oldest":
+            cut = len(contents) - max(0, slots)
+            if cut > 0:
+                contents = contents[:max(0, slots)]
+                if mailbox.policy == "block":
+                    mailbox.blocked_sends += cut
+                else:
+                    mailbox.rejected += cut
+        elif slots is not None:
+            mailbox.dropped += max(0, len(contents) - slots)
+
+        ids = self._ids.reserve(len(contents))
+        messages = mailbox.messages
+        messages.extend(map(_new_message, zip(ids, repeat(sender_pid), contents, repeat(time.time()), repeat(None))))
+        if slots is not None:
+            # Con "drop_oldest" se descartan por el frente los que sobran
+            for _ in range(len(messages) - mailbox.capacity):
+                messages.popleft()
+
+        if contents:
+            self._message_arrived(receiver_pid, mailbox)
+        return len(contents)
+
+    def join_group(self, group: str, pid: int) -> bool:
+        return self._subscribe("group", group, pid)
+
+    def leave_group(self, group: str, pid: int) -> bool:
+        return self._unsubscribe("group", group, pid)
+
+    def subscribe(self, pid: int, topic: str) -> bool:
+        return self._subscribe("topic", topic, pid)
+
+    def unsubscribe(self, pid: int, topic: str) -> bool:
+        return self._unsubscribe("topic", topic, pid)
+
+    def broadcast(self, sender_pid: int, message: Any) -> int:
+        # Difusión a todos los buzones salvo el del emisor; devuelve cuántos lo recibieron
+        return self._fan_out(sender_pid, self.process_queues, message, BROADCAST)
+
+    def multicast(self, sender_pid: int, group: str, message: Any) -> int:
+        return self._fan_out(sender_pid, self.groups.get(group, {}), message, group)
+
+    def publish(self, sender_pid: int, topic: str, message: Any) -> int:
+        return self._fan_out(sender_pid, self.topics.get(topic, {}), message, topic)
+
+    def _fan_out(self, sender_pid: int, recipients: Iterable[int], message: Any, channel: Optional[str]) -> int:
+        """
+        Entrega un único Message, compartido e inmutable, en el buzón de cada
+        destinatario: el coste es O(destinatarios) sin copias del mensaje.
+        Un envío múltiple nunca bloquea al emisor: un buzón lleno con la
+        política "block" cuenta como rechazo para ese destinatario.
+        """
+        if sender_pid not in self.process_queues:
+            return 0
+
+        record = _new_message((self._ids.next_id(), sender_pid, message, time.time(), channel))
+        delivered = 0
+        for pid in recipients:
+            mailbox = self.process_queues.get(pid)
+            if mailbox is None or pid == sender_pid:
+                continue
+            if mailbox.full:
+                if mailbox.policy != "drop_oldest":
+                    mailbox.rejected += 1
+                    continue
+                mailbox.messages.popleft()
+                mailbox.dropped += 1
+            mailbox.messages.append(record)
+            delivered += 1
+            if mailbox.receiver_blocked:
+                mailbox.receiver_blocked = False
+                self._wake(pid)
+
+        if delivered:
+            self._notify_receivers()
+        return delivered
+
+    def _index(self, kind: str) -> Dict[str, Dict[int, None]]:
+        return self.groups if kind == "group" else self.topics
+
+    def _subscribe(self, kind: str, channel: str, pid: int) -> bool:
+        # Solo pueden suscribirse procesos con buzón
+        if pid not in self.process_queues:
+            return False
+        self._index(kind).setdefault(channel, {})[pid] = None
+        self._channels.setdefault(pid, set()).add((kind, channel))
+        return True
+
+    def _unsubscribe(self, kind: str, channel: str, pid: int) -> bool:
+        members = self._index(kind).get(channel)
+        if not members or pid not in members:
+            return False
+        del members[pid]
+        channels = self._channels.get(pid)
+        if channels is not None:
+            channels.discard((kind, channel))
+            if not channels:
+                del self._channels[pid]
+        if not members:
+            del self._index(kind)[channel]
         return True
 
-    def receive_message(self, pid: int, blocking: bool = False) -> Optional[Dict[str, Any]]:
+    def receive_message(self, pid: int, blocking: bool = False,
+                        timeout: Optional[float] = None) -> Optional[Message]:
         # Verificar si el proceso tiene una cola
-        if pid not in self.process_queues:
+        mailbox = self.process_queues.get(pid)
+        if mailbox is None:
             return None
 
         try:
-            if not blocking and self.process_queues[pid].empty():
+            message = mailbox.messages.popleft()
+        except IndexError:
+            if not blocking:
+                return None
+            if self.scheduler is not None:
+                self._block_receiver(pid, mailbox)
                 return None
+            return self._wait_for_message(pid, mailbox, timeout)
 
-            return self.process_queues[pid].get(block=blocking)
-        except queue.Empty:
-            return None
+        if mailbox.blocked_senders:
+            self._refill(mailbox)
+        return message
+
+    def receive_many(self, pid: int, max_messages: Optional[int] = None) -> List[Message]:
+        # Retira hasta max_messages mensajes (todos si es None) en orden de llegada
+        mailbox = self.process_queues.get(pid)
+        if not mailbox:
+            return []
+
+        messages = mailbox.messages
+        count = len(messages) if max_messages is None else min(max_messages, len(messages))
+        popleft = messages.popleft
+        received = []
+        try:
+            for _ in range(count):
+                received.append(popleft())
+        except IndexError:  # Otro hilo vació el buzón a la vez
+            pass
+
+        if mailbox.blocked_senders:
+            self._refill(mailbox)
+        return received
 
-    def peek_message(self, pid: int) -> Optional[Dict[str, Any]]:
-        if pid not in self.process_queues or self.process_queues[pid].empty():
+    def peek_message(self, pid: int) -> Optional[Message]:
+        mailbox = self.process_queues.get(pid)
+        try:
+            return mailbox.messages[0] if mailbox else None
+        except IndexError:
             return None
-        queue_items = list(self.process_queues[pid].queue)
-        if queue_items:
-            return queue_items[0]
-        return None
 
     def get_queue_size(self, pid: int) -> int:
-        if pid not in self.process_queues:
-            return 0
-        return self.process_queues[pid].qsize()
+        mailbox = self.process_queues.get(pid)
+        return len(mailbox) if mailbox is not None else 0
+
+    def get_queue_stats(self, pid: int) -> Optional[Dict[str, Any]]:
+        mailbox = self.process_queues.get(pid)
+        return mailbox.stats() if mailbox is not None else None
+
+    def _overflow(self, mailbox: Mailbox, sender_pid: int, receiver_pid: int, record: Message) -> bool:
+        # Buzón lleno: aplica la política; devuelve False si el mensaje se rechaza
+        if mailbox.policy == "drop_oldest":
+            mailbox.messages.popleft()
+            mailbox.dropped += 1
+            return True
+
+        if mailbox.policy == "block" and self._block(sender_pid, f"buzón de {receiver_pid} lleno"):
+            mailbox.blocked_senders.append((sender_pid, record))
+            mailbox.blocked_sends += 1
+            return True
+
+        mailbox.rejected += 1
+        return False
+
+    def _refill(self, mailbox: Mailbox) -> None:
+        # Con sitio libre, entrega los mensajes de los emisores bloqueados y los despierta
+        while mailbox.blocked_senders and not mailbox.full:
+            sender_pid, record = mailbox.blocked_senders.popleft()
+            mailbox.messages.append(record)
+            self._wake(sender_pid)
+
+    def _message_arrived(self, receiver_pid: int, mailbox: Mailbox) -> None:
+        if mailbox.receiver_blocked and mailbox.messages:
+            mailbox.receiver_blocked = False
+            self._wake(receiver_pid)
+        self._notify_receivers()
+
+    def _block_receiver(self, pid: int, mailbox: Mailbox) -> None:
+        if self._block(pid, "esperando mensaje"):
+            mailbox.receiver_blocked = True
+
+    def _block(self, pid: int, reason: str) -> bool:
+        # Bloquea al proceso simulado a través del planificador; sin él no se puede bloquear
+        if self.scheduler is None:
+            return False
+        process = self.scheduler.process_manager.get_process_by_pid(pid)
+        return process is not None and self.scheduler.block(process, reason)
+
+    def _wake(self, pid: int) -> None:
+        if self.scheduler is not None:
+            process = self.scheduler.process_manager.get_process_by_pid(pid)
+            if process is not None:
+                self.scheduler.wake(process)
+
+    def _wait_for_message(self, pid: int, mailbox: Mailbox, timeout: Optional[float]) -> Optional[Message]:
+        with self._arrival:
+            self._blocked_receivers += 1
+            try:
+                # La comprobación se repite con la condición tomada para no perder un aviso
+                self._arrival.wait_for(
+                    lambda: mailbox.messages or self.process_queues.get(pid) is not mailbox, timeout)
+            finally:
+                self._blocked_receivers -= 1
+        try:
+            return mailbox.messages.popleft()
+        except IndexError:
+            return None
+
+    def _notify_receivers(self) -> None:
+        if self._blocked_receivers:
+            with self._arrival:
+                self._arrival.notify_all()
+
+
+def _describe_items(record) -> str:
+    # Lote producido o consumido: (primer item, cantidad, ocupación, tamaño del buffer)
+    first, count = record.payload[0], record.payload[1]
+    return f"item '{first}'" if count == 1 else f"{count} items"
+
+
+register_formats({
+    "sem_acquired": "Proceso {pid} adquirió semáforo '{0}' (nuevo valor: {1})",
+    "sem_acquired_many": "Proceso {pid} adquirió {1} permisos de '{0}' (nuevo valor: {2})",
+    "sem_blocked": "Proceso {pid} bloqueado en semáforo '{0}' (posición {1} en la cola)",
+    "sem_released": "Proceso {pid} liberó semáforo '{0}' (nuevo valor: {1})",
+    "sem_released_many": "Proceso {pid} liberó {1} permisos de '{0}' (nuevo valor: {2})",
+    "sem_handoff": "Proceso {pid} liberó semáforo '{0}': permiso entregado al proceso {1}",
+    "cond_wait": "Proceso {pid} espera en la condición '{0}'",
+    "cond_notify": "Proceso {pid} notificó la condición '{0}': despierta {1}",
+    "pc_registered": "Proceso {pid} registrado como {0}",
+    "pc_unregistered": "Proceso {pid} deja de ser {0}",
+    "pc_not_registered": "Error: El proceso {pid} no está registrado como {0}",
+    "pc_producer_blocked": "Productor {pid} bloqueado: buffer lleno ({0} items pendientes)",
+    "pc_consumer_blocked": "Consumidor {pid} bloqueado: buffer vacío",
+    "pc_produced": lambda record: (f"Productor {record.pid}: {_describe_items(record)} producido → buffer: "
+                                   f"{record.payload[2]}/{record.payload[3]}"),
+    "pc_consumed": lambda record: (f"Consumidor {record.pid}: {_describe_items(record)} consumido → buffer: "
+                                   f"{record.payload[2]}/{record.payload[3]}"),
+})
 
 
 class Semaphore:
-    def __init__(self, initial_value: int = 1, name: str = "unnamed"):
+    """
+    Semáforo contador con cola de espera FIFO de procesos simulados.
+    Si no hay permisos, wait deja al proceso en la cola y lo bloquea a
+    través del planificador vinculado (estado "waiting", sin consumir CPU).
+    signal entrega el permiso directamente al primero de la cola y lo
+    despierta sin incrementar el valor, de modo que ningún otro proceso
+    puede adelantársele. on_acquire es la continuación que completa la
+    operación del proceso bloqueado cuando por fin recibe el permiso.
+    thread_wait/thread_signal son la versión para hilos reales (bloquean
+    al hilo en una condición); no se mezclan con la cola de procesos
+    simulados del mismo semáforo.
+    """
+
+    def __init__(self, initial_value: int = 1, name: str = "unnamed", scheduler=None,
+                 log: Optional[EventLog] = None):
+        if initial_value < 0:
+            raise ValueError("El valor inicial del semáforo no puede ser negativo")
 
         self.value = initial_value
         self.name = name
+        self.scheduler = scheduler
+        self.lock = threading.Lock()
+        self._available = threading.Condition(self.lock)
+        # Procesos esperando en este semáforo, en orden de llegada: (pid, continuación)
+        self.waiting_processes = deque()
+        self.acquisitions = 0
+        self.contentions = 0  # Esperas que tuvieron que bloquearse
+        self.thread_waits = 0  # Esperas de hilos reales y segundos que pasaron bloqueados
+        self.wait_seconds = 0.0
+        self.lock_seconds = 0.0  # Segundos de hilos esperando el candado interno (contención)
+        # Registro de operaciones; puede compartirse entre varios semáforos
+        self.events = log if log is not None else EventLog(capacity=1000)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Los candados se recrean al restaurar; las continuaciones en espera deben ser serializables
+        state = self.__dict__.copy()
+        del state["lock"], state["_available"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
         self.lock = threading.Lock()
-        self.condition = threading.Condition(self.lock)
-        # Lista de PIDs de procesos esperando en este semáforo
-        self.waiting_processes = []
-        # Lista para registrar eventos
-        self.operations_log = []
+        self._available = threading.Condition(self.lock)
 
-    def wait(self, pid: int) -> bool:
+    def bind_scheduler(self, scheduler) -> None:
+        # Planificador que bloquea y despierta a los procesos simulados
+        self.scheduler = scheduler
+
+    def wait(self, pid: int, on_acquire: Optional[Callable[[], None]] = None) -> bool:
+        # True si adquiere el permiso ya; False si el proceso queda bloqueado en la cola
+        with self.lock:
+            if self.value > 0:
+                self.value -= 1
+                self.acquisitions += 1
+                self.events.record("sem_acquired", pid, self.name, self.value)
+                return True
+
+            self.waiting_processes.append((pid, on_acquire))
+            self.contentions += 1
+            self.events.record("sem_blocked", pid, self.name, len(self.waiting_processes))
+
+        self._block(pid, self._wait_reason())
+        return False
+
+    def try_wait(self, pid: int) -> bool:
+        # Variante no bloqueante: adquiere si hay permiso y si no vuelve sin encolarse
         with self.lock:
             if self.value <= 0:
-                self.waiting_processes.append(pid)
-                self.operations_log.append(f"Proceso {pid} bloqueado en semáforo '{self.name}' (valor: {self.value})")
                 return False
-
             self.value -= 1
-            self.operations_log.append(f"Proceso {pid} adquirió semáforo '{self.name}' (nuevo valor: {self.value})")
+            self.acquisitions += 1
+            self.events.record("sem_acquired", pid, self.name, self.value)
             return True
 
-    def signal(self, pid: int) -> List[int]:
+    def try_acquire(self, pid: int, count: int) -> int:
+        # Adquiere hasta count permisos de una vez sin bloquearse; devuelve cuántos consiguió
+        with self.lock:
+            granted = max(0, min(self.value, count))
+            if granted == 1:
+                self.events.record("sem_acquired", pid, self.name, self.value - 1)
+            elif granted:
+                self.events.record("sem_acquired_many", pid, self.name, granted, self.value - granted)
+            self.value -= granted
+            self.acquisitions += granted
+            return granted
 
+    def signal_many(self, pid: int, count: int) -> List[int]:
+        # Libera count permisos: primero se entregan a los procesos en espera y el resto suma al valor
+        if count == 1:
+            return self.signal(pid)
         with self.lock:
-            self.value += 1
-            self.operations_log.append(f"Proceso {pid} liberó semáforo '{self.name}' (nuevo valor: {self.value})")
+            if not self.waiting_processes:
+                self.value += count
+                self.events.record("sem_released_many", pid, self.name, count, self.value)
+                return []
 
-            woken_processes = []
-            if self.waiting_processes:
-                woken_pid = self.waiting_processes.pop(0)
-                woken_processes.append(woken_pid)
-                self.operations_log.append(f"Proceso {woken_pid} despertado del semáforo '{self.name}'")
+        woken = []
+        for _ in range(count):
+            woken.extend(self.signal(pid))
+        return woken
 
-            return woken_processes
+    def signal(self, pid: int) -> List[int]:
+        with self.lock:
+            handoff = None
+            while self.waiting_processes:
+                candidate = self.waiting_processes.popleft()
+                # Los procesos que terminaron mientras esperaban ya no reciben el permiso
+                if self._alive(candidate[0]):
+                    handoff = candidate
+                    break
+
+            if handoff is None:
+                self.value += 1
+                self.events.record("sem_released", pid, self.name, self.value)
+                return []
+
+            self.acquisitions += 1
+            self.events.record("sem_handoff", pid, self.name, handoff[0])
+
+        # Fuera del candado: la continuación puede operar sobre este u otros semáforos
+        woken_pid, on_acquire = handoff
+        self._wake(woken_pid)
+        if on_acquire is not None:
+            on_acquire()
+        return [woken_pid]
+
+    def thread_wait(self, count: int = 1, timeout: Optional[float] = None) -> int:
+        # Bloquea al hilo hasta que haya algún permiso y toma hasta count; 0 si vence timeout
+        self._lock_timed()
+        try:
+            if self.value <= 0:
+                if timeout == 0:
+                    return 0
+                started = time.perf_counter()
+                available = self._available.wait_for(lambda: self.value > 0, timeout)
+                self.thread_waits += 1
+                self.wait_seconds += time.perf_counter() - started
+                if not available:
+                    return 0
+
+            granted = min(self.value, count)
+            self.value -= granted
+            self.acquisitions += granted
+            if self.value > 0:
+                # Quedan permisos para otro hilo en espera
+                self._available.notify()
+            return granted
+        finally:
+            self.lock.release()
+
+    def thread_signal(self, count: int = 1) -> None:
+        self._lock_timed()
+        try:
+            self.value += count
+            self._available.notify(count)
+        finally:
+            self.lock.release()
+
+    def _lock_timed(self) -> None:
+        # Toma el candado interno midiendo cuánto hubo que esperarlo si estaba ocupado
+        if not self.lock.acquire(False):
+            started = time.perf_counter()
+            self.lock.acquire()
+            self.lock_seconds += time.perf_counter() - started
 
     def get_value(self) -> int:
         with self.lock:
@@ -111,112 +651,436 @@ class Semaphore:
 
     def get_waiting_processes(self) -> List[int]:
         with self.lock:
-            return self.waiting_processes.copy()
+            return [pid for pid, _ in self.waiting_processes]
 
-    def get_logs(self) -> List[str]:
+    def get_stats(self) -> Dict[str, Any]:
         with self.lock:
-            return self.operations_log.copy()
+            return {
+                "value": self.value,
+                "waiting": len(self.waiting_processes),
+                "acquisitions": self.acquisitions,
+                "contentions": self.contentions,
+                "thread_waits": self.thread_waits,
+                "wait_seconds": self.wait_seconds,
+                "lock_seconds": self.lock_seconds,
+            }
+
+    def get_logs(self) -> List[str]:
+        return self.events.messages()
+
+    def _process(self, pid: int):
+        if self.scheduler is None:
+            return None
+        return self.scheduler.process_manager.get_process_by_pid(pid)
+
+    def _alive(self, pid: int) -> bool:
+        if self.scheduler is None:
+            return True
+        process = self._process(pid)
+        return process is not None and process.state != "terminated"
+
+    def _wait_reason(self) -> str:
+        return f"semáforo '{self.name}'"
+
+    def _requeued(self, pid: int) -> None:
+        # Un proceso que ya estaba bloqueado por otro motivo espera ahora en este semáforo
+        if self.scheduler is not None:
+            self.scheduler.process_manager.set_block_reason(pid, self._wait_reason())
+
+    def _block(self, pid: int, reason: str) -> bool:
+        # Sin planificador la espera solo queda registrada en la cola
+        process = self._process(pid)
+        return process is not None and self.scheduler.block(process, reason)
+
+    def _wake(self, pid: int) -> None:
+        process = self._process(pid)
+        if process is not None:
+            self.scheduler.wake(process)
+
+
+class Mutex(Semaphore):
+    """
+    Semáforo binario con dueño: solo el proceso que lo tiene puede
+    liberarlo, y al liberarlo con procesos en espera la propiedad pasa
+    directamente al primero de la cola.
+    """
+
+    def __init__(self, name: str = "mutex", scheduler=None, log: Optional[EventLog] = None):
+        super().__init__(1, name, scheduler, log)
+        self.owner = None
+
+    def acquire(self, pid: int, on_acquire: Optional[Callable[[], None]] = None) -> bool:
+        if self.owner == pid:
+            raise ValueError(f"El proceso {pid} ya posee el mutex '{self.name}'")
+
+        if self.wait(pid, partial(self._granted, pid, on_acquire)):
+            self.owner = pid
+            return True
+        return False
+
+    def _granted(self, pid: int, on_acquire: Optional[Callable[[], None]]) -> None:
+        # Continuación de un acquire bloqueado (un parcial, para que la cola sea serializable)
+        self.owner = pid
+        if on_acquire is not None:
+            on_acquire()
+
+    def release(self, pid: int) -> List[int]:
+        if self.owner != pid:
+            raise ValueError(f"El proceso {pid} no posee el mutex '{self.name}'")
+        self.owner = None
+        return self.signal(pid)
+
+
+class ConditionVariable:
+    """
+    Variable de condición asociada a un Mutex, con semántica Mesa.
+    wait libera el mutex y bloquea al proceso; notify lo saca de la cola y
+    lo pone a competir de nuevo por el mutex, de modo que on_wake se
+    ejecuta ya con el mutex adquirido (y el proceso debe volver a
+    comprobar su condición).
+    """
+
+    def __init__(self, mutex: Mutex, name: str = "cond"):
+        self.mutex = mutex
+        self.name = name
+        self.waiting_processes = deque()
+        self.events = mutex.events
+
+    def wait(self, pid: int, on_wake: Optional[Callable[[], None]] = None) -> None:
+        self.mutex.release(pid)
+        self.waiting_processes.append((pid, on_wake))
+        self.events.record("cond_wait", pid, self.name)
+        self.mutex._block(pid, f"condición '{self.name}'")
+
+    def notify(self, pid: int) -> List[int]:
+        while self.waiting_processes:
+            waiter, on_wake = self.waiting_processes.popleft()
+            if not self.mutex._alive(waiter):
+                continue
+            self.events.record("cond_notify", pid, self.name, waiter)
+            # Si el mutex está libre el proceso continúa ya; si no, sigue bloqueado en la cola del
+            # mutex y lo despertará el traspaso de propiedad
+            if self.mutex.acquire(waiter, on_wake):
+                self.mutex._wake(waiter)
+                if on_wake is not None:
+                    on_wake()
+            else:
+                self.mutex._requeued(waiter)
+            return [waiter]
+        return []
+
+    def notify_all(self, pid: int) -> List[int]:
+        woken = []
+        while self.waiting_processes:
+            woken.extend(self.notify(pid))
+        return woken
+
+    def get_waiting_processes(self) -> List[int]:
+        return [pid for pid, _ in self.waiting_processes]
+
+    def get_logs(self) -> List[str]:
+        # El registro es el del mutex: solo se formatean los eventos de esta condición
+        return [format_record(record) for record in self.events
+                if record.code.startswith("cond_") and record.payload[0] == self.name]
+
+
+class PartyStats:
+    """Contadores de un productor o consumidor: items, lotes, esperas y ciclos bloqueado."""
+
+    __slots__ = ("items", "batches", "waits", "wait_cycles", "registered_at", "blocked_since", "explicit")
+
+    def __init__(self, registered_at: int = 0, explicit: bool = True):
+        self.items = 0
+        self.batches = 0
+        self.waits = 0
+        self.wait_cycles = 0
+        self.registered_at = registered_at
+        self.blocked_since = None  # Ciclo en que se bloqueó, mientras espera
+        self.explicit = explicit  # Registrado expresamente, no solo por haber operado
+
+    def as_dict(self, now: int) -> Dict[str, Any]:
+        elapsed = max(1, now - self.registered_at)
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "waits": self.waits,
+            "wait_cycles": self.wait_cycles,
+            "throughput": self.items / elapsed,  # Items por ciclo desde el registro
+            "blocked": self.blocked_since is not None,
+        }
 
 
 class ProducerConsumer:
-    def __init__(self, buffer_size: int = 5):
+    """
+    Productor-consumidor con varios productores y consumidores (MPMC).
+    Los items viven en un buffer circular preasignado (head apunta al más
+    antiguo y tail al siguiente hueco), así que producir y consumir son
+    O(1). Los semáforos son bloqueantes: un productor con el buffer lleno
+    (o un consumidor con el buffer vacío) queda bloqueado y su operación
+    pendiente se completa en cuanto recibe el permiso, sin reintentarla.
+    produce_many y consume_many mueven un lote con una sola adquisición
+    de semáforos. Los tiempos de espera se miden en ciclos del planificador.
+    put_blocking y get_blocking son la versión para hilos reales sobre el
+    mismo buffer, con los semáforos bloqueando al hilo.
+    """
+
+    def __init__(self, buffer_size: int = 5, log_capacity: int = 5000):
+        if buffer_size < 1:
+            raise ValueError("El tamaño del buffer debe ser al menos 1")
+
         self.buffer_size = buffer_size
-        self.buffer = []
+        self.slots = [None] * buffer_size
+        self.head = 0
+        self.tail = 0
+        self.count = 0
 
-        self.mutex = Semaphore(1, "mutex")  # Exclusión mutua para acceder al buffer
-        self.empty = Semaphore(buffer_size, "empty")  # Espacios vacíos
-        self.full = Semaphore(0, "full")  # Espacios llenos
+        # Un único registro para el buffer y sus semáforos, en orden cronológico
+        self.events = EventLog(capacity=log_capacity)
+        self.mutex = Semaphore(1, "mutex", log=self.events)  # Exclusión mutua para acceder al buffer
+        self.empty = Semaphore(buffer_size, "empty", log=self.events)  # Espacios vacíos
+        self.full = Semaphore(0, "full", log=self.events)  # Espacios llenos
 
-        self.producer_pid = None
-        self.consumer_pid = None
+        self.scheduler = None
+        self.producers: Dict[int, PartyStats] = {}
+        self.consumers: Dict[int, PartyStats] = {}
 
-        self.logs = []
+    def bind_scheduler(self, scheduler) -> None:
+        self.scheduler = scheduler
+        self.events.bind_clock(partial(getattr, scheduler, "time"))
+        for semaphore in (self.mutex, self.empty, self.full):
+            semaphore.bind_scheduler(scheduler)
 
-    def set_producer(self, pid: int) -> None:
-        self.producer_pid = pid
-        self.logs.append(f"Proceso {pid} registrado como productor")
+    def add_producer(self, pid: int) -> None:
+        self._register(self.producers, pid, "productor")
 
-    def set_consumer(self, pid: int) -> None:
-        self.consumer_pid = pid
-        self.logs.append(f"Proceso {pid} registrado como consumidor")
+    def add_consumer(self, pid: int) -> None:
+        self._register(self.consumers, pid, "consumidor")
 
-    def produce(self, pid: int, item: str) -> bool:
-        if self.producer_pid is not None and pid != self.producer_pid:
-            self.logs.append(f"Error: El proceso {pid} no está registrado como productor")
-            return False
+    def remove_producer(self, pid: int) -> None:
+        if self.producers.pop(pid, None) is not None:
+            self.events.record("pc_unregistered", pid, "productor")
 
-        if not self.empty.wait(pid):
-            self.logs.append(f"Productor {pid} bloqueado: buffer lleno")
-            return False
+    def remove_consumer(self, pid: int) -> None:
+        if self.consumers.pop(pid, None) is not None:
+            self.events.record("pc_unregistered", pid, "consumidor")
 
-        if not self.mutex.wait(pid):
-            # Si no puede obtener mutex, devuelve el permiso de "empty"
-            self.empty.signal(pid)
-            self.logs.append(f"Productor {pid} bloqueado: no pudo obtener acceso exclusivo al buffer")
-            return False
+    # Nombres anteriores, de cuando solo había un productor y un consumidor
+    set_producer = add_producer
+    set_consumer = add_consumer
 
-        self.buffer.append(item)
-        self.logs.append(f"Productor {pid}: item '{item}' producido → buffer: {len(self.buffer)}/{self.buffer_size}")
+    def produce(self, pid: int, item: Any) -> bool:
+        # True si el item entra ya en el buffer; False si el productor queda bloqueado (o no está registrado)
+        return self.produce_many(pid, [item]) == 1
 
-        self.mutex.signal(pid)
-        self.full.signal(pid)
+    def produce_many(self, pid: int, items: List[Any]) -> int:
+        """
+        Deposita los items que caben ya en el buffer y devuelve cuántos.
+        Si sobran, el productor queda bloqueado y el resto se deposita en
+        orden a medida que se liberan huecos.
+        """
+        stats = self._party(self.producers, pid, "productor")
+        if stats is None or not items:
+            return 0
 
-        return True
+        granted = self.empty.try_acquire(pid, len(items))
+        if granted:
+            self._put(pid, stats, items[:granted])
 
-    def consume(self, pid: int) -> Optional[str]:
-        # Verificar si el proceso está registrado como consumidor
-        if self.consumer_pid is not None and pid != self.consumer_pid:
-            self.logs.append(f"Error: El proceso {pid} no está registrado como consumidor")
-            return None
+        pending = items[granted:]
+        if not pending:
+            return granted
+        if self.empty.wait(pid, partial(self._resume_producer, pid, stats, pending)):
+            # Un consumidor despertado liberó hueco entre medias: no hay que esperar
+            return granted + self._resume_producer(pid, stats, pending)
 
-        # Intentar adquirir el semáforo "full" (¿hay items disponibles?)
-        if not self.full.wait(pid):
-            self.logs.append(f"Consumidor {pid} bloqueado: buffer vacío")
-            return None
+        self._block(stats)
+        self.events.record("pc_producer_blocked", pid, len(pending))
+        return granted
 
-        # Intentar adquirir el semáforo de exclusión mutua
-        if not self.mutex.wait(pid):
-            self.full.signal(pid)
-            self.logs.append(f"Consumidor {pid} bloqueado: no pudo obtener acceso exclusivo al buffer")
-            return None
+    def consume(self, pid: int) -> Optional[Any]:
+        # El item retirado, o None si el consumidor queda bloqueado (o no está registrado)
+        items = self.consume_many(pid, 1)
+        return items[0] if items else None
+
+    def consume_many(self, pid: int, max_items: int) -> List[Any]:
+        """
+        Retira hasta max_items items del buffer de una vez. Si está vacío,
+        el consumidor queda bloqueado y retirará un item en cuanto un
+        productor lo deposite.
+        """
+        stats = self._party(self.consumers, pid, "consumidor")
+        if stats is None or max_items < 1:
+            return []
+
+        granted = self.full.try_acquire(pid, max_items)
+        if granted:
+            return self._take(pid, stats, granted)
 
-        # Sección crítica: Retira el item del buffer
-        item = self.buffer.pop(0)
-        self.logs.append(f"Consumidor {pid}: item '{item}' consumido → buffer: {len(self.buffer)}/{self.buffer_size}")
+        if self.full.wait(pid, partial(self._resume_consumer, pid, stats)):
+            return self._resume_consumer(pid, stats)
+        self._block(stats)
+        self.events.record("pc_consumer_blocked", pid)
+        return []
 
-        # Liberar mutex
+    def _resume_producer(self, pid: int, stats: PartyStats, pending: List[Any]) -> int:
+        # Con el permiso de un hueco ya concedido: deposita el primer pendiente y sigue con el resto
+        self._unblock(stats)
+        self._put(pid, stats, pending[:1])
+        return 1 + (self.produce_many(pid, pending[1:]) if len(pending) > 1 else 0)
+
+    def _resume_consumer(self, pid: int, stats: PartyStats) -> List[Any]:
+        self._unblock(stats)
+        return self._take(pid, stats, 1)
+
+    def _put(self, pid: int, stats: PartyStats, items: List[Any]) -> None:
+        # El mutex solo se retiene dentro de esta llamada, así que nunca hay que esperarlo
+        self.mutex.wait(pid)
+        self._write(items)
+        stats.items += len(items)
+        stats.batches += 1
+        self.events.record("pc_produced", pid, items[0], len(items), self.count, self.buffer_size)
+        self.mutex.signal(pid)
+        # Puede despertar a consumidores bloqueados, que retiran sus items en ese momento
+        self.full.signal_many(pid, len(items))
+
+    def _take(self, pid: int, stats: PartyStats, count: int) -> List[Any]:
+        # Sección crítica: retira count items desde head
+        self.mutex.wait(pid)
+        items = self._read(count)
+        stats.items += count
+        stats.batches += 1
+        self.events.record("pc_consumed", pid, items[0], len(items), self.count, self.buffer_size)
         self.mutex.signal(pid)
+        self.empty.signal_many(pid, count)
+        return items
+
+    def _register(self, parties: Dict[int, PartyStats], pid: int, role: str) -> None:
+        stats = parties.get(pid)
+        if stats is not None and stats.explicit:
+            return
+        if stats is None:
+            parties[pid] = PartyStats(self._now())
+        else:
+            stats.explicit = True
+        self.events.record("pc_registered", pid, role)
+
+    def put_blocking(self, items: List[Any], timeout: Optional[float] = None) -> int:
+        """
+        Deposita items desde un hilo real, bloqueándolo mientras el buffer
+        esté lleno. Devuelve cuántos entraron (menos que todos solo si vence
+        timeout; con timeout=0 no espera nunca).
+        """
+        return self._put_chunks(len(items), lambda done, granted: items[done:done + granted], timeout)
 
-        # Incrementar semáforo "empty"
-        self.empty.signal(pid)
+    def put_stamps(self, count: int, clock: Callable[[], Any], timeout: Optional[float] = None) -> int:
+        """
+        Como put_blocking, pero deposita count marcas de clock tomadas con
+        el mutex ya adquirido, justo cuando cada tramo entra en el buffer:
+        el tiempo bloqueado con el buffer lleno no forma parte de la marca.
+        """
+        return self._put_chunks(count, lambda done, granted: [clock()] * granted, timeout)
 
-        return item
+    def _put_chunks(self, count: int, chunk: Callable[[int, int], List[Any]], timeout: Optional[float]) -> int:
+        # chunk(hechos, concedidos) devuelve los items del siguiente tramo
+        done = 0
+        while done < count:
+            granted = self.empty.thread_wait(count - done, timeout)
+            if not granted:
+                break
+            self.mutex.thread_wait()
+            try:
+                self._write(chunk(done, granted))
+            finally:
+                self.mutex.thread_signal()
+            self.full.thread_signal(granted)
+            done += granted
+        return done
+
+    def get_blocking(self, max_items: int = 1, timeout: Optional[float] = None) -> List[Any]:
+        # Retira hasta max_items items desde un hilo real; lista vacía si vence timeout
+        granted = self.full.thread_wait(max_items, timeout)
+        if not granted:
+            return []
+        self.mutex.thread_wait()
+        try:
+            items = self._read(granted)
+        finally:
+            self.mutex.thread_signal()
+        self.empty.thread_signal(granted)
+        return items
+
+    def _write(self, items: List[Any]) -> None:
+        slots, size = self.slots, self.buffer_size
+        tail = self.tail
+        for item in items:
+            slots[tail] = item
+            tail = tail + 1 if tail + 1 < size else 0
+        self.tail = tail
+        self.count += len(items)
+
+    def _read(self, count: int) -> List[Any]:
+        slots, size = self.slots, self.buffer_size
+        head = self.head
+        items = []
+        for _ in range(count):
+            items.append(slots[head])
+            slots[head] = None  # No retener referencias a items ya consumidos
+            head = head + 1 if head + 1 < size else 0
+        self.head = head
+        self.count -= count
+        return items
+
+    def _party(self, parties: Dict[int, PartyStats], pid: int, role: str) -> Optional[PartyStats]:
+        # Mientras nadie se registre expresamente en el papel, cualquier proceso puede ejercerlo
+        stats = parties.get(pid)
+        if stats is None and not any(party.explicit for party in parties.values()):
+            stats = parties[pid] = PartyStats(self._now(), explicit=False)
+        if stats is None:
+            self.events.record("pc_not_registered", pid, role)
+        return stats
+
+    def _block(self, stats: PartyStats) -> None:
+        stats.waits += 1
+        stats.blocked_since = self._now()
+
+    def _unblock(self, stats: PartyStats) -> None:
+        if stats.blocked_since is not None:
+            stats.wait_cycles += self._now() - stats.blocked_since
+            stats.blocked_since = None
+
+    def _now(self) -> int:
+        return self.scheduler.time if self.scheduler is not None else 0
+
+    def contents(self) -> List[Any]:
+        # Items en orden de consumo, del más antiguo al más reciente
+        return [self.slots[(self.head + i) % self.buffer_size] for i in range(self.count)]
+
+    def get_party_stats(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        now = self._now()
+        return {
+            "producers": {pid: stats.as_dict(now) for pid, stats in self.producers.items()},
+            "consumers": {pid: stats.as_dict(now) for pid, stats in self.consumers.items()},
+        }
 
     def get_buffer_status(self) -> Dict[str, Any]:
         return {
             "buffer_size": self.buffer_size,
-            "items_in_buffer": len(self.buffer),
-            "buffer_content": self.buffer.copy(),
+            "items_in_buffer": self.count,
+            "buffer_content": self.contents(),
             "empty_slots": self.empty.get_value(),
             "full_slots": self.full.get_value(),
             "mutex_value": self.mutex.get_value(),
-            "producer_pid": self.producer_pid,
-            "consumer_pid": self.consumer_pid,
+            "producers": list(self.producers),
+            "consumers": list(self.consumers),
             "empty_waiting": self.empty.get_waiting_processes(),
             "full_waiting": self.full.get_waiting_processes(),
             "mutex_waiting": self.mutex.get_waiting_processes()
         }
 
     def get_logs(self) -> List[str]:
-        semaphore_logs = (
-                self.mutex.get_logs() +
-                self.empty.get_logs() +
-                self.full.get_logs()
-        )
-        all_logs = self.logs + semaphore_logs
-        return all_logs
+        return self.events.messages()
 
 
 # Sistema de comunicación global
-message_system = MessageQueue()
+message_system = MessageQueue(default_capacity=64)
 producer_consumer = ProducerConsumer(buffer_size=5)
\ No newline at end of file
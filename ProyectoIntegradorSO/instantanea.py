@@ -0,0 +1,213 @@
+import copyreg
+import io
+import os
+import pickle
+import struct
+import time
+import zlib
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Formato de una instantánea (little-endian): cabecera HEADER con la firma, la versión del formato, el
+# método de compresión, el ciclo del planificador, el CRC32 y la longitud del contenido, seguida del
+# contenido: el estado serializado con pickle y, opcionalmente, comprimido con zlib.
+# El estado se serializa en una sola pasada, así que los objetos compartidos (el ProcessManager del
+# planificador, el planificador vinculado a los semáforos...) siguen siéndolo al restaurarlo.
+# Los objetos externos (por ejemplo, el registro de eventos de la interfaz, compartido con los semáforos)
+# se guardan solo como una referencia por nombre y se vuelven a enlazar al restaurar.
+# Solo deben cargarse instantáneas de origen confiable: pickle puede ejecutar código al deserializar.
+MAGIC = b"SOSNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sHBxqIQ")
+
+# Métodos de compresión
+RAW, ZLIB = 0, 1
+
+# Componentes del simulador que guarda la interfaz; otros usos pueden guardar cualquier diccionario
+COMPONENTS = ("process_manager", "resources", "scheduler", "message_system", "producer_consumer",
+              "sync_objects", "settings")
+
+
+def _cycle_of(state: Dict[str, Any]) -> int:
+    scheduler = state.get("scheduler")
+    return scheduler.time if scheduler is not None else -1
+
+
+def dumps(state: Dict[str, Any], compress: bool = True, external: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Serializa el estado (un diccionario de componentes) a bytes. La
+    compresión usa el nivel más rápido de zlib: los estados del simulador
+    son muy repetitivos y se reducen varias veces sin apenas coste.
+    external asocia un nombre a los objetos que no se guardan (loads los
+    recibe con los mismos nombres).
+    """
+    try:
+        output = io.BytesIO()
+        pickler = pickle.Pickler(output, pickle.HIGHEST_PROTOCOL)
+        if external:
+            # Solo los tipos de los objetos externos pasan por _reduce_external; el resto sigue en C
+            names = {id(value): name for name, value in external.items()}
+            pickler.dispatch_table = copyreg.dispatch_table.copy()
+            for value in external.values():
+                pickler.dispatch_table[type(value)] = partial(_reduce_external, names)
+        pickler.dump(state)
+        payload = output.getvalue()
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise ValueError(f"El estado no se puede serializar: {e}") from e
+
+    method = RAW
+    if compress:
+        payload = zlib.compress(payload, 1)
+        method = ZLIB
+    return HEADER.pack(MAGIC, FORMAT_VERSION, method, _cycle_of(state), zlib.crc32(payload),
+                       len(payload)) + payload
+
+
+def read_header(data: bytes) -> Tuple[int, int, int, int, int]:
+    # (versión, compresión, ciclo, CRC, longitud del contenido), validando la firma y la versión
+    if len(data) < HEADER.size:
+        raise ValueError("La instantánea está incompleta")
+    magic, version, method, cycle, crc, length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("El archivo no es una instantánea del simulador")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Versión de instantánea no soportada: {version}")
+    return version, method, cycle, crc, length
+
+
+def loads(data: bytes, external: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # Cada llamada crea una copia independiente del estado
+    _, method, _, crc, length = read_header(data)
+    payload = memoryview(data)[HEADER.size:HEADER.size + length]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError("La instantánea está dañada (longitud o CRC incorrectos)")
+    if method == ZLIB:
+        payload = zlib.decompress(payload)
+    elif method != RAW:
+        raise ValueError(f"Método de compresión desconocido: {method}")
+
+    return _Unpickler(io.BytesIO(payload), external or {}).load()
+
+
+def _reduce_external(names: Dict[int, str], value: Any):
+    name = names.get(id(value))
+    if name is None:
+        return value.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+    return _external, (name,)
+
+
+def _external(name: str) -> Any:
+    # Marcador de un objeto externo; al cargar, _Unpickler lo sustituye por el objeto proporcionado
+    raise ValueError(f"La instantánea hace referencia al objeto externo '{name}', que no se proporcionó")
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, source, external: Dict[str, Any]):
+        super().__init__(source)
+        self.external = external
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == __name__ and name == "_external":
+            return self._resolve
+        return super().find_class(module, name)
+
+    def _resolve(self, name: str) -> Any:
+        if name not in self.external:
+            _external(name)
+        return self.external[name]
+
+
+# Para barridos de parámetros: se captura una vez el estado ya caliente con dumps y cada
+# configuración parte de su propia copia, sin repetir el calentamiento
+fork = loads
+
+
+def save(state: Dict[str, Any], path: str, compress: bool = True, external: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Guarda el estado en path y devuelve los bytes escritos. Se escribe en
+    un archivo temporal que después reemplaza al anterior, de modo que una
+    interrupción a mitad nunca deja una instantánea a medias.
+    """
+    data = dumps(state, compress, external)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as output:
+        output.write(data)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary, path)
+    return len(data)
+
+
+def load(path: str, external: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    with open(path, "rb") as source:
+        return loads(source.read(), external)
+
+
+def peek(path: str) -> Dict[str, Any]:
+    # Datos de la cabecera sin deserializar el estado
+    with open(path, "rb") as source:
+        version, method, cycle, _, length = read_header(source.read(HEADER.size))
+    return {"version": version, "compressed": method == ZLIB, "cycle": cycle, "bytes": HEADER.size + length}
+
+
+def capture_simulation(scheduler, **extra: Any) -> Dict[str, Any]:
+    # Estado mínimo de una simulación: el planificador con sus procesos y recursos
+    state = {"process_manager": scheduler.process_manager, "resources": scheduler.resources,
+             "scheduler": scheduler}
+    state.update(extra)
+    return state
+
+
+class Checkpointer:
+    """
+    Puntos de control periódicos de una simulación larga.
+    SimulationEngine.run llama a maybe_save tras cada paso; cada vez que
+    el reloj avanza every ciclos desde el último punto de control se
+    guarda el estado que devuelve capture en path (reemplazándolo de forma
+    atómica), y al terminar se guarda el estado final. Si el proceso se
+    interrumpe, load(path) recupera el último punto de control. En modo
+    por eventos SimulationEngine.run no deja que el reloj salte más allá
+    de cycles_until_due, así que los puntos de control caen justo en cada
+    intervalo.
+    """
+
+    def __init__(self, path: str, every: int, capture: Callable[[], Dict[str, Any]], compress: bool = True,
+                 external: Optional[Dict[str, Any]] = None):
+        if every < 1:
+            raise ValueError("El intervalo entre puntos de control debe ser al menos 1 ciclo")
+
+        self.path = path
+        self.every = every
+        self.capture = capture
+        self.compress = compress
+        self.external = external
+        self.last_cycle: Optional[int] = None
+        self.saved = 0
+        self.last_bytes = 0
+        self.seconds = 0.0  # Tiempo total dedicado a guardar
+
+    def start(self, cycle: int) -> None:
+        # Ciclo de referencia del primer intervalo (el estado inicial no se guarda)
+        if self.last_cycle is None:
+            self.last_cycle = cycle
+
+    def cycles_until_due(self, cycle: int) -> int:
+        # Ciclos hasta el próximo punto de control (al menos 1)
+        if self.last_cycle is None:
+            return 1
+        return max(1, self.last_cycle + self.every - cycle)
+
+    def maybe_save(self, cycle: int) -> bool:
+        if self.last_cycle is not None and cycle - self.last_cycle < self.every:
+            return False
+        self.save()
+        return True
+
+    def save(self) -> int:
+        started_at = time.perf_counter()
+        state = self.capture()
+        self.last_bytes = save(state, self.path, self.compress, self.external)
+        self.last_cycle = _cycle_of(state)
+        self.saved += 1
+        self.seconds += time.perf_counter() - started_at
+        return self.last_bytes
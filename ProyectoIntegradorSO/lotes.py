@@ -0,0 +1,144 @@
+import heapq
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa el cálculo en Python puro
+    np = None
+
+from memoria import create_allocator
+from metricas import SchedulingMetrics
+
+# Políticas no expropiativas cuyo plan se puede calcular sin simular ciclo a ciclo.
+# Solo lo usa la comparación de algoritmos (comparacion.run_configuration); las
+# simulaciones de Session y de la orden run pasan siempre por el motor
+BATCH_ALGORITHMS = ("fcfs", "sjf", "priority")
+
+
+class BatchResult:
+    """
+    Plan completo de una carga calculado en lote.
+    starts y finishes están en el orden de la carga (orden de PID): el
+    proceso se despacha al inicio del ciclo starts[i] y termina en el
+    instante finishes[i]. metrics y memory coinciden con los del motor
+    ciclo a ciclo.
+    """
+
+    def __init__(self, starts, finishes, metrics: SchedulingMetrics, memory: dict, end_time: int):
+        self.starts = starts
+        self.finishes = finishes
+        self.metrics = metrics
+        self.memory = memory
+        self.end_time = end_time
+
+
+def run_batch(workload: Sequence[tuple], algorithm: str, cores: int = 1,
+              allocator: str = "first_fit", total_memory: int = 4096) -> Optional[BatchResult]:
+    """
+    Calcula de una vez el plan de FCFS, SJF o Prioridad (sin expropiación)
+    para una carga de tuplas (llegada, prioridad, memoria, tiempo de CPU)
+    ordenada por llegada, sobre un sistema nuevo con una cola de listos
+    compartida. Solo FCFS con un núcleo está vectorizado (sumas
+    acumuladas); SJF, Prioridad y FCFS con varios núcleos avanzan de
+    despacho en despacho con montículos en Python, porque cada elección
+    depende de qué procesos han llegado, y cuestan O(n log n).
+    Devuelve None si algún proceso tendría que esperar memoria para ser
+    admitido: en ese caso el plan depende de la admisión y hay que simular.
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in BATCH_ALGORITHMS:
+        raise ValueError(f"El algoritmo {algorithm} no admite planificación en lote")
+
+    arrivals = [spec[0] for spec in workload]
+    bursts = [spec[3] for spec in workload]
+    if not arrivals:
+        return BatchResult([], [], SchedulingMetrics(cores), create_allocator(allocator, total_memory).stats(), 0)
+
+    if algorithm == "fcfs" and cores == 1:
+        starts, finishes = _fcfs_single_core(arrivals, bursts)
+    else:
+        keys = None
+        if algorithm == "sjf":
+            keys = bursts
+        elif algorithm == "priority":
+            keys = [spec[1] for spec in workload]
+        starts, finishes = _dispatch_loop(arrivals, bursts, keys, cores)
+
+    memory = _replay_memory(arrivals, [spec[2] for spec in workload], finishes, allocator, total_memory)
+    if memory is None:
+        return None
+
+    end_time = max(finishes)
+    metrics = SchedulingMetrics(cores)
+    metrics.record_batch(arrivals, bursts, starts, finishes, [spec[1] for spec in workload])
+    metrics.idle_cycles = end_time * cores - metrics.busy_cycles
+    return BatchResult(starts, finishes, metrics, memory, end_time)
+
+
+def _fcfs_single_core(arrivals: List[int], bursts: List[int]):
+    # Cada proceso ocupa su ráfaga más el ciclo de despacho:
+    # inicio_i = max(llegada_i, fin_{i-1}) y fin_i = inicio_i + ráfaga_i + 1
+    if np is None:
+        starts, finishes = [], []
+        finish = 0
+        for arrival, burst in zip(arrivals, bursts):
+            start = max(arrival, finish)
+            finish = start + burst + 1
+            starts.append(start)
+            finishes.append(finish)
+        return starts, finishes
+
+    # fin_i = S_i + max_{j<=i}(llegada_j - S_{j-1}), con S la suma acumulada de las ocupaciones
+    occupancy = np.asarray(bursts, dtype=np.int64) + 1
+    cumulative = np.cumsum(occupancy)
+    slack = np.asarray(arrivals, dtype=np.int64) - (cumulative - occupancy)
+    finishes = cumulative + np.maximum.accumulate(slack)
+    starts = finishes - occupancy
+    return starts.tolist(), finishes.tolist()
+
+
+def _dispatch_loop(arrivals: List[int], bursts: List[int], keys: Optional[List[int]], cores: int):
+    # Cada núcleo libre toma el proceso listo con menor clave; en empate, el que llegó antes.
+    # Bucle en Python puro: un despacho por proceso, sin recorrer los ciclos intermedios
+    count = len(arrivals)
+    starts = [0] * count
+    finishes = [0] * count
+    free_at = [0] * cores  # Montículo: instante en que cada núcleo queda libre
+    ready = []
+    pending = 0  # Siguiente proceso de la carga aún no llegado
+    time = 0
+
+    for _ in range(count):
+        # Un núcleo que quedó libre antes y siguió inactivo despacha ahora, no en el pasado
+        time = max(time, free_at[0])
+        if not ready and arrivals[pending] > time:
+            time = arrivals[pending]
+        while pending < count and arrivals[pending] <= time:
+            heapq.heappush(ready, (keys[pending] if keys is not None else 0, pending))
+            pending += 1
+
+        _, index = heapq.heappop(ready)
+        starts[index] = time
+        finishes[index] = time + bursts[index] + 1
+        heapq.heapreplace(free_at, finishes[index])
+
+    return starts, finishes
+
+
+def _replay_memory(arrivals: List[int], memories: List[int], finishes: List[int],
+                   allocator: str, total_memory: int) -> Optional[dict]:
+    # Reproduce admisiones (al llegar) y liberaciones (al terminar) en el orden del motor:
+    # las liberaciones de un instante preceden a las admisiones de ese mismo instante
+    memory = create_allocator(allocator, total_memory)
+    by_finish = sorted(range(len(finishes)), key=finishes.__getitem__)
+    released = 0
+    for pid, (arrival, size) in enumerate(zip(arrivals, memories)):
+        while finishes[by_finish[released]] <= arrival:
+            memory.free(by_finish[released])
+            released += 1
+        if not memory.allocate(pid, size):
+            return None
+
+    for index in by_finish[released:]:
+        memory.free(index)
+    return memory.stats()
@@ -1,8 +1,21 @@
-from cli import CLI
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional
+from carga import DISTRIBUTIONS
+from trazas import FORMATS
 
+# Las órdenes importan los módulos que necesitan solo al ejecutarse: el modo por órdenes nunca carga
+# rich, y rich solo se carga al abrir el menú interactivo.
+OUTPUT_FORMATS = ("json", "csv", "table")
+
+
+def interactive() -> None:
+    """Menú interactivo del simulador"""
+    from cli import CLI
 
-def main():
-    """Función principal que ejecuta el simulador del SO"""
     cli = CLI()
 
     while True:
@@ -33,12 +46,257 @@ def main():
             cli.view_messages()
         elif option == "12":
             cli.run_producer_consumer()
+        elif option == "13":
+            cli.generate_workload_interactive()
+        elif option == "14":
+            cli.show_metrics()
+        elif option == "15":
+            cli.compare_algorithms_interactive()
+        elif option == "16":
+            cli.change_memory_allocator()
+        elif option == "17":
+            cli.configure_mailbox_interactive()
+        elif option == "18":
+            cli.group_messaging()
+        elif option == "19":
+            cli.synchronization()
+        elif option == "20":
+            cli.toggle_log_writer()
+        elif option == "21":
+            cli.journal_menu()
+        elif option == "22":
+            cli.snapshot_menu()
+        elif option == "23":
+            cli.trace_menu()
         elif option == "0":
+            cli.close()
             print("¡Hasta luego!")
             break
         else:
             print("Opción no válida. Intente nuevamente.")
 
 
+
+def _integers(text: str) -> List[int]:
+    # Lista de enteros separados por comas, como "1,2,4"
+    try:
+        return [int(item) for item in text.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaban enteros separados por comas: {text}") from None
+
+
+def _names(text: str) -> List[str]:
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def _flatten(row: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    # Aplana los diccionarios anidados (metrics.completed, memory.allocator...) en columnas
+    flat = {}
+    for key, value in row.items():
+        name = prefix + str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _format_pairs(rows: List[Dict[str, Any]]) -> str:
+    # Una línea "clave valor" por campo, para los resultados de una sola fila
+    flat = _flatten(rows[0])
+    width = max(map(len, flat))
+    return "\n".join(f"{key.ljust(width)}  {value}" for key, value in flat.items())
+
+
+def _write(args: argparse.Namespace, document: Any, rows: List[Dict[str, Any]],
+           table: Optional[Callable[[List[Dict[str, Any]]], str]] = None) -> None:
+    """
+    Escribe el resultado de una orden en el formato pedido: document
+    completo en JSON, o rows como CSV (una columna por campo) o como tabla
+    de texto.
+    """
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(document, output, indent=2, ensure_ascii=False)
+            output.write("\n")
+        elif args.format == "csv":
+            flat = [_flatten(row) for row in rows]
+            columns = list(dict.fromkeys(key for row in flat for key in row))
+            writer = csv.DictWriter(output, columns)
+            writer.writeheader()
+            writer.writerows(flat)
+        else:
+            output.write((table or _format_pairs)(rows) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def _generation(args: argparse.Namespace) -> Dict[str, Any]:
+    # Parámetros de carga.generate_workload de las opciones --generate
+    return {"seed": args.seed, "arrival_rate": args.arrival_rate, "burst_distribution": args.distribution,
+            "mean_burst": args.mean_burst}
+
+
+def command_run(args: argparse.Namespace) -> int:
+    from sesion import Session
+
+    session = Session()
+    session.set_allocator(args.allocator)
+    # El sorteo de lottery usa por defecto la semilla de la carga: misma orden, misma ejecución
+    seed = args.lottery_seed if args.lottery_seed is not None else args.seed
+    session.set_algorithm(args.algorithm, args.quantum, args.cores, args.per_core_queues, seed=seed)
+    if args.record:
+        session.start_recording(args.record)
+    if args.workload:
+        session.import_workload(args.workload, args.workload_format)
+    else:
+        session.add_synthetic_workload(args.generate, **_generation(args))
+    if args.checkpoint:
+        session.enable_checkpoints(args.checkpoint, args.checkpoint_every)
+
+    result = session.run(args.cycles)
+    session.stop_recording()
+    summary = dict(result.summary, settings=session.settings())
+    _write(args, summary, [summary])
+    return 0
+
+
+def command_replay(args: argparse.Namespace) -> int:
+    from sesion import Session
+    from trazas import TraceReplay
+
+    report = TraceReplay(Session(), args.trace, args.trace_format).run()
+    report["errors"] = [{"time": time, "op": op, "reason": reason} for time, op, reason in report["errors"]]
+    _write(args, report, [report])
+    # Código de salida 1 si el estado final difiere del grabado
+    return 1 if report["matches"] is False else 0
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    from comparacion import ALGORITHMS, DEFAULT_QUANTA, compare_algorithms, format_comparison
+
+    if args.workload:
+        from trazas import TraceReader
+
+        # Los procesos trabajadores reciben la carga completa
+        with TraceReader(args.workload, args.workload_format, jobs_only=True) as reader:
+            workload = list(reader)
+    else:
+        # Cada trabajador regenera la carga a partir de la semilla
+        workload = dict(_generation(args), count=args.generate)
+
+    rows = compare_algorithms(workload, args.algorithms or ALGORITHMS, args.quanta or DEFAULT_QUANTA,
+                              args.max_cycles, args.workers, args.cores, args.per_core_queues, args.allocator)
+    _write(args, rows, rows, format_comparison)
+    return 0
+
+
+def command_bench(args: argparse.Namespace) -> int:
+    import rendimiento
+
+    rows = rendimiento.benchmark_grid(args.buffer_sizes or rendimiento.DEFAULT_BUFFER_SIZES, args.producers,
+                                      args.consumers, args.items, args.batch, args.mode)
+    _write(args, rendimiento.results_document(rows), rows, rendimiento.format_benchmark)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Simulador de sistema operativo. Sin orden se abre el menú interactivo; con una orden "
+                    "se ejecuta sin interfaz y el resultado se escribe en JSON, CSV o texto.")
+    commands = parser.add_subparsers(dest="command", metavar="orden")
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=OUTPUT_FORMATS, default="json",
+                        help="formato de salida (por defecto, json)")
+    output.add_argument("-o", "--output", metavar="ARCHIVO",
+                        help="archivo de salida (por defecto, la salida estándar)")
+
+    workload = argparse.ArgumentParser(add_help=False)
+    source = workload.add_mutually_exclusive_group(required=True)
+    source.add_argument("--workload", metavar="ARCHIVO",
+                        help="carga de trabajo CSV o JSONL con columnas time, priority, memory y burst")
+    source.add_argument("--generate", type=int, metavar="N", help="generar una carga sintética de N procesos")
+    workload.add_argument("--workload-format", choices=FORMATS,
+                          help="formato de la carga (por defecto, según la extensión)")
+    workload.add_argument("--seed", type=int, default=42, help="semilla de la carga sintética")
+    workload.add_argument("--arrival-rate", type=float, default=0.2, help="llegadas por ciclo")
+    workload.add_argument("--mean-burst", type=float, default=5.0, help="tiempo medio de CPU")
+    workload.add_argument("--distribution", choices=DISTRIBUTIONS, default="exponential",
+                          help="distribución del tiempo de CPU")
+    workload.add_argument("--allocator", default="first_fit", help="asignador de memoria")
+    workload.add_argument("--per-core-queues", action="store_true",
+                          help="una cola de listos por núcleo con robo de trabajo")
+
+    run = commands.add_parser("run", parents=[workload, output],
+                              help="simular una carga con un algoritmo",
+                              description="Simula una carga con un algoritmo por eventos, sin interfaz. "
+                                          "El resumen incluye el tiempo real y los ciclos por segundo.")
+    run.add_argument("--algorithm", default="fcfs", help="algoritmo de planificación (por defecto, fcfs)")
+    run.add_argument("--quantum", type=int, default=2, help="quantum o porción base en ciclos")
+    run.add_argument("--cores", type=int, default=1, help="número de núcleos")
+    run.add_argument("--lottery-seed", type=int, metavar="N",
+                     help="semilla del sorteo del algoritmo lottery (por defecto, la de --seed)")
+    run.add_argument("--cycles", type=int, help="ciclos a simular (por defecto, hasta completar la carga)")
+    run.add_argument("--checkpoint", metavar="ARCHIVO", help="guardar puntos de control en ARCHIVO")
+    run.add_argument("--checkpoint-every", type=int, default=1000, metavar="N",
+                     help="ciclos entre puntos de control")
+    run.add_argument("--record", metavar="TRAZA", help="grabar la ejecución como traza reproducible")
+    run.set_defaults(handler=command_run)
+
+    replay = commands.add_parser("replay", parents=[output], help="reproducir una traza",
+                                 description="Reproduce una traza grabada o escrita a mano. Si la traza "
+                                             "se grabó, el código de salida es 1 cuando el estado final "
+                                             "no coincide con el grabado.")
+    replay.add_argument("trace", metavar="TRAZA", help="archivo de la traza")
+    replay.add_argument("--trace-format", choices=FORMATS, help="formato (por defecto, según la extensión)")
+    replay.set_defaults(handler=command_replay)
+
+    compare = commands.add_parser("compare", parents=[workload, output],
+                                  help="comparar algoritmos sobre la misma carga")
+    compare.add_argument("--algorithms", type=_names, metavar="A,B,...",
+                         help="algoritmos a comparar (por defecto, todos)")
+    compare.add_argument("--quanta", type=_integers, metavar="Q,...",
+                         help="quantums de Round Robin y MLFQ (por defecto, 1,2,4,8)")
+    compare.add_argument("--cores", type=_integers, default=[1], metavar="N,...", help="números de núcleos")
+    compare.add_argument("--max-cycles", type=int, help="límite de ciclos por configuración")
+    compare.add_argument("--workers", type=int, help="procesos trabajadores (por defecto, uno por CPU)")
+    compare.set_defaults(handler=command_compare)
+
+    bench = commands.add_parser("bench", parents=[output],
+                                help="medir el productor-consumidor con concurrencia real")
+    bench.add_argument("--buffer-sizes", type=_integers, metavar="N,...",
+                       help="tamaños de buffer (por defecto, 1,8,64,512)")
+    bench.add_argument("--producers", type=int, default=2)
+    bench.add_argument("--consumers", type=int, default=2)
+    bench.add_argument("--items", type=int, default=20000)
+    bench.add_argument("--batch", type=int, default=1)
+    bench.add_argument("--mode", default="threads", help="threads o asyncio")
+    bench.set_defaults(handler=command_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal que ejecuta el simulador del SO"""
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # La salida se cerró antes de terminar (por ejemplo, con | head): se descarta el resto
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
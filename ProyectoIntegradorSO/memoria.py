@@ -0,0 +1,406 @@
+import heapq
+import time
+from typing import Dict
+
+ALLOCATORS = ("first_fit", "best_fit", "worst_fit", "next_fit", "buddy", "paging")
+
+
+class MemoryAllocator:
+    """
+    Asignador de memoria simulada (en MB).
+    Las subclases deciden dónde vive cada reserva; la base lleva la
+    contabilidad común: memoria reservada y solicitada por proceso, fallos
+    y latencia de asignación.
+    """
+
+    name = "base"
+
+    def __init__(self, total: int):
+        self.total = total
+        self.used = 0  # Memoria reservada, incluida la fragmentación interna
+        self.requested = 0  # Memoria pedida por los procesos
+        self.allocations = 0
+        self.failures = 0
+        self.frees = 0
+        self.alloc_ns = 0
+        self._requests = {}  # pid -> memoria solicitada
+
+    @property
+    def free_memory(self) -> int:
+        return self.total - self.used
+
+    def allocate(self, pid: int, size: int) -> bool:
+        if pid in self._requests or size <= 0:
+            return False
+
+        started_at = time.perf_counter_ns()
+        reserved = self._allocate(pid, size)
+        self.alloc_ns += time.perf_counter_ns() - started_at
+
+        if reserved is None:
+            self.failures += 1
+            return False
+
+        self.allocations += 1
+        self.used += reserved
+        self.requested += size
+        self._requests[pid] = size
+        return True
+
+    def free(self, pid: int) -> int:
+        # Libera la reserva del proceso; liberar un PID sin reserva no tiene efecto
+        size = self._requests.pop(pid, None)
+        if size is None:
+            return 0
+
+        reserved = self._free(pid)
+        self.frees += 1
+        self.used -= reserved
+        self.requested -= size
+        return reserved
+
+    def can_allocate(self, size: int) -> bool:
+        return 0 < size <= self.largest_free_block()
+
+    def largest_free_block(self) -> int:
+        raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def _allocate(self, pid: int, size: int) -> int:
+        # Devuelve la memoria reservada o None si no hay hueco
+        raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def _free(self, pid: int) -> int:
+        raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def stats(self) -> Dict:
+        free = self.free_memory
+        attempts = self.allocations + self.failures
+        return {
+            "allocator": self.name,
+            "total": self.total,
+            "used": self.used,
+            "free": free,
+            "largest_free_block": self.largest_free_block(),
+            # Memoria reservada pero no solicitada (redondeos de bloque o página)
+            "internal_fragmentation": self.used - self.requested,
+            # Fracción de la memoria libre que no es utilizable por la mayor petición posible
+            "external_fragmentation": 1 - self.largest_free_block() / free if free else 0.0,
+            "allocations": self.allocations,
+            "failures": self.failures,
+            "frees": self.frees,
+            "mean_alloc_us": self.alloc_ns / attempts / 1000 if attempts else 0.0
+        }
+
+
+class _MaxTree:
+    """
+    Árbol de segmentos sobre las posiciones [0, n) con el máximo de cada
+    rango. Actualizar una posición y encontrar la primera o la última con
+    valor >= v cuestan O(log n).
+    """
+
+    def __init__(self, n: int):
+        size = 1
+        while size < n:
+            size <<= 1
+        self._size = size
+        self._tree = [0] * (2 * size)
+
+    def __getitem__(self, position: int) -> int:
+        return self._tree[self._size + position]
+
+    def set(self, position: int, value: int) -> None:
+        tree = self._tree
+        node = self._size + position
+        tree[node] = value
+        node >>= 1
+        while node:
+            left = tree[2 * node]
+            right = tree[2 * node + 1]
+            best = left if left > right else right
+            if tree[node] == best:
+                break  # Los antecesores ya tienen el máximo correcto
+            tree[node] = best
+            node >>= 1
+
+    def max(self) -> int:
+        return self._tree[1]
+
+    def first_at_least(self, value: int, low: int = 0) -> int:
+        # Posición más baja >= low cuyo valor es >= value, o None
+        tree = self._tree
+        size = self._size
+        if low >= size or tree[1] < value:
+            return None
+
+        # Sube desde la hoja low hasta el primer subárbol a su derecha que contiene un valor suficiente
+        node = size + low
+        if tree[node] < value:
+            while True:
+                while node & 1:
+                    node >>= 1
+                if not node:
+                    return None
+                node += 1
+                if tree[node] >= value:
+                    break
+        while node < size:
+            node = 2 * node if tree[2 * node] >= value else 2 * node + 1
+        return node - size
+
+    def last_at_least(self, value: int) -> int:
+        # Posición más alta cuyo valor es >= value, o None
+        tree = self._tree
+        if tree[1] < value:
+            return None
+        node = 1
+        while node < self._size:
+            node = 2 * node + 1 if tree[2 * node + 1] >= value else 2 * node
+        return node - self._size
+
+
+class FreeListAllocator(MemoryAllocator):
+    """
+    Lista de huecos libres con particiones variables.
+    Dos árboles de segmentos indexan los huecos: uno por dirección de
+    inicio con el tamaño de cada hueco (primer, siguiente y peor ajuste
+    bajan por el árbol hasta el primer o el último hueco suficiente) y otro
+    por tamaño con el número de huecos de cada tamaño (mejor ajuste busca
+    el menor tamaño suficiente). Los vecinos para coalescer se encuentran
+    por diccionarios de inicio y fin, así que asignar y liberar cuestan
+    O(log total).
+    """
+
+    FITS = ("first", "best", "worst", "next")
+
+    def __init__(self, total: int, fit: str = "first"):
+        if fit not in self.FITS:
+            raise ValueError(f"Estrategia de ajuste desconocida: {fit}")
+        super().__init__(total)
+        self.fit = fit
+        self.name = f"{fit}_fit"
+        self._sizes = {}  # inicio -> tamaño del hueco
+        self._ends = {}  # fin -> inicio del hueco
+        self._by_address = _MaxTree(total)  # Tamaño del hueco que empieza en cada dirección (0 si ninguno)
+        self._size_counts = _MaxTree(total + 1)  # Número de huecos de cada tamaño
+        self._starts_by_size = {}  # tamaño -> montículo de inicios (invalidación perezosa)
+        self._blocks = {}  # pid -> (inicio, tamaño)
+        self._rover = 0  # Dirección desde la que busca el siguiente ajuste
+        self._add_hole(0, total)
+
+    def largest_free_block(self) -> int:
+        return self._by_address.max()
+
+    def _find(self, size: int) -> int:
+        if self.fit == "best":
+            # Menor tamaño suficiente; entre huecos del mismo tamaño, el de menor dirección
+            best = self._size_counts.first_at_least(1, size)
+            return self._lowest_start(best) if best is not None else None
+
+        if self.fit == "worst":
+            # Mayor hueco; en empate, el de mayor dirección
+            largest = self._by_address.max()
+            return self._by_address.last_at_least(largest) if largest >= size else None
+
+        if self.fit == "next":
+            start = self._by_address.first_at_least(size, self._rover)
+            if start is not None:
+                return start
+        return self._by_address.first_at_least(size)
+
+    def _allocate(self, pid: int, size: int) -> int:
+        start = self._find(size)
+        if start is None:
+            return None
+
+        hole = self._remove_hole(start)
+        if hole > size:
+            self._add_hole(start + size, hole - size)
+        self._blocks[pid] = (start, size)
+        self._rover = start + size
+        return size
+
+    def _free(self, pid: int) -> int:
+        start, reserved = self._blocks.pop(pid)
+        size = reserved
+
+        # Coalescer con los huecos vecinos
+        if start + size in self._sizes:
+            size += self._remove_hole(start + size)
+        previous = self._ends.get(start)
+        if previous is not None:
+            size += self._remove_hole(previous)
+            start = previous
+        self._add_hole(start, size)
+        return reserved
+
+    def _lowest_start(self, size: int) -> int:
+        heap = self._starts_by_size[size]
+        while self._sizes.get(heap[0]) != size:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _add_hole(self, start: int, size: int) -> None:
+        self._sizes[start] = size
+        self._ends[start + size] = start
+        self._by_address.set(start, size)
+        self._size_counts.set(size, self._size_counts[size] + 1)
+        heapq.heappush(self._starts_by_size.setdefault(size, []), start)
+
+    def _remove_hole(self, start: int) -> int:
+        size = self._sizes.pop(start)
+        del self._ends[start + size]
+        self._by_address.set(start, 0)
+        count = self._size_counts[size] - 1
+        self._size_counts.set(size, count)
+
+        # Cuando las entradas obsoletas superan a las vigentes, el montículo se reconstruye
+        heap = self._starts_by_size[size]
+        if len(heap) > 2 * count:
+            live = sorted({s for s in heap if self._sizes.get(s) == size})
+            if live:
+                self._starts_by_size[size] = live
+            else:
+                del self._starts_by_size[size]
+        return size
+
+
+class BuddyAllocator(MemoryAllocator):
+    """
+    Sistema de compañeros (buddy).
+    Cada petición se redondea a la potencia de dos superior y se obtiene
+    partiendo bloques mayores; al liberar, un bloque se fusiona con su
+    compañero mientras este también esté libre. Asignar y liberar cuestan
+    O(log total).
+    """
+
+    name = "buddy"
+
+    def __init__(self, total: int, min_block: int = 1):
+        if total & (total - 1) or min_block & (min_block - 1):
+            raise ValueError("La memoria total y el bloque mínimo deben ser potencias de dos")
+        super().__init__(total)
+        self.max_order = total.bit_length() - 1
+        self.min_order = min_block.bit_length() - 1
+        # Por orden: conjunto de direcciones libres y montículo (invalidación perezosa) para tomar la menor
+        self._free_sets = [set() for _ in range(self.max_order + 1)]
+        self._free_heaps = [[] for _ in range(self.max_order + 1)]
+        self._blocks = {}  # pid -> (dirección, orden)
+        self._add_block(0, self.max_order)
+
+    def largest_free_block(self) -> int:
+        for order in range(self.max_order, self.min_order - 1, -1):
+            if self._free_sets[order]:
+                return 1 << order
+        return 0
+
+    def _order_for(self, size: int) -> int:
+        return max(self.min_order, (size - 1).bit_length())
+
+    def _allocate(self, pid: int, size: int) -> int:
+        order = self._order_for(size)
+        if order > self.max_order:
+            return None
+
+        available = next((o for o in range(order, self.max_order + 1) if self._free_sets[o]), None)
+        if available is None:
+            return None
+
+        address = self._pop_block(available)
+        # Partir el bloque: la mitad superior queda libre en cada nivel
+        while available > order:
+            available -= 1
+            self._add_block(address + (1 << available), available)
+
+        self._blocks[pid] = (address, order)
+        return 1 << order
+
+    def _free(self, pid: int) -> int:
+        address, order = self._blocks.pop(pid)
+        reserved = 1 << order
+
+        while order < self.max_order:
+            buddy = address ^ (1 << order)
+            if buddy not in self._free_sets[order]:
+                break
+            self._free_sets[order].remove(buddy)
+            self._purge(order)
+            address = min(address, buddy)
+            order += 1
+
+        self._add_block(address, order)
+        return reserved
+
+    def _add_block(self, address: int, order: int) -> None:
+        self._free_sets[order].add(address)
+        heapq.heappush(self._free_heaps[order], address)
+
+    def _pop_block(self, order: int) -> int:
+        free_set = self._free_sets[order]
+        heap = self._free_heaps[order]
+        while True:
+            address = heapq.heappop(heap)
+            if address in free_set:
+                free_set.remove(address)
+                self._purge(order)
+                return address
+
+    def _purge(self, order: int) -> None:
+        # Cuando las entradas obsoletas del montículo superan a las vigentes, se reconstruye
+        heap = self._free_heaps[order]
+        if len(heap) > 2 * len(self._free_sets[order]):
+            self._free_heaps[order] = sorted(self._free_sets[order])
+
+
+class PagingAllocator(MemoryAllocator):
+    """
+    Memoria paginada: cada proceso recibe marcos no contiguos y una tabla de
+    páginas (página -> marco). No hay fragmentación externa; la interna es
+    el sobrante de la última página.
+    """
+
+    name = "paging"
+
+    def __init__(self, total: int, page_size: int = 4):
+        if page_size <= 0 or total % page_size:
+            raise ValueError("El tamaño de página debe dividir la memoria total")
+        super().__init__(total)
+        self.page_size = page_size
+        self._free_frames = list(range(total // page_size))  # Montículo de marcos libres
+        self.page_tables = {}  # pid -> lista de marcos
+
+    def largest_free_block(self) -> int:
+        # Cualquier conjunto de marcos libres sirve: toda la memoria libre es utilizable
+        return len(self._free_frames) * self.page_size
+
+    def _allocate(self, pid: int, size: int) -> int:
+        pages = -(-size // self.page_size)
+        if pages > len(self._free_frames):
+            return None
+
+        self.page_tables[pid] = [heapq.heappop(self._free_frames) for _ in range(pages)]
+        return pages * self.page_size
+
+    def _free(self, pid: int) -> int:
+        frames = self.page_tables.pop(pid)
+        for frame in frames:
+            heapq.heappush(self._free_frames, frame)
+        return len(frames) * self.page_size
+
+    def translate(self, pid: int, address: int) -> int:
+        # Dirección lógica del proceso -> dirección física
+        page, offset = divmod(address, self.page_size)
+        return self.page_tables[pid][page] * self.page_size + offset
+
+
+def create_allocator(name: str, total: int) -> MemoryAllocator:
+    name = name.lower()
+
+    if name.endswith("_fit"):
+        return FreeListAllocator(total, name[:-len("_fit")])
+    elif name == "buddy":
+        return BuddyAllocator(total)
+    elif name == "paging":
+        return PagingAllocator(total)
+    else:
+        raise ValueError(f"Asignador de memoria desconocido: {name}")
@@ -0,0 +1,126 @@
+import math
+from array import array
+from typing import Dict, Optional
+from procesos import priority_weight
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    # Percentil por rango más cercano sobre una secuencia ya ordenada
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return float(sorted_values[min(rank, len(sorted_values)) - 1])
+
+
+def jain_index(values) -> float:
+    # Índice de equidad de Jain: 1 = reparto perfectamente equitativo, 1/n = máximo desequilibrio
+    # fsum hace el resultado independiente del orden en que se completaron los procesos
+    total = math.fsum(values)
+    squares = math.fsum(v * v for v in values)
+    if not values or squares == 0:
+        return 1.0
+    return (total * total) / (len(values) * squares)
+
+
+class SchedulingMetrics:
+    """
+    Métricas de planificación recogidas incrementalmente por el planificador.
+    Los tiempos se miden en ciclos: el ciclo de despacho cuenta como tiempo
+    de espera, de modo que espera = retorno - ráfaga original. Los tiempos por
+    proceso se guardan en arrays compactos para que el coste en memoria sea
+    de pocos bytes por proceso completado. Con varios núcleos, los ciclos
+    ocupados e inactivos se cuentan por núcleo.
+    """
+
+    def __init__(self, cores: int = 1):
+        self.cores = cores
+        self.busy_cycles = 0
+        self.idle_cycles = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.completed = 0
+        self.waiting_times = array("q")
+        self.turnaround_times = array("q")
+        self.response_times = array("q")
+        # Fracción de CPU recibida mientras estuvo en el sistema (ráfaga / retorno), para la equidad
+        self.service_ratios = array("d")
+        # La misma fracción dividida por el peso de la prioridad: con reparto proporcional ideal es constante
+        self.weighted_ratios = array("d")
+
+    def record_cycle(self, result: dict, time: int) -> None:
+        event_type = result["event"]
+        if event_type == "idle":
+            self.idle_cycles += 1
+            return
+
+        self.busy_cycles += 1
+        if event_type == "process_started":
+            self.record_dispatch(result["process"], time)
+        elif event_type == "process_completed":
+            self.record_completion(result["process"], time)
+        elif event_type == "process_preempted":
+            self.preemptions += 1
+
+    def record_dispatch(self, process, time: int) -> None:
+        # El despacho ocurre al inicio del ciclo que termina en time
+        self.context_switches += 1
+        process.context_switches += 1
+        if process.first_run_time is None:
+            process.first_run_time = time - 1
+
+    def record_completion(self, process, time: int) -> None:
+        process.completion_time = time
+        turnaround = time - process.arrival_time
+        self.completed += 1
+        self.turnaround_times.append(turnaround)
+        self.waiting_times.append(turnaround - process.initial_burst)
+        self.response_times.append(process.first_run_time - process.arrival_time)
+        self._record_service(process.initial_burst, turnaround, process.priority)
+
+    def record_batch(self, arrivals, bursts, starts, finishes, priorities) -> None:
+        # Procesos planificados en lote: un único despacho cada uno y sin expropiaciones
+        for arrival, burst, start, finish, priority in zip(arrivals, bursts, starts, finishes, priorities):
+            turnaround = finish - arrival
+            self.turnaround_times.append(turnaround)
+            self.waiting_times.append(turnaround - burst)
+            self.response_times.append(start - arrival)
+            self._record_service(burst, turnaround, priority)
+
+        count = len(self.turnaround_times) - self.completed
+        self.completed += count
+        self.context_switches += count
+        self.busy_cycles += sum(bursts) + count  # Ráfaga más el ciclo de despacho
+
+    def _record_service(self, burst: int, turnaround: int, priority: int) -> None:
+        ratio = burst / turnaround if turnaround > 0 else 1.0
+        self.service_ratios.append(ratio)
+        self.weighted_ratios.append(ratio / priority_weight(priority))
+
+    def report(self, elapsed_cycles: Optional[int] = None) -> Dict:
+        core_cycles = self.busy_cycles + self.idle_cycles
+        total_cycles = elapsed_cycles if elapsed_cycles is not None else core_cycles // self.cores
+        waits = sorted(self.waiting_times)
+        responses = sorted(self.response_times)
+        completed = self.completed
+
+        def mean(values) -> float:
+            return sum(values) / len(values) if len(values) else 0.0
+
+        return {
+            "completed": completed,
+            "cycles": total_cycles,
+            "throughput": completed / total_cycles if total_cycles else 0.0,
+            "cores": self.cores,
+            "cpu_utilization": self.busy_cycles / core_cycles if core_cycles else 0.0,
+            "mean_waiting": mean(waits),
+            "p95_waiting": percentile(waits, 0.95),
+            "p99_waiting": percentile(waits, 0.99),
+            "max_waiting": float(waits[-1]) if waits else 0.0,
+            "mean_turnaround": mean(self.turnaround_times),
+            "mean_response": mean(responses),
+            "p99_response": percentile(responses, 0.99),
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "fairness": jain_index(self.service_ratios),
+            "weighted_fairness": jain_index(self.weighted_ratios)
+        }
@@ -1,202 +1,712 @@
-import time
-from procesos import Process, ProcessManager
+import random
+from operator import methodcaller
+from procesos import Process, ProcessManager, priority_weight
 from recursos import SystemResources
+from metricas import SchedulingMetrics
 
 class Scheduler:
-    def __init__(self, process_manager: ProcessManager, resources: SystemResources):
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources,
+                 per_core_queues: bool = False, work_stealing: bool = True):
         self.process_manager = process_manager
         self.resources = resources
-        self.current_process = None
+        self.cores = resources.cpu_cores
+        self.running = [None] * self.cores  # Proceso en ejecución en cada núcleo
         self.name = "Base Scheduler"
         self.time = 0
-
-    def select_next_process(self) -> Process:
+        self.metrics = SchedulingMetrics(self.cores)
+        # Con colas por núcleo, un núcleo ocioso puede robar trabajo de otro
+        self.work_stealing = work_stealing
+        process_manager.partition_ready_queue(self.cores if per_core_queues else 1)
+        # Los índices del planificador anterior mantendrían vivas sus funciones clave y seguirían creciendo
+        process_manager.ready_queue.clear_indexes()
+
+    @property
+    def current_process(self) -> Process:
+        # Proceso del primer núcleo (el único en el modelo de una sola CPU)
+        return self.running[0]
+
+    def select_next_process(self, core: int = 0) -> Process:
         raise NotImplementedError("Este método debe ser implementado por las subclases")
 
+    def _pick(self, core: int, select) -> Process:
+        return self.process_manager.ready_queue.pick(core, select, self.work_stealing)
+
+    def _is_busy(self, core: int) -> bool:
+        process = self.running[core]
+        return process is not None and process.state == "running"
+
+    def has_pending_work(self) -> bool:
+        # Hay trabajo si un proceso ocupa algún núcleo, queda alguno listo o falta alguna llegada
+        if any(self._is_busy(core) for core in range(self.cores)):
+            return True
+        self._release_arrivals()
+        if self.resources.cpu_available and self.process_manager.ready_queue.first_ready() is not None:
+            return True
+        return self._arrival_gap() is not None
+
+    def _release_arrivals(self) -> None:
+        # Admite en la cola de listos los procesos cuya llegada ya alcanzó el reloj
+        self.process_manager.release_arrivals(self.time, self._admit)
+
+    def _admit(self, process: Process) -> bool:
+        # Un proceso que llega solo se admite si hay memoria para él
+        return self.resources.assign_memory(process.pid, process.memory)
+
+    def _arrival_gap(self) -> int:
+        # Ciclos hasta la próxima llegada futura; las que ya llegaron y esperan memoria
+        # solo pueden admitirse tras una finalización, que ya es un evento
+        arrival_time = self.process_manager.next_arrival_time(after=self.time)
+        if arrival_time is None:
+            return None
+        return arrival_time - self.time
+
     def execute_cycle(self) -> dict:
+        result = self._run_cycle()
+        for event in result["events"]:
+            self.metrics.record_cycle(event, self.time)
+        return result
+
+    def _run_cycle(self) -> dict:
+        self._release_arrivals()
         self.time += 1
 
-        # Si no hay proceso en ejecución, selecciona uno nuevo
-        if self.current_process is None or self.current_process.state != "running":
-            next_process = self.select_next_process()
-            if next_process and self.resources.cpu_available:
-                # Asigna CPU al proceso
-                self.resources.cpu_available = False
-                next_process.state = "running"
-                self.current_process = next_process
-                return {"event": "process_started", "process": next_process}
-            else:
-                # Si no hay proceso disponible o la CPU no está disponible
-                return {"event": "idle"}
+        # Primero despachan los núcleos libres y después avanzan los ocupados, de modo que
+        # un proceso expropiado en este ciclo no vuelve a despacharse hasta el siguiente
+        busy = [core for core in range(self.cores) if self._is_busy(core)]
+        results = [None] * self.cores
+        for core in range(self.cores):
+            if core not in busy:
+                results[core] = self._run_core(core)
+
+        # Las políticas expropiativas desalojan como mucho un núcleo por ciclo
+        victim = self._preemption_victim(busy, self.time)
+        for core in busy:
+            results[core] = self._preempt(core) if core == victim else self._run_core(core)
+        return self._combine(results)
+
+    def _preemption_victim(self, busy: list, now: int) -> int:
+        # Núcleo cuyo proceso debe ceder la CPU en el instante now; sin expropiación, ninguno
+        return None
+
+    def _preempt(self, core: int) -> dict:
+        # Devuelve el proceso del núcleo al final de la cola de listos (O(1))
+        process = self.running[core]
+        process.state = "ready"
+        self._vacate(core)
+        self.process_manager.ready_queue.requeue(process)
+        return {"event": "process_preempted", "process": process, "core": core}
+
+    def _combine(self, results: list) -> dict:
+        # Resultado del ciclo: el evento del primer núcleo activo, con el detalle por núcleo en "events"
+        result = dict(next((r for r in results if r["event"] != "idle"), results[0]))
+        result["events"] = results
+        return result
+
+    def _run_core(self, core: int) -> dict:
+        # Si el núcleo no tiene proceso en ejecución, selecciona uno nuevo
+        if not self._is_busy(core):
+            if self.running[core] is not None:
+                self._vacate(core)
+            next_process = self.select_next_process(core)
+            if next_process and self.resources.is_core_free(core):
+                self._dispatch(core, next_process)
+                return {"event": "process_started", "process": next_process, "core": core}
+            # Si no hay proceso disponible o el núcleo no está disponible
+            return {"event": "idle", "core": core}
 
         # Si hay un proceso en ejecución, reduce su tiempo de CPU
-        if self.current_process and self.current_process.state == "running":
-            self.current_process.burst_time -= 1
+        process = self.running[core]
+        process.burst_time -= 1
+
+        # Si el proceso ha terminado
+        if process.burst_time <= 0:
+            self._complete(core)
+            return {"event": "process_completed", "process": process, "core": core}
+
+        return {"event": "process_running", "process": process, "core": core}
+
+    def _dispatch(self, core: int, process: Process) -> None:
+        # Asigna el núcleo al proceso
+        self.process_manager.ready_queue.claim(process, core)
+        self.resources.acquire_core(core, process.pid)
+        process.state = "running"
+        self.running[core] = process
+
+    def _complete(self, core: int) -> None:
+        process = self.running[core]
+        self.process_manager.mark_terminated(process)
+        self.resources.release_memory(process.pid, process.memory)
+        self._vacate(core)
+
+    def _vacate(self, core: int) -> None:
+        # Libera el núcleo
+        self.resources.release_core(core)
+        self.running[core] = None
+
+    def evict(self, process: Process) -> None:
+        # Retira el proceso del núcleo que ocupa (suspensión o terminación forzada)
+        for core in range(self.cores):
+            if self.running[core] is process:
+                self._vacate(core)
+
+    def block(self, process: Process, reason: str) -> bool:
+        # El proceso pasa a esperar un evento (mensaje, semáforo...): deja su núcleo y no consume
+        # ciclos hasta que wake lo devuelve a la cola de listos
+        if not self.process_manager.block_process(process.pid, reason):
+            return False
+        self.evict(process)
+        return True
+
+    def wake(self, process: Process) -> bool:
+        return self.process_manager.wake_process(process.pid)
+
+    def _can_dispatch(self) -> bool:
+        # Algún núcleo libre tiene un proceso que despachar
+        return any(not self._is_busy(core) and self.select_next_process(core) is not None
+                   for core in range(self.cores))
+
+    def _run_length(self, core: int) -> int:
+        # Ciclos de pura ejecución del núcleo antes de que su proceso termine
+        return self.running[core].burst_time - 1
+
+    def cycles_until_next_event(self) -> int:
+        # Ciclos de pura ejecución (sin cambios de estado en ningún núcleo) antes del siguiente evento
+        busy = [core for core in range(self.cores) if self._is_busy(core)]
+        if self._can_dispatch() or self._preemption_victim(busy, self.time + 1) is not None:
+            return 0
+        lengths = [self._run_length(core) for core in busy]
+        horizon = self._decision_horizon(busy)
+        if horizon is not None:
+            lengths.append(horizon)
+        return max(0, min(lengths)) if lengths else 0
+
+    def _decision_horizon(self, busy: list) -> int:
+        # Ciclos que pueden saltarse antes de una decisión que dependa solo del reloj
+        # (envejecimiento, boost); None si la política no tiene ninguna
+        return None
+
+    def advance(self, max_cycles: int) -> dict:
+        """
+        Modo por eventos: avanza hasta el siguiente instante relevante
+        (finalización, fin de quantum o llegada de trabajo en cualquier
+        núcleo) en una sola llamada, sin superar max_cycles. El estado
+        resultante es idéntico al de ejecutar los mismos ciclos con
+        execute_cycle; el resultado indica en "cycles" cuántos ciclos se
+        consumieron.
+        """
+        self._release_arrivals()
+        gap = self._arrival_gap()
+        if gap is not None:
+            # No se salta ninguna llegada: debe entrar en la cola en el mismo instante que ciclo a ciclo
+            max_cycles = min(max_cycles, gap)
+
+        skip = min(self.cycles_until_next_event(), max_cycles)
+        if skip > 0:
+            self.time += skip
+            results = []
+            for core in range(self.cores):
+                if self._is_busy(core):
+                    process = self.running[core]
+                    process.burst_time -= skip
+                    self._skip_running(core, skip)
+                    self.metrics.busy_cycles += skip
+                    results.append({"event": "process_running", "process": process, "core": core})
+                else:
+                    self.metrics.idle_cycles += skip
+                    results.append({"event": "idle", "core": core})
+            result = self._combine(results)
+            result["cycles"] = skip
+            return result
 
-            # Si el proceso ha terminado
-            if self.current_process.burst_time <= 0:
-                self.current_process.state = "terminated"
-                self.resources.cpu_available = True  # Liberar CPU
-                self.resources.release_memory(self.current_process.pid, self.current_process.memory)
-                result = {"event": "process_completed", "process": self.current_process}
-                self.current_process = None
-                return result
+        busy = any(self._is_busy(core) for core in range(self.cores))
+        if not busy and max_cycles > 1 and not self._can_dispatch():
+            # Nada cambiará hasta la próxima llegada o hasta que intervenga el usuario
+            self.time += max_cycles
+            self.metrics.idle_cycles += max_cycles * self.cores
+            result = self._combine([{"event": "idle", "core": core} for core in range(self.cores)])
+            result["cycles"] = max_cycles
+            return result
 
-            return {"event": "process_running", "process": self.current_process}
-        self.resources.cpu_available = True
-        return {"event": "idle"}
+        result = self.execute_cycle()
+        result["cycles"] = 1
+        return result
+
+    def _skip_running(self, core: int, cycles: int) -> None:
+        pass
 
 
 class FCFSScheduler(Scheduler):
-    def __init__(self, process_manager: ProcessManager, resources: SystemResources):
-        super().__init__(process_manager, resources)
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, per_core_queues: bool = False,
+                 work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
         self.name = "First-Come, First-Served (FCFS)"
 
-    def select_next_process(self) -> Process:
-        for process in self.process_manager.ready_queue:
-            if process.state == "ready":
-                return process
-        return None
+    def select_next_process(self, core: int = 0) -> Process:
+        return self._pick(core, methodcaller("first_ready"))
 
 class SJFScheduler(Scheduler):
-    def __init__(self, process_manager: ProcessManager, resources: SystemResources):
-        super().__init__(process_manager, resources)
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, per_core_queues: bool = False,
+                 work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
         self.name = "Shortest Job First (SJF)"
 
-    def select_next_process(self) -> Process:
-        if not self.process_manager.ready_queue:
-            return None
-
-        ready_processes = [p for p in self.process_manager.ready_queue if p.state == "ready"]
-        if not ready_processes:
-            return None
-
-        return min(ready_processes, key=lambda p: p.burst_time)
+    def select_next_process(self, core: int = 0) -> Process:
+        # Montículo por tiempo de CPU restante: O(log n) por decisión
+        return self._pick(core, methodcaller("peek_min", "burst_time"))
 
 
 class PriorityScheduler(Scheduler):
-    def __init__(self, process_manager: ProcessManager, resources: SystemResources):
-        super().__init__(process_manager, resources)
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, per_core_queues: bool = False,
+                 work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
         self.name = "Priority Scheduler"
 
-    def select_next_process(self) -> Process:
-        if not self.process_manager.ready_queue:
-            return None
-
-        ready_processes = [p for p in self.process_manager.ready_queue if p.state == "ready"]
-        if not ready_processes:
-            return None
-
-        return min(ready_processes, key=lambda p: p.priority)
+    def select_next_process(self, core: int = 0) -> Process:
+        # Montículo por prioridad (menor valor = mayor prioridad)
+        return self._pick(core, methodcaller("peek_min", "priority"))
 
 
 class RoundRobinScheduler(Scheduler):
-    def __init__(self, process_manager: ProcessManager, resources: SystemResources, quantum: int = 2):
-        super().__init__(process_manager, resources)
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, quantum: int = 2,
+                 per_core_queues: bool = False, work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
         self.name = f"Round Robin (Quantum: {quantum})"
         self.quantum = max(1, quantum)  # Asegurarse de que quantum sea al menos 1
-        self.current_quantum = 0
+        self.quantum_used = [0] * self.cores  # Quantum consumido en cada núcleo
 
-    def select_next_process(self) -> Process:
-        if not self.process_manager.ready_queue:
-            return None
+    @property
+    def current_quantum(self) -> int:
+        return self.quantum_used[0]
 
-        if self.current_process and self.current_process.state == "running" and self.current_quantum >= self.quantum:
-            self.current_process.state = "ready"
+    def select_next_process(self, core: int = 0) -> Process:
+        return self._pick(core, methodcaller("first_ready"))
 
-            if self.current_process in self.process_manager.ready_queue:
-                self.process_manager.ready_queue.remove(self.current_process)
-                self.process_manager.ready_queue.append(self.current_process)
-            else:
-                self.process_manager.ready_queue.append(self.current_process)
-            self.resources.cpu_available = True
-            self.current_quantum = 0
-            self.current_process = None
+    def _run_core(self, core: int) -> dict:
+        if not self._is_busy(core):
+            return super()._run_core(core)
 
-        for process in self.process_manager.ready_queue:
-            if process.state == "ready":
-                self.current_quantum = 0
-                return process
+        # Si hay un proceso en ejecución, incrementar el quantum usado
+        self.quantum_used[core] += 1
+        result = super()._run_core(core)
 
-        return None
+        # Si el proceso ha agotado su quantum pero no ha terminado, rota al final de la cola
+        if result["event"] == "process_running" and self.quantum_used[core] >= self.quantum:
+            return self._preempt(core)
 
-    def execute_cycle(self) -> dict:
-        self.time += 1
+        return result
 
-        if self.current_process is None or self.current_process.state != "running":
-            next_process = self.select_next_process()
-            if next_process and self.resources.cpu_available:
-                # Asigna CPU al proceso
-                self.resources.cpu_available = False
-                next_process.state = "running"
-                self.current_process = next_process
-                self.current_quantum = 0
-                return {"event": "process_started", "process": next_process}
-            else:
-                # Si no hay proceso disponible o la CPU no está disponible
-                return {"event": "idle"}
-
-        # Si hay un proceso en ejecución
-        if self.current_process and self.current_process.state == "running":
-            # Incrementar quantum usado
-            self.current_quantum += 1
-
-            # Reducir tiempo de CPU del proceso
-            self.current_process.burst_time -= 1
-
-            # Si el proceso ha terminado
-            if self.current_process.burst_time <= 0:
-                self.current_process.state = "terminated"
-                self.resources.cpu_available = True
-                self.resources.release_memory(self.current_process.pid, self.current_process.memory)
-                result = {"event": "process_completed", "process": self.current_process}
-                self.current_process = None
-                self.current_quantum = 0
-                return result
-
-            # Si el proceso ha agotado su quantum pero no ha terminado
-            if self.current_quantum >= self.quantum:
-                process_to_preempt = self.current_process
-                process_to_preempt.state = "ready"
-                self.resources.cpu_available = True
-
-                # Verificar si el proceso está en la cola antes de manipularlo
-                if process_to_preempt in self.process_manager.ready_queue:
-                    self.process_manager.ready_queue.remove(process_to_preempt)
-                    self.process_manager.ready_queue.append(process_to_preempt)
-                else:
-                    self.process_manager.ready_queue.append(process_to_preempt)
-
-                result = {"event": "process_preempted", "process": process_to_preempt}
-                self.current_process = None
-                self.current_quantum = 0
-                return result
+    def _vacate(self, core: int) -> None:
+        super()._vacate(core)
+        self.quantum_used[core] = 0
 
-            # Si el proceso sigue ejecutándose sin haber agotado su quantum
-            return {"event": "process_running", "process": self.current_process}
+    def _run_length(self, core: int) -> int:
+        return min(super()._run_length(core), self.quantum - self.quantum_used[core] - 1)
 
-        self.resources.cpu_available = True
-        return {"event": "idle"}
+    def _skip_running(self, core: int, cycles: int) -> None:
+        self.quantum_used[core] += cycles
 
     def set_quantum(self, quantum: int) -> None:
         self.quantum = max(1, quantum)
         self.name = f"Round Robin (Quantum: {self.quantum})"
-        self.current_quantum = 0
+        self.quantum_used = [0] * self.cores
+
+
+class PreemptiveScheduler(Scheduler):
+    """
+    Base de las políticas expropiativas.
+    Al comienzo de cada ciclo se comparan, con _rank (menor = más urgente),
+    los procesos en ejecución con el mejor candidato de la cola de su
+    núcleo. Los candidatos salen de montículos indexados de la cola de
+    listos, así que la comprobación cuesta O(log n) por ciclo en lugar de
+    recorrer la cola.
+    """
+
+    selector = None  # Operación de la cola de listos que devuelve el mejor candidato
+
+    def select_next_process(self, core: int = 0) -> Process:
+        return self._pick(core, self.selector)
+
+    def _rank(self, process: Process, now: int):
+        raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def _candidate(self, core: int) -> Process:
+        # Sin robo de trabajo: el proceso desalojado vuelve a la cola propia del núcleo
+        # y no debe recuperarlo en el ciclo siguiente en lugar del candidato
+        return self.process_manager.ready_queue.pick(core, self.selector)
+
+    def _preemption_victim(self, busy: list, now: int) -> int:
+        # Del peor proceso en ejecución al mejor: desaloja el primero que tenga un candidato más urgente
+        for core in sorted(busy, key=lambda c: self._rank(self.running[c], now), reverse=True):
+            candidate = self._candidate(core)
+            if candidate is not None and self._rank(candidate, now) < self._rank(self.running[core], now):
+                return core
+        return None
+
+
+class SRTFScheduler(PreemptiveScheduler):
+    selector = methodcaller("peek_min", "burst_time")
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, per_core_queues: bool = False,
+                 work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
+        self.name = "Shortest Remaining Time First (SRTF)"
+
+    def _rank(self, process: Process, now: int) -> int:
+        # El tiempo restante de los procesos en espera no cambia, así que solo
+        # una llegada puede provocar una expropiación
+        return process.burst_time
+
+
+class PreemptivePriorityScheduler(PreemptiveScheduler):
+    """
+    Prioridad expropiativa con envejecimiento.
+    Cada aging_interval ciclos de espera un proceso gana un nivel de
+    prioridad. La prioridad efectiva de un proceso listo es
+    priority - (now - ready_since) / aging_interval, de modo que el orden
+    entre procesos listos depende solo de la clave fija
+    priority * aging_interval + ready_since y el montículo no se reordena
+    con el paso del tiempo. Un proceso conserva mientras se ejecuta la
+    prioridad efectiva con la que fue despachado.
+    """
+
+    selector = methodcaller("peek_min", "aged_priority")
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, aging_interval: int = 10,
+                 per_core_queues: bool = False, work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
+        self.aging_interval = max(1, aging_interval)
+        self.name = f"Preemptive Priority (Aging: {self.aging_interval})"
+        self.ready_since = {}  # pid -> instante desde el que espera; si falta, su llegada
+        self.dispatch_rank = {}  # pid -> prioridad efectiva (escalada) con la que se despachó
+        self.process_manager.ready_queue.rebuild_index("aged_priority", self._aged_key)
+
+    def _aged_key(self, process: Process) -> int:
+        return process.priority * self.aging_interval + self.ready_since.get(process.pid, process.arrival_time)
+
+    def _rank(self, process: Process, now: int) -> int:
+        if process.state == "running":
+            return self.dispatch_rank[process.pid]
+        return self._aged_key(process) - now
+
+    def _dispatch(self, core: int, process: Process) -> None:
+        self.dispatch_rank[process.pid] = self._aged_key(process) - self.time
+        super()._dispatch(core, process)
+
+    def _preempt(self, core: int) -> dict:
+        # El envejecimiento del proceso desalojado cuenta desde ahora
+        self.ready_since[self.running[core].pid] = self.time
+        return super()._preempt(core)
+
+    def _vacate(self, core: int) -> None:
+        self.dispatch_rank.pop(self.running[core].pid, None)
+        super()._vacate(core)
+
+    def _complete(self, core: int) -> None:
+        self.ready_since.pop(self.running[core].pid, None)
+        super()._complete(core)
+
+    def _decision_horizon(self, busy: list) -> int:
+        # Un candidato desplaza a un proceso en ejecución en el primer instante now con
+        # clave - now < rango del proceso: hasta entonces se puede saltar
+        horizon = None
+        for core in busy:
+            candidate = self._candidate(core)
+            if candidate is not None:
+                first = self._aged_key(candidate) - self.dispatch_rank[self.running[core].pid] + 1
+                cycles = first - self.time - 1
+                horizon = cycles if horizon is None else min(horizon, cycles)
+        return horizon
+
+
+class MLFQScheduler(PreemptiveScheduler):
+    """
+    Cola multinivel con realimentación.
+    Los procesos entran en el nivel 0; quien agota el quantum de su nivel
+    baja al siguiente y un proceso de un nivel superior expropia a los de
+    niveles inferiores. Cada boost_interval ciclos todos vuelven al nivel 0
+    para que los procesos largos no sufran inanición. Dentro de un nivel el
+    orden es FIFO: el índice de la cola de listos ordena por (nivel, orden
+    de llegada), que equivale a una cola por nivel.
+    """
+
+    selector = methodcaller("peek_min", "mlfq_level")
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources,
+                 quanta=(2, 4, 8), boost_interval: int = 50, per_core_queues: bool = False,
+                 work_stealing: bool = True):
+        if not quanta:
+            raise ValueError("MLFQ necesita al menos un nivel")
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
+        self.quanta = tuple(max(1, quantum) for quantum in quanta)
+        self.boost_interval = max(1, boost_interval)
+        self.name = f"MLFQ (Quanta: {'/'.join(map(str, self.quanta))}, Boost: {self.boost_interval})"
+        self.levels = {}  # pid -> nivel actual; si falta, el nivel 0
+        self.quantum_used = [0] * self.cores
+        self.boosts = 0
+        self._next_boost = self.boost_interval
+        self.process_manager.ready_queue.rebuild_index("mlfq_level", self.level_of)
+
+    def level_of(self, process: Process) -> int:
+        return self.levels.get(process.pid, 0)
+
+    def _rank(self, process: Process, now: int) -> int:
+        return self.level_of(process)
+
+    def _run_cycle(self) -> dict:
+        if self.time >= self._next_boost:
+            self._boost()
+        return super()._run_cycle()
+
+    def _boost(self) -> None:
+        # Todos los procesos vuelven al nivel 0: las claves cambian a la vez y el índice se reconstruye
+        while self._next_boost <= self.time:
+            self._next_boost += self.boost_interval
+        self.levels.clear()
+        self.process_manager.ready_queue.rebuild_index("mlfq_level", self.level_of)
+        self.boosts += 1
+
+    def _run_core(self, core: int) -> dict:
+        if not self._is_busy(core):
+            return super()._run_core(core)
+
+        self.quantum_used[core] += 1
+        result = super()._run_core(core)
+
+        # Agotar el quantum del nivel degrada el proceso al nivel siguiente
+        if result["event"] == "process_running":
+            process = result["process"]
+            level = self.level_of(process)
+            if self.quantum_used[core] >= self.quanta[level]:
+                self.levels[process.pid] = min(level + 1, len(self.quanta) - 1)
+                return self._preempt(core)
+
+        return result
+
+    def _vacate(self, core: int) -> None:
+        super()._vacate(core)
+        self.quantum_used[core] = 0
+
+    def _complete(self, core: int) -> None:
+        self.levels.pop(self.running[core].pid, None)
+        super()._complete(core)
+
+    def _run_length(self, core: int) -> int:
+        quantum = self.quanta[self.level_of(self.running[core])]
+        return min(super()._run_length(core), quantum - self.quantum_used[core] - 1)
+
+    def _skip_running(self, core: int, cycles: int) -> None:
+        self.quantum_used[core] += cycles
+
+    def _decision_horizon(self, busy: list) -> int:
+        # El boost ocurre al empezar el ciclo en que el reloj alcanza _next_boost
+        return max(0, self._next_boost - self.time)
+
+
+class FairShareScheduler(Scheduler):
+    """
+    Base de las políticas de reparto proporcional.
+    Cada proceso tiene un peso derivado de su prioridad y un paso (tiempo
+    virtual) guardado en passes, que la cola de listos indexa en un
+    montículo: elegir al siguiente cuesta O(log n). Un proceso se ejecuta
+    durante su porción y vuelve a la cola con el paso avanzado según los
+    ciclos consumidos, de modo que cada uno recibe CPU en proporción a su
+    peso.
+    """
+
+    index = None  # Nombre del índice de la cola de listos ordenado por paso
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, quantum: int = 2,
+                 per_core_queues: bool = False, work_stealing: bool = True):
+        super().__init__(process_manager, resources, per_core_queues, work_stealing)
+        self.quantum = max(1, quantum)
+        self.passes = {}  # pid -> paso actual
+        self.virtual_time = 0  # Paso del último proceso despachado; nunca retrocede
+        self.slice_used = [0] * self.cores  # Ciclos consumidos de la porción en cada núcleo
+        self.process_manager.ready_queue.rebuild_index(self.index, self.pass_of)
+
+    def pass_of(self, process: Process):
+        # Un proceso nuevo recibe su paso inicial la primera vez que se indexa
+        value = self.passes.get(process.pid)
+        if value is None:
+            value = self.passes[process.pid] = self._initial_pass(process)
+        return value
+
+    def select_next_process(self, core: int = 0) -> Process:
+        return self._pick(core, methodcaller("peek_min", self.index))
+
+    def _initial_pass(self, process: Process):
+        raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def _advance(self, process: Process, cycles: int):
+        # Avance del paso por ejecutar los ciclos indicados
+        raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def _slice(self, process: Process) -> int:
+        return self.quantum
+
+    def _charge(self, process: Process, cycles: int):
+        return self.pass_of(process) + self._advance(process, cycles)
+
+    def _dispatch(self, core: int, process: Process) -> None:
+        # Un proceso que pasó mucho tiempo suspendido no acumula más de una porción de crédito
+        value = max(self.pass_of(process), self.virtual_time - self._advance(process, self._slice(process)))
+        self.passes[process.pid] = value
+        self.virtual_time = max(self.virtual_time, value)
+        super()._dispatch(core, process)
+
+    def _run_core(self, core: int) -> dict:
+        if not self._is_busy(core):
+            return super()._run_core(core)
+
+        self.slice_used[core] += 1
+        result = super()._run_core(core)
+
+        # Agotada la porción, el proceso vuelve a la cola con su paso actualizado
+        if result["event"] == "process_running" and self.slice_used[core] >= self._slice(result["process"]):
+            return self._preempt(core)
+
+        return result
+
+    def _vacate(self, core: int) -> None:
+        # Cobra los ciclos consumidos antes de que el proceso vuelva a la cola (o la abandone)
+        process = self.running[core]
+        if process is not None and self.slice_used[core]:
+            self.passes[process.pid] = self._charge(process, self.slice_used[core])
+        super()._vacate(core)
+        self.slice_used[core] = 0
+
+    def _complete(self, core: int) -> None:
+        pid = self.running[core].pid
+        super()._complete(core)
+        self.passes.pop(pid, None)
+
+    def _run_length(self, core: int) -> int:
+        process = self.running[core]
+        return min(super()._run_length(core), self._slice(process) - self.slice_used[core] - 1)
+
+    def _skip_running(self, core: int, cycles: int) -> None:
+        self.slice_used[core] += cycles
+
+
+class CFSScheduler(FairShareScheduler):
+    """
+    Planificador completamente justo (estilo CFS de Linux).
+    El paso es el vruntime: tiempo de CPU consumido ponderado por
+    1024 / peso, en 1/1024 de ciclo para trabajar con enteros. Se ejecuta
+    siempre el de menor vruntime, con una porción proporcional a su peso;
+    los procesos nuevos empiezan en el vruntime mínimo actual.
+    """
+
+    index = "vruntime"
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, quantum: int = 2,
+                 per_core_queues: bool = False, work_stealing: bool = True):
+        super().__init__(process_manager, resources, quantum, per_core_queues, work_stealing)
+        self.name = f"Completely Fair Scheduler (Quantum base: {self.quantum})"
+
+    def _initial_pass(self, process: Process) -> int:
+        return self.virtual_time
+
+    def _advance(self, process: Process, cycles: int) -> int:
+        return cycles * 1024 * 1024 // priority_weight(process.priority)
+
+    def _slice(self, process: Process) -> int:
+        return max(1, self.quantum * priority_weight(process.priority) // 1024)
+
+
+class StrideScheduler(FairShareScheduler):
+    """
+    Planificación por zancadas (stride scheduling).
+    Cada proceso avanza su paso en STRIDE1 / peso por quantum consumido y
+    se ejecuta el de menor paso; a diferencia de CFS todas las porciones
+    duran un quantum. Un proceso nuevo empieza una zancada por delante del
+    paso global para no adelantar a los que ya esperaban.
+    """
+
+    index = "stride_pass"
+    STRIDE1 = 1 << 20
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, quantum: int = 2,
+                 per_core_queues: bool = False, work_stealing: bool = True):
+        super().__init__(process_manager, resources, quantum, per_core_queues, work_stealing)
+        self.name = f"Stride Scheduling (Quantum: {self.quantum})"
+
+    def _stride(self, process: Process) -> int:
+        return self.STRIDE1 // priority_weight(process.priority)
+
+    def _initial_pass(self, process: Process) -> int:
+        return self.virtual_time + self._stride(process)
+
+    def _advance(self, process: Process, cycles: int) -> int:
+        return self._stride(process) * cycles // self.quantum
+
+
+class LotteryScheduler(FairShareScheduler):
+    """
+    Planificación por lotería, con tantos boletos como peso.
+    Cada sorteo es una carrera de relojes exponenciales: un proceso listo
+    tiene la clave reloj + Exp(peso) y gana la menor, lo que ocurre con
+    probabilidad peso / peso total. Por la falta de memoria de la
+    exponencial solo hay que volver a sortear la clave del ganador, así que
+    la selección es un montículo O(log n) en lugar de recorrer los boletos.
+    """
+
+    index = "lottery_ticket"
+
+    def __init__(self, process_manager: ProcessManager, resources: SystemResources, quantum: int = 2,
+                 per_core_queues: bool = False, seed: int = None, work_stealing: bool = True):
+        # El generador debe existir antes de indexar los procesos que ya están listos
+        self.rng = random.Random(seed)
+        super().__init__(process_manager, resources, quantum, per_core_queues, work_stealing)
+        self.name = f"Lottery Scheduling (Quantum: {self.quantum})"
+
+    def _draw(self, process: Process) -> float:
+        return self.virtual_time + self.rng.expovariate(priority_weight(process.priority) / 1024)
+
+    def _initial_pass(self, process: Process) -> float:
+        return self._draw(process)
+
+    def _advance(self, process: Process, cycles: int) -> int:
+        # Sin crédito acumulado: la clave de un proceso no puede quedar por detrás del reloj
+        return 0
+
+    def _charge(self, process: Process, cycles: int) -> float:
+        return self._draw(process)
 
 
 class SchedulerFactory:
     @staticmethod
     def create_scheduler(algorithm: str, process_manager: ProcessManager,
-                         resources: SystemResources, quantum: int = 2) -> Scheduler:
+                         resources: SystemResources, quantum: int = 2,
+                         per_core_queues: bool = False, aging_interval: int = 10,
+                         levels: int = 3, boost_interval: int = 50, seed: int = None,
+                         work_stealing: bool = True) -> Scheduler:
+        # work_stealing solo importa con per_core_queues: permite a un núcleo ocioso robar de otra cola
         algorithm = algorithm.lower()
 
         if algorithm == 'fcfs':
-            return FCFSScheduler(process_manager, resources)
+            return FCFSScheduler(process_manager, resources, per_core_queues, work_stealing)
         elif algorithm == 'sjf':
-            return SJFScheduler(process_manager, resources)
+            return SJFScheduler(process_manager, resources, per_core_queues, work_stealing)
         elif algorithm == 'priority':
-            return PriorityScheduler(process_manager, resources)
+            return PriorityScheduler(process_manager, resources, per_core_queues, work_stealing)
         elif algorithm == 'round_robin':
-            return RoundRobinScheduler(process_manager, resources, quantum)
+            return RoundRobinScheduler(process_manager, resources, quantum, per_core_queues, work_stealing)
+        elif algorithm == 'srtf':
+            return SRTFScheduler(process_manager, resources, per_core_queues, work_stealing)
+        elif algorithm == 'priority_preemptive':
+            return PreemptivePriorityScheduler(process_manager, resources, aging_interval, per_core_queues,
+                                               work_stealing)
+        elif algorithm == 'mlfq':
+            # El quantum se duplica en cada nivel inferior
+            quanta = [max(1, quantum) << level for level in range(max(1, levels))]
+            return MLFQScheduler(process_manager, resources, quanta, boost_interval, per_core_queues,
+                                 work_stealing)
+        elif algorithm == 'cfs':
+            return CFSScheduler(process_manager, resources, quantum, per_core_queues, work_stealing)
+        elif algorithm == 'stride':
+            return StrideScheduler(process_manager, resources, quantum, per_core_queues, work_stealing)
+        elif algorithm == 'lottery':
+            return LotteryScheduler(process_manager, resources, quantum, per_core_queues, seed, work_stealing)
         else:
             raise ValueError(f"Algoritmo desconocido: {algorithm}")
\ No newline at end of file
@@ -1,41 +1,682 @@
+import copy
+import heapq
+import itertools
+from array import array
+from bisect import bisect_left
+from collections import deque
+from operator import attrgetter, itemgetter
+
+
+def priority_weight(priority: int) -> int:
+    # Peso para el reparto proporcional: la prioridad 3 vale 1024 y cada nivel
+    # más prioritario pesa un 25 % más que el siguiente (como los niveles nice de Linux)
+    return max(1, round(1024 * 1.25 ** (3 - priority)))
+
+
 class Process:
-    def __init__(self, pid: int, priority: int, memory: int, burst_time: int):
+    # Sin __dict__: cada proceso ocupa solo sus campos, clave en simulaciones de millones de procesos
+    __slots__ = ("pid", "state", "priority", "memory", "burst_time", "arrival_time", "initial_burst",
+                 "first_run_time", "completion_time", "context_switches", "_resources")
+
+    def __init__(self, pid: int, priority: int, memory: int, burst_time: int, arrival_time: int = 0):
         self.pid = pid
         self.state = "ready"
         self.priority = priority
         self.memory = memory
         self.burst_time = burst_time
-        self.resources = []
-        self.arrival_time = 0
+        self._resources = None
+        self.arrival_time = arrival_time
+        # Contabilidad para las métricas de planificación
+        self.initial_burst = burst_time
+        self.first_run_time = None
+        self.completion_time = None
+        self.context_switches = 0
+
+    def __reduce__(self):
+        # Para las instantáneas: los campos como una tupla plana, sin el diccionario de cada proceso
+        return _restore_process, _PROCESS_FIELDS(self)
+
+    @property
+    def resources(self) -> list:
+        # Se crea al primer uso: la mayoría de los procesos nunca tiene recursos asignados
+        if self._resources is None:
+            self._resources = []
+        return self._resources
+
+    @property
+    def turnaround_time(self) -> int:
+        if self.completion_time is None:
+            return None
+        return self.completion_time - self.arrival_time
+
+    @property
+    def waiting_time(self) -> int:
+        if self.completion_time is None:
+            return None
+        return self.turnaround_time - self.initial_burst
+
+    @property
+    def response_time(self) -> int:
+        if self.first_run_time is None:
+            return None
+        return self.first_run_time - self.arrival_time
+
+
+_PROCESS_FIELDS = attrgetter(*Process.__slots__)
+
+
+def _restore_process(*fields) -> Process:
+    process = Process.__new__(Process)
+    for name, value in zip(Process.__slots__, fields):
+        setattr(process, name, value)
+    return process
+
+
+class ReadyQueue:
+    """
+    Cola de procesos listos.
+    Conserva el orden de llegada (FCFS) en una deque con un índice de
+    pertenencia por PID, de modo que encolar, rotar (Round Robin), retirar y
+    despachar son O(1) amortizado. Bajo demanda mantiene además montículos
+    indexados por un atributo del proceso (tiempo de CPU, prioridad...).
+    Todas las estructuras usan invalidación perezosa: las entradas de
+    procesos suspendidos, terminados o reencolados se descartan al llegar
+    al frente.
+    """
 
-class ProcessManager:
     def __init__(self):
-        self.processes = []
-        self.ready_queue = []
+        self._fifo = deque()  # (secuencia, pid) en orden de llegada
+        self._members = {}  # pid -> (secuencia, proceso) del ingreso vigente
+        self._parked = {}  # pid -> secuencia de miembros retirados del frente por no estar listos
+        self._returned = []  # Montículo (secuencia, pid) de procesos que volvieron a "ready"
+        self._sequence = itertools.count()
+        self._indexes = {}  # nombre -> (función clave, montículo)
+
+    def append(self, process: Process) -> None:
+        seq = next(self._sequence)
+        self._members[process.pid] = (seq, process)
+        self._fifo.append((seq, process.pid))
+        self._push(process, seq)
+
+    def remove(self, process: Process) -> None:
+        if process not in self:
+            raise ValueError(f"El proceso {process.pid} no está en la cola de listos")
+        del self._members[process.pid]
+        self._parked.pop(process.pid, None)
+
+    def discard(self, process: Process) -> None:
+        if process in self:
+            self.remove(process)
+
+    def requeue(self, process: Process) -> None:
+        # Mueve el proceso al final de la cola (rotación de Round Robin)
+        self.discard(process)
+        self.append(process)
+
+    def refresh(self, process: Process) -> None:
+        # El proceso volvió a "ready" sin cambiar su posición en la cola
+        if process not in self:
+            return
+
+        seq = self._members[process.pid][0]
+        if self._parked.get(process.pid) == seq:
+            del self._parked[process.pid]
+            heapq.heappush(self._returned, (seq, process.pid))
+        self._push(process, seq)
+
+    def first_ready(self) -> Process:
+        # Primer proceso en estado "ready" según el orden de llegada
+        fifo = self._fifo
+        members = self._members
+        candidate = None
+        while fifo:
+            seq, pid = fifo[0]
+            entry = members.get(pid)
+            if entry is not None and entry[0] == seq:
+                if entry[1].state == "ready":
+                    candidate = entry
+                    break
+                self._parked[pid] = seq
+            fifo.popleft()
+
+        returned = self._returned
+        while returned:
+            seq, pid = returned[0]
+            entry = members.get(pid)
+            if entry is not None and entry[0] == seq:
+                if entry[1].state == "ready":
+                    if candidate is None or seq < candidate[0]:
+                        candidate = entry
+                    break
+                self._parked[pid] = seq
+            heapq.heappop(returned)
+
+        return candidate[1] if candidate else None
+
+    def add_index(self, name: str, key=None) -> None:
+        if name in self._indexes:
+            return
+
+        key = key or attrgetter(name)
+        heap = [(key(process), seq, pid) for pid, (seq, process) in self._members.items()
+                if process.state == "ready"]
+        heapq.heapify(heap)
+        self._indexes[name] = (key, heap)
+
+    def rebuild_index(self, name: str, key=None) -> None:
+        # Reconstruye el índice cuando cambian de golpe las claves de los procesos que ya contiene
+        previous = self._indexes.pop(name, None)
+        self.add_index(name, key or (previous[0] if previous else None))
+
+    def drop_index(self, name: str) -> None:
+        self._indexes.pop(name, None)
+
+    def clear_indexes(self) -> None:
+        # Los índices pertenecen al planificador que los registró; al sustituirlo se descartan
+        self._indexes.clear()
+
+    def peek_min(self, name: str) -> Process:
+        # Primer proceso listo según el índice; en empate gana el que llegó antes
+        if name not in self._indexes:
+            self.add_index(name)
+
+        key, heap = self._indexes[name]
+        while heap:
+            value, seq, pid = heap[0]
+            entry = self._members.get(pid)
+            if entry is not None and entry[0] == seq:
+                process = entry[1]
+                if process.state == "ready" and key(process) == value:
+                    return process
+            heapq.heappop(heap)
+
+        return None
+
+    def pick(self, core: int, select, steal: bool = False) -> Process:
+        # Cola compartida por todos los núcleos: cualquiera puede tomar cualquier proceso
+        return select(self)
+
+    def claim(self, process: Process, core: int) -> None:
+        pass
+
+    def _push(self, process: Process, seq: int) -> None:
+        for key, heap in self._indexes.values():
+            heapq.heappush(heap, (key(process), seq, process.pid))
+
+    def __iter__(self):
+        # Solo para visualización: recorre los miembros en orden de llegada
+        return (process for _, process in sorted(self._members.values(), key=itemgetter(0)))
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, process: Process) -> bool:
+        entry = self._members.get(process.pid)
+        return entry is not None and entry[1] is process
+
+
+class PerCoreReadyQueue:
+    """
+    Colas de listos por núcleo con robo de trabajo.
+    Cada proceso entra en la cola del núcleo menos cargado y vuelve a ella
+    tras una expropiación, de modo que conserva la afinidad. Un núcleo sin
+    trabajo propio puede robar de la cola más cargada; el proceso robado
+    migra a la cola del núcleo que lo despacha.
+    """
+
+    def __init__(self, cores: int):
+        self.queues = [ReadyQueue() for _ in range(cores)]
+        self._home = {}  # pid -> núcleo cuya cola contiene el proceso
+        self._keys = {}  # nombre del índice -> función clave
+
+    def append(self, process: Process) -> None:
+        core = min(range(len(self.queues)), key=lambda c: len(self.queues[c]))
+        self._home[process.pid] = core
+        self.queues[core].append(process)
+
+    def remove(self, process: Process) -> None:
+        if process not in self:
+            raise ValueError(f"El proceso {process.pid} no está en la cola de listos")
+        self.queues[self._home.pop(process.pid)].remove(process)
+
+    def discard(self, process: Process) -> None:
+        if process in self:
+            self.remove(process)
+
+    def requeue(self, process: Process) -> None:
+        core = self._home.get(process.pid)
+        if core is None:
+            self.append(process)
+        else:
+            self.queues[core].requeue(process)
+
+    def refresh(self, process: Process) -> None:
+        core = self._home.get(process.pid)
+        if core is not None:
+            self.queues[core].refresh(process)
+
+    def first_ready(self) -> Process:
+        # Algún proceso listo en cualquiera de las colas
+        for queue in self.queues:
+            process = queue.first_ready()
+            if process is not None:
+                return process
+        return None
+
+    def add_index(self, name: str, key=None) -> None:
+        self._keys.setdefault(name, key or attrgetter(name))
+        for queue in self.queues:
+            queue.add_index(name, self._keys[name])
+
+    def rebuild_index(self, name: str, key=None) -> None:
+        self._keys[name] = key or self._keys.get(name) or attrgetter(name)
+        for queue in self.queues:
+            queue.rebuild_index(name, self._keys[name])
+
+    def drop_index(self, name: str) -> None:
+        self._keys.pop(name, None)
+        for queue in self.queues:
+            queue.drop_index(name)
+
+    def clear_indexes(self) -> None:
+        self._keys.clear()
+        for queue in self.queues:
+            queue.clear_indexes()
 
-    def create_process(self, priority: int, memory: int, burst_time: int) -> Process:
+    def peek_min(self, name: str) -> Process:
+        if name not in self._keys:
+            self.add_index(name)
+
+        # En empate entre colas gana el que llegó antes, como dentro de una misma cola
+        key = self._keys[name]
+        candidates = [p for p in (queue.peek_min(name) for queue in self.queues) if p is not None]
+        return min(candidates, key=lambda p: (key(p), p.arrival_time, p.pid)) if candidates else None
+
+    def pick(self, core: int, select, steal: bool = False) -> Process:
+        # Primero la cola propia; si no tiene trabajo, la más cargada de las demás
+        process = select(self.queues[core])
+        if process is not None or not steal:
+            return process
+
+        victims = sorted(range(len(self.queues)), key=lambda c: len(self.queues[c]), reverse=True)
+        for victim in victims:
+            if victim != core:
+                process = select(self.queues[victim])
+                if process is not None:
+                    return process
+        return None
 
-        pid = len(self.processes) + 1
-        new_process = Process(pid, priority, memory, burst_time)
-        self.processes.append(new_process)
-        self.ready_queue.append(new_process)
+    def claim(self, process: Process, core: int) -> None:
+        # El núcleo que despacha un proceso robado se convierte en su nuevo hogar
+        home = self._home.get(process.pid)
+        if home is not None and home != core:
+            self.queues[home].remove(process)
+            self.queues[core].append(process)
+            self._home[process.pid] = core
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.queues)
+
+    def __len__(self) -> int:
+        return len(self._home)
+
+    def __contains__(self, process: Process) -> bool:
+        core = self._home.get(process.pid)
+        return core is not None and process in self.queues[core]
+
+
+class ProcessArchive:
+    """
+    Archivo por columnas de procesos terminados.
+    Cada proceso archivado ocupa unas decenas de bytes repartidos en arrays
+    compactos en lugar de un objeto; find y la iteración reconstruyen
+    objetos Process solo cuando se consultan. Mientras los PID llegan en
+    orden creciente (asignador monotonic) find es una búsqueda binaria sin
+    memoria extra; si se reutiliza algún PID, pasa a un diccionario
+    pid -> fila.
+    """
+
+    COLUMNS = ("pid", "priority", "memory", "burst_time", "arrival_time", "initial_burst",
+               "first_run_time", "completion_time", "context_switches")
+
+    def __init__(self):
+        self._columns = {name: array("q") for name in self.COLUMNS}
+        self._rows = None  # pid -> última fila; solo cuando los PID dejan de estar ordenados
+
+    def append(self, process: Process) -> None:
+        pids = self._columns["pid"]
+        if self._rows is None and pids and process.pid <= pids[-1]:
+            self._rows = {pid: row for row, pid in enumerate(pids)}
+        if self._rows is not None:
+            self._rows[process.pid] = len(pids)
+
+        for name, column in self._columns.items():
+            value = getattr(process, name)
+            column.append(-1 if value is None else value)  # -1 = sin valor (nunca ejecutado)
+
+    def find(self, pid: int) -> Process:
+        # Última aparición: con reutilización de PID, el proceso archivado más reciente
+        if self._rows is not None:
+            row = self._rows.get(pid, -1)
+        else:
+            pids = self._columns["pid"]
+            row = bisect_left(pids, pid)
+            if row == len(pids) or pids[row] != pid:
+                row = -1
+        return self._view(row) if row >= 0 else None
+
+    def _view(self, row: int) -> Process:
+        values = {name: column[row] for name, column in self._columns.items()}
+        process = Process(values["pid"], values["priority"], values["memory"], values["burst_time"],
+                          values["arrival_time"])
+        process.state = "terminated"
+        process.initial_burst = values["initial_burst"]
+        process.context_switches = values["context_switches"]
+        if values["first_run_time"] >= 0:
+            process.first_run_time = values["first_run_time"]
+        if values["completion_time"] >= 0:
+            process.completion_time = values["completion_time"]
+        return process
+
+    def __iter__(self):
+        return (self._view(row) for row in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self._columns["pid"])
+
+
+class PidAllocator:
+    """
+    Asignador de PID con política de reutilización.
+    monotonic: nunca reutiliza un PID. lowest: reutiliza primero el PID
+    liberado más bajo, como los Unix clásicos. fifo: reutiliza en el orden
+    en que se liberaron, de modo que un PID tarda lo máximo posible en
+    volver a usarse.
+    """
+
+    POLICIES = ("monotonic", "lowest", "fifo")
+
+    def __init__(self, policy: str = "monotonic"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política de PID desconocida: {policy}")
+        self.policy = policy
+        self._next = 1
+        self._freed = deque() if policy == "fifo" else []
+
+    def allocate(self) -> int:
+        if self._freed:
+            if self.policy == "fifo":
+                return self._freed.popleft()
+            return heapq.heappop(self._freed)
+
+        pid = self._next
+        self._next += 1
+        return pid
+
+    def release(self, pid: int) -> None:
+        if self.policy == "fifo":
+            self._freed.append(pid)
+        elif self.policy == "lowest":
+            heapq.heappush(self._freed, pid)
+
+
+class WorkloadMerge:
+    """
+    Intercala por instante de llegada varias cargas de trabajo ya ordenadas.
+    Equivale a heapq.merge con clave de llegada (en empate gana la carga
+    añadida antes), pero es un iterador con estado propio que se puede
+    serializar en una instantánea si lo son las cargas que intercala.
+    """
+
+    def __init__(self):
+        self._sources = []
+        self._heads = []  # Montículo (llegada, índice de la carga, especificación)
+
+    def add(self, workload, head: tuple = None) -> None:
+        # head es una especificación ya extraída de workload que debe salir antes que el resto
+        source = iter(workload)
+        index = len(self._sources)
+        self._sources.append(source)
+        spec = head if head is not None else next(source, None)
+        if spec is not None:
+            heapq.heappush(self._heads, (spec[0], index, spec))
+
+    def __iter__(self) -> "WorkloadMerge":
+        return self
+
+    def __next__(self) -> tuple:
+        if not self._heads:
+            raise StopIteration
+
+        _, index, spec = self._heads[0]
+        following = next(self._sources[index], None)
+        if following is None:
+            heapq.heappop(self._heads)
+            self._sources[index] = iter(())  # La carga agotada ya no se conserva
+        else:
+            heapq.heapreplace(self._heads, (following[0], index, following))
+        return spec
+
+
+class ProcessManager:
+    # Procesos terminados en la tabla a partir de los cuales se archivan (si además son al menos la mitad)
+    COMPACT_THRESHOLD = 4096
+
+    def __init__(self, compact_threshold: int = COMPACT_THRESHOLD, pid_policy: str = "monotonic"):
+        self.processes = []  # Procesos vivos y terminados aún no archivados
+        self.archive = ProcessArchive()
+        self.compact_threshold = compact_threshold
+        self._terminated = 0  # Terminados que siguen en processes
+        self._pids = PidAllocator(pid_policy)
+        self._by_pid = {}  # pid -> proceso de processes; los archivados se buscan en el archivo
+        self.blocked = {}  # pid -> motivo por el que un proceso "waiting" espera un evento (IPC, semáforo)
+        self.ready_queue = ReadyQueue()
+        # Montículo (instante de llegada, pid, proceso) de procesos "new" aún no admitidos
+        self.pending_arrivals = []
+        self._workload = None  # Iterador de especificaciones (llegada, prioridad, memoria, tiempo)
+        self._next_spec = None
+
+    def create_process(self, priority: int, memory: int, burst_time: int, arrival_time: int = 0) -> Process:
+
+        new_process = self._new_process(priority, memory, burst_time, arrival_time)
+        if arrival_time > 0:
+            # Llegará en el futuro: espera en la cola de llegadas hasta que el planificador lo libere
+            self._add_pending(new_process)
+        else:
+            self.ready_queue.append(new_process)
         return new_process
 
-    def list_processes(self) -> list[Process]:
+    def schedule_arrival(self, priority: int, memory: int, burst_time: int, arrival_time: int) -> Process:
+        # Proceso de una carga de trabajo: espera en la cola de llegadas y se admite cuando hay memoria
+        process = self._new_process(priority, memory, burst_time, arrival_time)
+        self._add_pending(process)
+        return process
+
+    def _new_process(self, priority: int, memory: int, burst_time: int, arrival_time: int) -> Process:
+        # Los PID no se derivan del tamaño de la tabla, que se reduce al archivar
+        process = Process(self._pids.allocate(), priority, memory, burst_time, arrival_time)
+        self.processes.append(process)
+        self._by_pid[process.pid] = process
+        return process
+
+    def remove_process(self, process: Process) -> None:
+        # Deshace la creación de un proceso que no llegó a admitirse (p. ej. sin memoria)
+        self.processes.remove(process)
+        self.ready_queue.discard(process)
+        del self._by_pid[process.pid]
+        self._pids.release(process.pid)
+
+    def mark_terminated(self, process: Process) -> None:
+        process.state = "terminated"
+        self.ready_queue.discard(process)
+        self._terminated += 1
+        if self._terminated >= self.compact_threshold and self._terminated * 2 >= len(self.processes):
+            self.compact()
+
+    def compact(self) -> None:
+        # Mueve los procesos terminados al archivo por columnas; coste amortizado O(1) por proceso
+        live = []
+        for process in self.processes:
+            if process.state == "terminated":
+                self.archive.append(process)
+                del self._by_pid[process.pid]
+                self._pids.release(process.pid)  # El PID queda libre solo cuando sale de la tabla
+            else:
+                live.append(process)
+        self.processes = live
+        self._terminated = 0
+
+    def partition_ready_queue(self, cores: int) -> None:
+        # Reparte la cola de listos en una cola por núcleo; con cores=1 vuelve a la cola compartida
+        current = self.ready_queue
+        if isinstance(current, PerCoreReadyQueue):
+            if len(current.queues) == cores:
+                return
+        elif cores <= 1:
+            return
+
+        queue = PerCoreReadyQueue(cores) if cores > 1 else ReadyQueue()
+        for process in current:
+            queue.append(process)
+        self.ready_queue = queue
+
+    def _add_pending(self, process: Process) -> None:
+        process.state = "new"
+        heapq.heappush(self.pending_arrivals, (process.arrival_time, process.pid, process))
+
+    def attach_workload(self, workload) -> None:
+        """
+        Conecta una carga de trabajo perezosa: un iterable de tuplas
+        (llegada, prioridad, memoria, tiempo de CPU) ordenado por llegada.
+        Los procesos solo se crean cuando el reloj alcanza su llegada, de modo
+        que la memoria no crece con el tamaño total de la carga.
+        """
+        workload = iter(workload)
+        if self._next_spec is not None:
+            # Ya hay una carga en curso: se intercalan ambas por instante de llegada
+            merged = WorkloadMerge()
+            merged.add(self._workload, head=self._next_spec)
+            merged.add(workload)
+            workload = merged
+        self._workload = workload
+        self._next_spec = next(self._workload, None)
+
+    def upcoming_workload(self):
+        # Especificaciones de la carga perezosa que aún no se han creado, leídas de una copia
+        if self._next_spec is None:
+            return iter(())
+        try:
+            workload = copy.deepcopy(self._workload)
+        except TypeError as e:
+            raise ValueError(f"La carga de trabajo conectada no se puede copiar: {e}")
+        return itertools.chain([self._next_spec], workload)
+
+    def _drop_cancelled_arrivals(self) -> None:
+        # Las llegadas de procesos terminados antes de admitirse se descartan de forma perezosa
+        pending = self.pending_arrivals
+        while pending and pending[0][2].state != "new":
+            heapq.heappop(pending)
+
+    def next_arrival_time(self, after: int = None) -> int:
+        # Instante de la próxima llegada pendiente posterior a after (None si no hay ninguna)
+        candidates = []
+        self._drop_cancelled_arrivals()
+        if self.pending_arrivals and (after is None or self.pending_arrivals[0][0] > after):
+            candidates.append(self.pending_arrivals[0][0])
+        if self._next_spec is not None and (after is None or self._next_spec[0] > after):
+            candidates.append(self._next_spec[0])
+        return min(candidates) if candidates else None
+
+    def release_arrivals(self, time: int, admit=None) -> int:
+        # Pasa a "ready" los procesos con llegada <= time; admit puede rechazar (p. ej. sin memoria)
+        while self._next_spec is not None and self._next_spec[0] <= time:
+            arrival_time, priority, memory, burst_time = self._next_spec
+            self.schedule_arrival(priority, memory, burst_time, arrival_time)
+            self._next_spec = next(self._workload, None)
+
+        released = 0
+        pending = self.pending_arrivals
+        while pending and pending[0][0] <= time:
+            process = pending[0][2]
+            if process.state != "new":
+                heapq.heappop(pending)  # Terminado antes de llegar: nunca se admite
+                continue
+            if admit is not None and not admit(process):
+                break  # Admisión en orden de llegada: los siguientes también esperan
+            heapq.heappop(pending)
+            process.state = "ready"
+            self.ready_queue.append(process)
+            released += 1
+
+        return released
+
+    def list_processes(self, include_archived: bool = False) -> list[Process]:
+        if include_archived and len(self.archive):
+            return sorted(itertools.chain(self.archive, self.processes), key=attrgetter("pid"))
         return self.processes
 
     def get_process_by_pid(self, pid: int) -> Process:
-        for process in self.processes:
-            if process.pid == pid:
-                return process
+        process = self._by_pid.get(pid)
+        if process is not None:
+            return process
 
-        return None
+        return self.archive.find(pid)
+
+    def suspend_process(self, pid: int) -> bool:
+        process = self.get_process_by_pid(pid)
+
+        if process and process.state in ("ready", "running"):
+            process.state = "waiting"
+            return True
+
+        return False
+
+    def resume_process(self, pid: int) -> bool:
+        process = self.get_process_by_pid(pid)
+
+        # Un proceso bloqueado solo lo despierta el evento que espera
+        if process and process.state == "waiting" and pid not in self.blocked:
+            process.state = "ready"
+            self.ready_queue.refresh(process)
+            return True
+
+        return False
+
+    def block_process(self, pid: int, reason: str) -> bool:
+        process = self.get_process_by_pid(pid)
+
+        if process and process.state in ("ready", "running"):
+            process.state = "waiting"
+            self.blocked[pid] = reason
+            return True
+
+        return False
+
+    def set_block_reason(self, pid: int, reason: str) -> bool:
+        # Cambia el motivo de un proceso ya bloqueado que pasa a esperar otro recurso
+        if pid not in self.blocked:
+            return False
+        self.blocked[pid] = reason
+        return True
+
+    def wake_process(self, pid: int) -> bool:
+        if self.blocked.pop(pid, None) is None:
+            return False
+
+        process = self.get_process_by_pid(pid)
+        if process and process.state == "waiting":
+            process.state = "ready"
+            self.ready_queue.refresh(process)
+            return True
+
+        return False
 
     def terminate_process(self, pid: int) -> bool:
         process = self.get_process_by_pid(pid)
 
         if process and process.state != "terminated":
-            process.state = "terminated"
+            self.blocked.pop(pid, None)
+            self.mark_terminated(process)
             return True
 
-        return False
\ No newline at end of file
+        return False
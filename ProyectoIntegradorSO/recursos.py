@@ -1,24 +1,81 @@
+from memoria import MemoryAllocator, create_allocator
+
+
 class SystemResources:
-    def __init__(self):
-        self.cpu_available = True  # Solo 1 CPU
+    def __init__(self, cpu_cores: int = 1, allocator: str = "first_fit"):
+        self.cpu_cores = max(1, cpu_cores)
+        self.core_owners = [None] * self.cpu_cores  # PID que ocupa cada núcleo (None = libre)
         self.total_memory = 4096  # 4GB en MB
-        self.available_memory = 4096
+        self.memory: MemoryAllocator = create_allocator(allocator, self.total_memory)
 
-    def assign_memory(self, pid: int, memory: int) -> bool:
-        if self.available_memory >= memory:
-            self.available_memory -= memory
-            return True
+    @property
+    def available_memory(self) -> int:
+        return self.memory.free_memory
+
+    @property
+    def cpu_available(self) -> bool:
+        # Hay CPU disponible mientras quede algún núcleo libre
+        return None in self.core_owners
+
+    def free_cores(self) -> int:
+        return self.core_owners.count(None)
+
+    def is_core_free(self, core: int) -> bool:
+        return self.core_owners[core] is None
+
+    def acquire_core(self, core: int, pid: int) -> bool:
+        if self.core_owners[core] is not None:
+            return False
+
+        self.core_owners[core] = pid
+        return True
+
+    def release_core(self, core: int) -> None:
+        self.core_owners[core] = None
 
-        return False  # No hay suficiente memoria
+    def release_cpu(self, pid: int) -> None:
+        # Libera los núcleos que ocupa el proceso (suspensión o terminación forzada)
+        for core, owner in enumerate(self.core_owners):
+            if owner == pid:
+                self.core_owners[core] = None
+
+    def release_all_cores(self) -> None:
+        self.core_owners = [None] * self.cpu_cores
+
+    def set_cpu_cores(self, cores: int) -> bool:
+        # Solo se puede cambiar el número de núcleos con todos ellos libres
+        if self.free_cores() != self.cpu_cores:
+            return False
+
+        self.cpu_cores = max(1, cores)
+        self.core_owners = [None] * self.cpu_cores
+        return True
+
+    def assign_memory(self, pid: int, memory: int) -> bool:
+        # Falla si no hay un hueco donde quepa (no basta con que sobre memoria en total)
+        return self.memory.allocate(pid, memory)
 
     def release_memory(self, pid: int, memory: int) -> None:
-        self.available_memory += memory
+        self.memory.free(pid)
+
+    def set_memory_allocator(self, allocator: str) -> bool:
+        # Solo se puede cambiar de asignador con toda la memoria libre
+        if self.memory.used:
+            return False
+
+        self.memory = create_allocator(allocator, self.total_memory)
+        return True
+
+    def get_memory_stats(self) -> dict:
+        return self.memory.stats()
 
     def get_resource_status(self) -> dict:
         return {
             "CPU": "Libre" if self.cpu_available else "Ocupada",
-            "Memoria": f"{self.available_memory}/{self.total_memory} MB"
+            "Núcleos": f"{self.free_cores()}/{self.cpu_cores} libres",
+            "Memoria": f"{self.available_memory}/{self.total_memory} MB",
+            "Asignador": self.memory.name
         }
 
     def check_memory_available(self, memory: int) -> bool:
-        return self.available_memory >= memory
\ No newline at end of file
+        return self.memory.can_allocate(memory)
@@ -0,0 +1,215 @@
+import json
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+
+class LogRecord(NamedTuple):
+    """
+    Evento del registro: marca de tiempo real, ciclo de la simulación,
+    código del evento, proceso implicado y datos propios del evento. No
+    guarda texto: el mensaje se compone solo al mostrarlo.
+    """
+    timestamp: float
+    cycle: Optional[int]
+    code: str
+    pid: Optional[int]
+    payload: tuple
+
+
+# Convierte la tupla guardada en un LogRecord solo al leerla, sin pasar por __new__ en Python
+_as_record = partial(tuple.__new__, LogRecord)
+_now = time.time
+
+# Plantilla de texto de cada código: una cadena para str.format (los datos del evento son los
+# argumentos posicionales; pid y cycle, los nombrados) o una función que recibe el registro
+Formatter = Union[str, Callable[[LogRecord], str]]
+FORMATS: Dict[str, Formatter] = {
+    "note": "{0}",
+}
+
+
+def register_formats(formats: Dict[str, Formatter]) -> None:
+    # Cada módulo registra las plantillas de los códigos que emite
+    FORMATS.update(formats)
+
+
+def format_record(record: LogRecord) -> str:
+    formatter = FORMATS.get(record.code)
+    if formatter is None:
+        return f"{record.code} (proceso {record.pid}): {', '.join(map(str, record.payload))}"
+    if callable(formatter):
+        return formatter(record)
+    return formatter.format(*record.payload, pid=record.pid, cycle=record.cycle)
+
+
+class EventLog:
+    """
+    Registro de eventos estructurado y acotado.
+    Los eventos se guardan como tuplas compactas en un buffer circular de
+    capacity entradas (los más antiguos se descartan al llenarse), así que
+    la memoria no crece con la duración de la simulación. Registrar un
+    evento solo añade una tupla plana: el LogRecord y el texto se
+    construyen al leerlo. Con
+    start_writer, un hilo en segundo plano vuelca los eventos a disco por
+    lotes en formato JSON Lines.
+    """
+
+    def __init__(self, capacity: int = 10000, clock: Optional[Callable[[], int]] = None):
+        if capacity < 1:
+            raise ValueError("La capacidad del registro debe ser al menos 1")
+
+        self.records = deque(maxlen=capacity)
+        self._append = self.records.append
+        self._sinks = []  # Destinos adicionales de cada evento (escritor, diario binario...)
+        self.clock = clock  # Ciclo actual de la simulación, si lo hay
+        self.total = 0  # Eventos registrados desde el inicio, incluidos los ya descartados
+        self.cleared = 0  # Eventos retirados con clear (no cuentan como descartados)
+        self._pending = None  # Eventos pendientes de volcar a disco, con escritor activo
+        self._writer = None
+        self._writer_start = 0  # total al arrancar el escritor
+        self._stop = threading.Event()
+        self.written = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.records.maxlen
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Se conservan los eventos y el reloj; el escritor y los destinos adicionales no se serializan
+        return {"records": self.records, "clock": self.clock, "total": self.total, "cleared": self.cleared}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["records"].maxlen, state["clock"])
+        self.records.extend(state["records"])
+        self.total = state["total"]
+        self.cleared = state.get("cleared", 0)
+
+    def bind_clock(self, clock: Optional[Callable[[], int]]) -> None:
+        self.clock = clock
+
+    def record(self, code: str, pid: Optional[int] = None, *payload: Any, cycle: Optional[int] = None) -> None:
+        # Camino caliente: una tupla y un append, sin formatear nada
+        if cycle is None and self.clock is not None:
+            cycle = self.clock()
+        self._append((_now(), cycle, code, pid, payload))
+        self.total += 1
+
+    def add_sink(self, sink: Callable[[tuple], None]) -> None:
+        # sink recibe cada evento nuevo como tupla (marca, ciclo, código, pid, argumentos)
+        self._sinks.append(sink)
+        self._rebuild_append()
+
+    def remove_sink(self, sink: Callable[[tuple], None]) -> None:
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+            self._rebuild_append()
+
+    def _rebuild_append(self) -> None:
+        # Sin destinos adicionales registrar sigue siendo un único append
+        keep, sinks = self.records.append, tuple(self._sinks)
+        if not sinks:
+            self._append = keep
+            return
+
+        def fan_out(entry: tuple) -> None:
+            keep(entry)
+            for sink in sinks:
+                sink(entry)
+
+        self._append = fan_out
+
+    def note(self, text: str, pid: Optional[int] = None) -> None:
+        # Evento libre con un texto ya compuesto, para acciones puntuales del usuario
+        self.record("note", pid, text)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        return map(_as_record, self.records)
+
+    @property
+    def dropped(self) -> int:
+        # Eventos descartados del buffer circular por falta de espacio
+        return self.total - self.cleared - len(self.records)
+
+    def tail(self, count: int) -> List[LogRecord]:
+        # Los count eventos más recientes, del más antiguo al más nuevo
+        records = self.records
+        start = max(0, len(records) - count)
+        return [_as_record(records[i]) for i in range(start, len(records))]
+
+    def messages(self, count: Optional[int] = None) -> List[str]:
+        records = self if count is None else self.tail(count)
+        return [format_record(record) for record in records]
+
+    def clear(self) -> None:
+        # total es un contador de toda la vida del registro: el escritor lo usa para sus pérdidas
+        self.cleared += len(self.records)
+        self.records.clear()
+
+    def start_writer(self, path: str, interval: float = 0.5, backlog: Optional[int] = None) -> None:
+        """
+        Arranca el hilo que vuelca los eventos nuevos a path (JSON Lines,
+        en modo anexar) cada interval segundos. backlog acota los eventos
+        pendientes de escribir (por defecto, la capacidad del registro).
+        """
+        if self._writer is not None:
+            raise ValueError("El registro ya tiene un escritor activo")
+
+        output = open(path, "a", encoding="utf-8")
+        pending = self._pending = deque(maxlen=backlog or self.capacity)
+        self.add_sink(pending.append)
+        self._writer_start = self.total
+        self.written = 0
+        self._stop.clear()
+        self._writer = threading.Thread(target=self._write_loop, args=(output, interval),
+                                        name="escritor-registro", daemon=True)
+        self._writer.start()
+
+    def stop_writer(self) -> None:
+        # Detiene el escritor tras volcar lo pendiente
+        if self._writer is None:
+            return
+        self.remove_sink(self._pending.append)
+        self._stop.set()
+        self._writer.join()
+        self._writer = None
+        self._pending = None
+
+    @property
+    def writing(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def writer_dropped(self) -> int:
+        # Eventos que no llegaron a disco porque el escritor iba atrasado y se llenó su cola
+        if self._pending is None:
+            return 0
+        return self.total - self._writer_start - self.written - len(self._pending)
+
+    def _write_loop(self, output, interval: float) -> None:
+        with output:
+            while not self._stop.wait(interval):
+                self._flush(output)
+            self._flush(output)
+
+    def _flush(self, output) -> None:
+        pending = self._pending
+        batch = []
+        # popleft es atómico: el hilo principal puede seguir registrando mientras tanto
+        for _ in range(len(pending)):
+            batch.append(pending.popleft())
+        if not batch:
+            return
+
+        lines = [json.dumps({"timestamp": record.timestamp, "cycle": record.cycle, "code": record.code,
+                             "pid": record.pid, "payload": record.payload, "message": format_record(record)},
+                            ensure_ascii=False, default=str)
+                 for record in map(_as_record, batch)]
+        output.write("\n".join(lines) + "\n")
+        output.flush()
+        self.written += len(batch)
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import platform
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+from comunicacion import ProducerConsumer
+from metricas import percentile
+
+MODES = ("threads", "asyncio")
+DEFAULT_BUFFER_SIZES = (1, 8, 64, 512)
+
+# Columnas de la tabla de resultados: (clave, encabezado, formato)
+COLUMNS = (
+    ("buffer_size", "Buffer", "{:d}"),
+    ("producers", "Prod.", "{:d}"),
+    ("consumers", "Cons.", "{:d}"),
+    ("batch", "Lote", "{:d}"),
+    ("items_per_second", "Items/s", "{:,.0f}"),
+    ("p50_latency_us", "Lat. p50 (µs)", "{:.1f}"),
+    ("p95_latency_us", "Lat. p95 (µs)", "{:.1f}"),
+    ("p99_latency_us", "Lat. p99 (µs)", "{:.1f}"),
+    ("lock_wait_seconds", "Contención (s)", "{:.6f}"),
+    ("producer_blocked_seconds", "Prod. bloq. (s)", "{:.4f}"),
+    ("consumer_blocked_seconds", "Cons. bloq. (s)", "{:.4f}"),
+)
+
+# Marca de fin para los consumidores; cada uno retira exactamente una
+_STOP = object()
+
+
+def _split(total: int, parts: int) -> List[int]:
+    # Reparte total items entre parts productores lo más equitativamente posible
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def _run_threads(buffer: ProducerConsumer, quotas: List[int], consumers: int, batch: int) -> List[List[float]]:
+    latencies = [[] for _ in range(consumers)]
+
+    def produce(quota: int) -> None:
+        while quota > 0:
+            size = min(batch, quota)
+            # La marca se toma al entrar en el buffer: la espera con el buffer lleno va aparte
+            buffer.put_stamps(size, time.perf_counter)
+            quota -= size
+
+    def consume(index: int) -> None:
+        received = latencies[index]
+        while True:
+            items = buffer.get_blocking(batch)
+            now = time.perf_counter()
+            stops = sum(1 for item in items if item is _STOP)
+            received.extend(now - item for item in items if item is not _STOP)
+            if stops:
+                # Devuelve las marcas de fin que retiró de más para los demás consumidores
+                if stops > 1:
+                    buffer.put_blocking([_STOP] * (stops - 1))
+                return
+
+    producer_threads = [threading.Thread(target=produce, args=(quota,)) for quota in quotas]
+    consumer_threads = [threading.Thread(target=consume, args=(index,)) for index in range(consumers)]
+    for thread in consumer_threads + producer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    buffer.put_blocking([_STOP] * consumers)
+    for thread in consumer_threads:
+        thread.join()
+    return latencies
+
+
+async def _run_tasks(buffer: ProducerConsumer, quotas: List[int], consumers: int,
+                     batch: int) -> Tuple[List[List[float]], float, float]:
+    # Tareas cooperativas en un solo hilo: con el buffer lleno (o vacío) ceden el turno en lugar de bloquear,
+    # y el tiempo hasta poder continuar cuenta como tiempo bloqueado
+    latencies = [[] for _ in range(consumers)]
+    remaining = [sum(quotas)]
+    blocked = [0.0, 0.0]  # Productores, consumidores
+
+    async def produce(quota: int) -> None:
+        while quota > 0:
+            size = min(batch, quota)
+            pending = size
+            full_since = None
+            while pending:
+                pending -= buffer.put_stamps(pending, time.perf_counter, timeout=0)
+                if pending:
+                    full_since = full_since or time.perf_counter()
+                    await asyncio.sleep(0)
+            if full_since is not None:
+                blocked[0] += time.perf_counter() - full_since
+            quota -= size
+            await asyncio.sleep(0)
+
+    async def consume(index: int) -> None:
+        received = latencies[index]
+        empty_since = None
+        while remaining[0] > 0:
+            items = buffer.get_blocking(batch, timeout=0)
+            if items:
+                now = time.perf_counter()
+                received.extend(now - stamp for stamp in items)
+                remaining[0] -= len(items)
+                if empty_since is not None:
+                    blocked[1] += now - empty_since
+                    empty_since = None
+            else:
+                empty_since = empty_since or time.perf_counter()
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(produce(quota) for quota in quotas), *(consume(index) for index in range(consumers)))
+    return latencies, blocked[0], blocked[1]
+
+
+def run_benchmark(buffer_size: int, producers: int = 2, consumers: int = 2, items: int = 20000,
+                  batch: int = 1, mode: str = "threads") -> Dict[str, Any]:
+    """
+    Mide el ProducerConsumer bajo concurrencia real: producers hilos (o
+    tareas de asyncio) depositan items en lotes de batch y consumers los
+    retiran. Cada item lleva la marca de tiempo del instante en que entra
+    en el buffer (ProducerConsumer.put_stamps), así que la latencia es el
+    tiempo que pasa en el buffer y no incluye la espera del productor con
+    el buffer lleno, que se mide aparte como tiempo bloqueado. Con hilos, los tiempos
+    de espera salen de los semáforos: la contención es el tiempo esperando
+    sus candados internos y el mutex, y empty/full dan el tiempo bloqueado
+    con el buffer lleno o vacío (el GIL de CPython limita además el
+    paralelismo real). Con asyncio no hay contención posible y el tiempo
+    bloqueado es el que las tareas pasan cediendo el turno.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Modo de medición desconocido: {mode}")
+    if producers < 1 or consumers < 1:
+        raise ValueError("Debe haber al menos un productor y un consumidor")
+    if items < 1 or batch < 1:
+        raise ValueError("El número de items y el tamaño de lote deben ser positivos")
+
+    buffer = ProducerConsumer(buffer_size)
+    quotas = _split(items, producers)
+
+    started_at = time.perf_counter()
+    if mode == "threads":
+        latencies = _run_threads(buffer, quotas, consumers, batch)
+    else:
+        latencies, producer_blocked, consumer_blocked = asyncio.run(_run_tasks(buffer, quotas, consumers, batch))
+    elapsed = time.perf_counter() - started_at
+
+    merged = sorted(latency for received in latencies for latency in received)
+    mutex, empty, full = buffer.mutex.get_stats(), buffer.empty.get_stats(), buffer.full.get_stats()
+    if mode == "threads":
+        producer_blocked, consumer_blocked = empty["wait_seconds"], full["wait_seconds"]
+    return {
+        "mode": mode,
+        "buffer_size": buffer_size,
+        "producers": producers,
+        "consumers": consumers,
+        "batch": batch,
+        "items": len(merged),
+        "seconds": elapsed,
+        "items_per_second": len(merged) / elapsed if elapsed > 0 else 0.0,
+        "p50_latency_us": percentile(merged, 0.50) * 1e6,
+        "p95_latency_us": percentile(merged, 0.95) * 1e6,
+        "p99_latency_us": percentile(merged, 0.99) * 1e6,
+        "lock_wait_seconds": mutex["wait_seconds"] + sum(stats["lock_seconds"] for stats in (mutex, empty, full)),
+        "mutex_waits": mutex["thread_waits"],
+        "producer_blocked_seconds": producer_blocked,
+        "consumer_blocked_seconds": consumer_blocked,
+        "per_consumer_items": [len(received) for received in latencies],
+    }
+
+
+def benchmark_grid(buffer_sizes: Sequence[int] = DEFAULT_BUFFER_SIZES, producers: int = 2, consumers: int = 2,
+                   items: int = 20000, batch: int = 1, mode: str = "threads") -> List[Dict[str, Any]]:
+    # Una medición por tamaño de buffer, con el resto de parámetros fijos
+    return [run_benchmark(size, producers, consumers, items, batch, mode) for size in buffer_sizes]
+
+
+def results_document(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Resultados junto con la versión de Python y la plataforma en que se midieron
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": rows,
+    }
+
+
+def save_results(rows: List[Dict[str, Any]], path: str) -> None:
+    """
+    Guarda los resultados en JSON junto con la versión de Python y la
+    plataforma, para poder comparar ejecuciones y detectar regresiones.
+    """
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(results_document(rows), output, indent=2, ensure_ascii=False)
+
+
+def format_benchmark(rows: List[Dict[str, Any]]) -> str:
+    # Tabla de resultados en texto plano, para uso sin rich
+    headers = [header for _, header, _ in COLUMNS]
+    lines = [[fmt.format(row[key]) for key, _, fmt in COLUMNS] for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *lines)]
+
+    def render(cells) -> str:
+        return "  ".join(str(cell).ljust(width) for cell, width in zip(cells, widths))
+
+    output = [render(headers), "  ".join("-" * width for width in widths)]
+    output.extend(render(line) for line in lines)
+    return "\n".join(output)
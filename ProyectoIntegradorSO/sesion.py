@@ -0,0 +1,566 @@
+import os
+from typing import Any, Callable, Dict, List, Optional
+from procesos import Process, ProcessManager
+from recursos import SystemResources
+from planificador import SchedulerFactory, RoundRobinScheduler
+from comunicacion import ConditionVariable, MessageQueue, Mutex, ProducerConsumer, Semaphore
+from simulacion import SimulationEngine, SimulationResult
+from carga import generate_workload
+from registro import EventLog, register_formats
+from trazas import TraceReader, TraceRecorder, fingerprint
+import instantanea
+
+register_formats({
+    "process_created": "Proceso {pid} creado con prioridad {0}, memoria {1}MB y tiempo {2}",
+    "process_suspended": "Proceso {pid} suspendido",
+    "process_resumed": "Proceso {pid} reanudado",
+    "process_killed": "Proceso {pid} terminado forzadamente",
+    "process_reset": "Proceso {pid} cambiado de running a ready al cambiar de algoritmo",
+    "message_sent": "Mensaje enviado: {pid} → {0}",
+    "message_blocked": "Proceso {pid} bloqueado enviando a {0} (buzón lleno)",
+    "receive_blocked": "Proceso {pid} bloqueado esperando un mensaje",
+})
+
+SYNC_KINDS = ("semaphore", "mutex", "condition")
+
+
+class Session:
+    """
+    Sesión del simulador sin interfaz: procesos, recursos, planificador,
+    comunicación y sincronización, junto con las operaciones que se
+    hacen sobre ellos. Las operaciones validan sus argumentos y lanzan
+    ValueError con el motivo, registran el evento y, si hay una traza
+    grabándose, la operación con su instante. La interfaz interactiva
+    (cli.CLI) añade los menús encima; la reproducción de trazas y el modo
+    por línea de órdenes las usan directamente.
+    """
+
+    def __init__(self, message_system: Optional[MessageQueue] = None,
+                 producer_consumer: Optional[ProducerConsumer] = None):
+        self.process_manager = ProcessManager()
+        self.resources = SystemResources()
+        # Sistemas de comunicación; restaurar una instantánea los sustituye
+        self.message_system = message_system if message_system is not None else MessageQueue(default_capacity=64)
+        self.producer_consumer = producer_consumer if producer_consumer is not None else ProducerConsumer(5)
+        self.scheduler = None
+        self.scheduler_algorithm = "fcfs"
+        self.quantum = 2
+        self.per_core_queues = False
+        self.aging_interval = 10
+        self.mlfq_levels = 3
+        self.boost_interval = 50
+        self.lottery_seed = None  # Semilla del sorteo de lottery; None = no reproducible
+        # Registro de eventos acotado; los textos se componen solo al mostrarlos
+        self.events = EventLog(capacity=5000, clock=lambda: self.scheduler.time)
+        self.journal = None  # Diario binario persistente, si está activado
+        self.checkpoint = None  # Puntos de control automáticos de las simulaciones sin interfaz
+        self.recorder = None  # Traza en la que se graban las operaciones (trazas.TraceRecorder)
+        # Semáforos, mutex y variables de condición creados por nombre
+        self.sync_objects = {}
+        self._setup_scheduler()
+
+    def _setup_scheduler(self):
+        self.scheduler = SchedulerFactory.create_scheduler(
+            self.scheduler_algorithm,
+            self.process_manager,
+            self.resources,
+            self.quantum,
+            self.per_core_queues,
+            aging_interval=self.aging_interval,
+            levels=self.mlfq_levels,
+            boost_interval=self.boost_interval,
+            seed=self.lottery_seed
+        )
+        # Los envíos y recepciones bloqueantes suspenden procesos a través del planificador activo
+        self.message_system.bind_scheduler(self.scheduler)
+        self.producer_consumer.bind_scheduler(self.scheduler)
+        for sync in self.sync_objects.values():
+            (sync.mutex if isinstance(sync, ConditionVariable) else sync).bind_scheduler(self.scheduler)
+
+    def _record(self, op: str, pid: Optional[int] = None, **fields: Any) -> None:
+        if self.recorder is not None:
+            self.recorder.record(self.scheduler.time, op, pid, **fields)
+
+    def _live_process(self, pid: int) -> Process:
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process or process.state in ("terminated", "new"):
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+        return process
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            "algorithm": self.scheduler_algorithm,
+            "quantum": self.quantum,
+            "cores": self.resources.cpu_cores,
+            "per_core_queues": self.per_core_queues,
+            "aging_interval": self.aging_interval,
+            "levels": self.mlfq_levels,
+            "boost_interval": self.boost_interval,
+            "seed": self.lottery_seed
+        }
+
+    def set_algorithm(self, algorithm: str, quantum: Optional[int] = None, cores: Optional[int] = None,
+                      per_core_queues: Optional[bool] = None, aging_interval: Optional[int] = None,
+                      levels: Optional[int] = None, boost_interval: Optional[int] = None,
+                      seed: Optional[int] = None) -> None:
+        """
+        Cambia de planificador manteniendo el reloj global; los procesos en
+        ejecución vuelven a la cola de listos. Los parámetros omitidos
+        conservan su valor actual. seed fija el sorteo de lottery para que
+        la ejecución sea reproducible.
+        """
+        old_scheduler = self.scheduler
+        self.scheduler_algorithm = algorithm
+        self.quantum = max(1, quantum) if quantum is not None else self.quantum
+        self.aging_interval = max(1, aging_interval) if aging_interval is not None else self.aging_interval
+        self.mlfq_levels = max(1, levels) if levels is not None else self.mlfq_levels
+        self.boost_interval = max(1, boost_interval) if boost_interval is not None else self.boost_interval
+        self.lottery_seed = seed if seed is not None else self.lottery_seed
+        cores = max(1, cores) if cores is not None else self.resources.cpu_cores
+        self.per_core_queues = cores > 1 and (self.per_core_queues if per_core_queues is None else per_core_queues)
+
+        # Configurar el nuevo planificador manteniendo el reloj global
+        self.resources.release_all_cores()
+        self.resources.set_cpu_cores(cores)
+        self._setup_scheduler()
+        self.scheduler.time = old_scheduler.time
+
+        # Limpiar estado previo y reiniciar estados si es necesario
+        self._reset_process_states()
+        self.events.note(f"Algoritmo cambiado a {self.scheduler.name}")
+        self._record("algorithm", value=self.settings())
+
+    def _reset_process_states(self) -> None:
+        # El nuevo planificador empieza con todos los núcleos libres
+        # Verificar si hay algún proceso en estado "running" y pasarlo a "ready"
+        for process in self.process_manager.processes:
+            if process.state == "running":
+                process.state = "ready"
+                self.process_manager.ready_queue.refresh(process)
+                self.events.record("process_reset", process.pid)
+
+    def set_allocator(self, allocator: str) -> None:
+        if not self.resources.set_memory_allocator(allocator):
+            raise ValueError("Solo se puede cambiar el asignador cuando ningún proceso tiene memoria asignada")
+        self.events.note(f"Asignador de memoria cambiado a {allocator}")
+        self._record("allocator", target=allocator)
+
+    def create_process(self, priority: int, memory: int, burst_time: int) -> Process:
+        # Crea un proceso que llega en el instante actual, con su memoria ya asignada
+        if priority < 1 or memory < 1 or burst_time < 1:
+            raise ValueError("La prioridad, la memoria y el tiempo de CPU deben ser al menos 1")
+
+        # Verificar si hay memoria suficiente (en un único hueco si el asignador es contiguo)
+        if not self.resources.check_memory_available(memory):
+            raise ValueError(f"No hay suficiente memoria disponible. Disponible: {self.resources.available_memory} MB "
+                             f"(mayor bloque libre: {self.resources.memory.largest_free_block()} MB)")
+
+        new_process = self.process_manager.create_process(priority, memory, burst_time)
+        new_process.arrival_time = self.scheduler.time  # Llega en el instante actual
+
+        if not self.resources.assign_memory(new_process.pid, memory):
+            self.process_manager.remove_process(new_process)
+            raise ValueError("Error al asignar memoria al proceso")
+
+        # Un PID reutilizado no hereda los mensajes del proceso anterior
+        self.message_system.remove_queue(new_process.pid)
+        self.message_system.create_queue(new_process.pid)
+
+        self.events.record("process_created", new_process.pid, priority, memory, burst_time)
+        self._record("create", new_process.pid, priority=priority, memory=memory, burst=burst_time)
+        return new_process
+
+    def schedule_arrival(self, priority: int, memory: int, burst_time: int, arrival_time: int) -> Process:
+        # Proceso de una carga: espera su llegada y se admite cuando hay memoria
+        if priority < 1 or memory < 1 or burst_time < 1:
+            raise ValueError("La prioridad, la memoria y el tiempo de CPU deben ser al menos 1")
+        return self.process_manager.schedule_arrival(priority, memory, burst_time,
+                                                     max(arrival_time, self.scheduler.time))
+
+    def add_synthetic_workload(self, count: int, **params: Any) -> None:
+        # params son los de carga.generate_workload; la misma semilla reproduce la misma carga
+        params.setdefault("start_time", self.scheduler.time)
+        self.process_manager.attach_workload(generate_workload(count, **params))
+        self._record("workload", value=dict(params, count=count))
+
+    def import_workload(self, path: str, fmt: Optional[str] = None, offset: int = 0) -> None:
+        # Carga de trabajo leída de un CSV/JSONL de trabajos a medida que el reloj alcanza cada llegada
+        self.process_manager.attach_workload(TraceReader(path, fmt, jobs_only=True, offset=offset))
+        self.events.note(f"Carga importada desde {path}")
+        self._record("import", target=path, value={"format": fmt, "offset": offset})
+
+    def suspend(self, pid: int) -> None:
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process:
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+        if process.state not in ["running", "ready"]:
+            raise ValueError(f"El proceso {pid} no está en ejecución o listo (estado actual: {process.state})")
+
+        # Si el proceso está ejecutándose, liberar su núcleo
+        if process.state == "running":
+            self.scheduler.evict(process)
+
+        self.process_manager.suspend_process(pid)
+        self.events.record("process_suspended", pid)
+        self._record("suspend", pid)
+
+    def resume(self, pid: int) -> None:
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process:
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+        if process.state != "waiting":
+            raise ValueError(f"El proceso {pid} no está suspendido (estado actual: {process.state})")
+        if pid in self.process_manager.blocked:
+            raise ValueError(f"El proceso {pid} está bloqueado ({self.process_manager.blocked[pid]}); "
+                             f"despertará cuando ocurra ese evento")
+
+        self.process_manager.resume_process(pid)
+        self.events.record("process_resumed", pid)
+        self._record("resume", pid)
+
+    def kill(self, pid: int) -> Process:
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process:
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+        if process.state == "terminated":
+            raise ValueError(f"El proceso {pid} ya está terminado")
+
+        # Si el proceso está ejecutándose, liberar su núcleo
+        if process.state == "running":
+            self.scheduler.evict(process)
+
+        # Liberar memoria; un proceso "new" aún no se ha admitido y no tiene memoria asignada
+        if process.state != "new":
+            self.resources.release_memory(process.pid, process.memory)
+
+        self.process_manager.terminate_process(pid)
+        self.events.record("process_killed", pid)
+        self._record("kill", pid)
+        return process
+
+    def send(self, sender_pid: int, receiver_pid: int, message: Any) -> str:
+        """
+        Envía un mensaje entre procesos. Devuelve "sent" si se entregó,
+        "blocked" si el emisor quedó bloqueado con el buzón lleno o
+        "rejected" si el buzón lleno lo rechazó.
+        """
+        self._live_process(sender_pid)
+        if sender_pid in self.process_manager.blocked:
+            raise ValueError(f"El proceso {sender_pid} está bloqueado y no puede enviar")
+        self._live_process(receiver_pid)
+
+        # Los procesos generados automáticamente no tienen cola hasta su primer mensaje
+        self.message_system.create_queue(sender_pid)
+        self.message_system.create_queue(receiver_pid)
+
+        result = self.message_system.send_message(sender_pid, receiver_pid, message)
+        if not result and not self.message_system.get_queue_stats(receiver_pid)["rejected"]:
+            raise ValueError("Error al enviar mensaje")
+
+        self._record("send", sender_pid, target=receiver_pid, value=message)
+        if not result:
+            return "rejected"
+        if sender_pid in self.process_manager.blocked:
+            self.events.record("message_blocked", sender_pid, receiver_pid)
+            return "blocked"
+        self.events.record("message_sent", sender_pid, receiver_pid)
+        return "sent"
+
+    def configure_mailbox(self, pid: int, capacity: Optional[int], policy: str) -> None:
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process or process.state == "terminated":
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+        self.message_system.create_queue(pid)
+        if not self.message_system.configure_queue(pid, capacity, policy):
+            raise ValueError(f"No se pudo configurar el buzón de {pid}")
+        self.events.note(f"Buzón de {pid} configurado: capacidad {capacity or 'ilimitada'}, {policy}")
+        self._record("mailbox", pid, target=policy, value=capacity)
+
+    def receive(self, pid: int, blocking: bool = False) -> list:
+        """
+        Recibe todos los mensajes pendientes de un proceso. Sin mensajes y
+        con blocking, el proceso queda bloqueado hasta que llegue uno.
+        """
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process:
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+
+        if self.message_system.get_queue_size(pid):
+            messages = self.message_system.receive_many(pid)
+        elif not blocking:
+            return []
+        elif process.state not in ("ready", "running"):
+            raise ValueError(f"El proceso {pid} no está en ejecución o listo (estado actual: {process.state})")
+        else:
+            messages = []
+            self.message_system.create_queue(pid)
+            self.message_system.receive_message(pid, blocking=True)
+            if pid in self.process_manager.blocked:
+                self.events.record("receive_blocked", pid)
+        self._record("receive", pid, value=blocking)
+        return messages
+
+    def join_group(self, pid: int, group: str) -> None:
+        self._live_process(pid)
+        self.message_system.create_queue(pid)
+        self.message_system.join_group(group, pid)
+        self.events.note(f"Proceso {pid} añadido al grupo '{group}'", pid)
+        self._record("join", pid, target=group)
+
+    def subscribe(self, pid: int, topic: str) -> None:
+        self._live_process(pid)
+        self.message_system.create_queue(pid)
+        self.message_system.subscribe(pid, topic)
+        self.events.note(f"Proceso {pid} añadido al tema '{topic}'", pid)
+        self._record("subscribe", pid, target=topic)
+
+    def broadcast(self, sender_pid: int, message: Any) -> int:
+        # Devuelve cuántos procesos recibieron el mensaje
+        delivered = self.message_system.broadcast(self._sender(sender_pid), message)
+        self.events.note(f"Mensaje de {sender_pid} a todos: {delivered} destinatarios", sender_pid)
+        self._record("broadcast", sender_pid, value=message)
+        return delivered
+
+    def multicast(self, sender_pid: int, group: str, message: Any) -> int:
+        delivered = self.message_system.multicast(self._sender(sender_pid), group, message)
+        self.events.note(f"Mensaje de {sender_pid} a '{group}': {delivered} destinatarios", sender_pid)
+        self._record("multicast", sender_pid, target=group, value=message)
+        return delivered
+
+    def publish(self, sender_pid: int, topic: str, message: Any) -> int:
+        delivered = self.message_system.publish(self._sender(sender_pid), topic, message)
+        self.events.note(f"Mensaje de {sender_pid} a '{topic}': {delivered} destinatarios", sender_pid)
+        self._record("publish", sender_pid, target=topic, value=message)
+        return delivered
+
+    def _sender(self, pid: int) -> int:
+        self._live_process(pid)
+        if pid in self.process_manager.blocked:
+            raise ValueError(f"El proceso {pid} está bloqueado y no puede enviar")
+        self.message_system.create_queue(pid)
+        return pid
+
+    def add_producer(self, pid: int) -> None:
+        self._party(pid)
+        self.producer_consumer.add_producer(pid)
+        self._record("producer", pid)
+
+    def add_consumer(self, pid: int) -> None:
+        self._party(pid)
+        self.producer_consumer.add_consumer(pid)
+        self._record("consumer", pid)
+
+    def produce(self, pid: int, items: List[Any]) -> int:
+        """
+        Produce un lote de items. Devuelve cuántos entraron ya en el buffer;
+        si faltan, el productor queda bloqueado hasta que haya sitio.
+        """
+        self._party(pid, self.producer_consumer.producers, "productor")
+        produced = self.producer_consumer.produce_many(pid, items)
+        if produced:
+            self.events.note(f"Productor {pid} produjo {produced} items", pid)
+        self._record("produce", pid, value=list(items))
+        return produced
+
+    def consume(self, pid: int, max_items: int = 1) -> list:
+        # Sin items en el buffer el consumidor queda bloqueado y devuelve una lista vacía
+        self._party(pid, self.producer_consumer.consumers, "consumidor")
+        items = self.producer_consumer.consume_many(pid, max(1, max_items))
+        if items:
+            self.events.note(f"Consumidor {pid} consumió {len(items)} items", pid)
+        self._record("consume", pid, value=max_items)
+        return items
+
+    def _party(self, pid: int, parties=None, role: Optional[str] = None) -> None:
+        # Productor o consumidor: el proceso debe existir y, para operar, estar registrado y no bloqueado
+        process = self.process_manager.get_process_by_pid(pid)
+        if not process or process.state == "terminated":
+            raise ValueError(f"No se encontró proceso con PID {pid}")
+        if parties is None:
+            return
+        if pid not in parties:
+            raise ValueError(f"El proceso {pid} no está registrado como {role}")
+        if pid in self.process_manager.blocked:
+            raise ValueError(f"El {role} (PID {pid}) está bloqueado: {self.process_manager.blocked[pid]}")
+
+    def create_sync(self, kind: str, name: str, value: Any = 1) -> None:
+        # value es el valor inicial de un semáforo o el nombre del mutex de una condición
+        if kind not in SYNC_KINDS:
+            raise ValueError(f"Tipo de objeto de sincronización desconocido: {kind}")
+        if name in self.sync_objects:
+            raise ValueError(f"Ya existe un objeto llamado '{name}'")
+
+        if kind == "semaphore":
+            if int(value) < 0:
+                raise ValueError("El valor inicial no puede ser negativo")
+            self.sync_objects[name] = Semaphore(int(value), name, self.scheduler, log=self.events)
+        elif kind == "mutex":
+            self.sync_objects[name] = Mutex(name, self.scheduler, log=self.events)
+        else:
+            mutex = self.sync_objects.get(value)
+            if not isinstance(mutex, Mutex):
+                raise ValueError(f"'{value}' no es un mutex")
+            self.sync_objects[name] = ConditionVariable(mutex, name)
+        self.events.note(f"Objeto de sincronización '{name}' creado")
+        self._record(kind, target=name, value=value if kind != "mutex" else None)
+
+    def _sync_target(self, name: str, pid: int):
+        sync = self.sync_objects.get(name)
+        if sync is None:
+            raise ValueError(f"No existe ningún objeto de sincronización llamado '{name}'")
+        self._live_process(pid)
+        if pid in self.process_manager.blocked:
+            raise ValueError(f"El proceso {pid} está bloqueado ({self.process_manager.blocked[pid]})")
+        return sync
+
+    def sync_wait(self, name: str, pid: int) -> bool:
+        # wait / lock; True si el proceso adquiere ya, False si queda bloqueado
+        sync = self._sync_target(name, pid)
+        if isinstance(sync, ConditionVariable):
+            sync.wait(pid)
+            acquired = False
+        elif isinstance(sync, Mutex):
+            acquired = sync.acquire(pid)
+        else:
+            acquired = sync.wait(pid)
+        self._record("wait", pid, target=name)
+        return acquired
+
+    def sync_signal(self, name: str, pid: int) -> List[int]:
+        # signal / unlock / notify; devuelve los procesos despertados
+        sync = self._sync_target(name, pid)
+        if isinstance(sync, ConditionVariable):
+            woken = sync.notify(pid)
+        elif isinstance(sync, Mutex):
+            woken = sync.release(pid)
+        else:
+            woken = sync.signal(pid)
+        self._record("signal", pid, target=name)
+        return woken
+
+    def run(self, cycles: Optional[int] = None, event_driven: bool = True,
+            on_event: Optional[Callable[[dict], None]] = None) -> SimulationResult:
+        """
+        Ejecuta la simulación sin interfaz durante cycles ciclos (o hasta
+        completar el trabajo si es None), registrando los cambios de estado.
+        Usa el diario y los puntos de control de la sesión si están activos.
+        """
+        def record_changes(event_info: dict) -> None:
+            # Solo se registran los cambios de estado; los ciclos de ejecución e inactividad se resumen al final
+            for core_event in event_info["events"]:
+                if core_event["event"] not in ("process_running", "idle"):
+                    self._handle_simulation_event(core_event)
+            if on_event is not None:
+                on_event(event_info)
+
+        # Con el diario activo, el motor anexa todos los eventos de núcleo (también los ciclos de
+        # ejecución e inactividad); se suspende el volcado del registro para no duplicar los cambios de estado
+        if self.journal is not None:
+            self.events.remove_sink(self.journal.append)
+
+        engine = SimulationEngine(self.scheduler)
+        try:
+            return engine.run(cycles, until_complete=cycles is None, record_events=False, on_event=record_changes,
+                              event_driven=event_driven, journal=self.journal, checkpoint=self.checkpoint)
+        finally:
+            if self.journal is not None:
+                self.events.add_sink(self.journal.append)
+
+    def _interruption_cause(self) -> str:
+        # Round Robin solo interrumpe al agotar el quantum; las políticas expropiativas también ceden la CPU
+        return "quantum" if isinstance(self.scheduler, RoundRobinScheduler) else "expropiación"
+
+    def _handle_simulation_event(self, event_info: dict) -> None:
+        # Registra el evento de un núcleo como tupla; el texto se compone al mostrar los logs
+        event_type = event_info.get("event")
+        # El núcleo solo se indica con varios núcleos
+        core = event_info["core"] if self.scheduler.cores > 1 else None
+        process = event_info.get("process")
+
+        if event_type == "idle":
+            self.events.record("idle", None, core)
+        elif event_type == "process_preempted":
+            self.events.record(event_type, process.pid, core, process.burst_time, 1, self._interruption_cause())
+        elif process is not None:
+            self.events.record(event_type, process.pid, core, process.burst_time)
+
+    def snapshot_state(self) -> dict:
+        # Todo lo que define la simulación; el registro de eventos y el diario no forman parte
+        return {
+            "process_manager": self.process_manager,
+            "resources": self.resources,
+            "scheduler": self.scheduler,
+            "message_system": self.message_system,
+            "producer_consumer": self.producer_consumer,
+            "sync_objects": self.sync_objects,
+            "settings": {
+                "scheduler_algorithm": self.scheduler_algorithm,
+                "quantum": self.quantum,
+                "per_core_queues": self.per_core_queues,
+                "aging_interval": self.aging_interval,
+                "mlfq_levels": self.mlfq_levels,
+                "boost_interval": self.boost_interval,
+                "lottery_seed": self.lottery_seed
+            }
+        }
+
+    def snapshot_external(self) -> dict:
+        # Objetos que las instantáneas referencian sin guardar: el registro compartido con los semáforos
+        return {"events": self.events}
+
+    def restore_state(self, state: dict) -> None:
+        missing = [name for name in instantanea.COMPONENTS if name not in state]
+        if missing:
+            raise ValueError(f"La instantánea no contiene: {', '.join(missing)}")
+
+        self.process_manager = state["process_manager"]
+        self.resources = state["resources"]
+        self.scheduler = state["scheduler"]
+        self.message_system = state["message_system"]
+        self.producer_consumer = state["producer_consumer"]
+        self.sync_objects = state["sync_objects"]
+        for name, value in state["settings"].items():
+            setattr(self, name, value)
+
+    def save_snapshot(self, path: str) -> int:
+        return instantanea.save(self.snapshot_state(), path, external=self.snapshot_external())
+
+    def load_snapshot(self, path: str) -> None:
+        self.restore_state(instantanea.load(path, self.snapshot_external()))
+
+    def enable_checkpoints(self, path: str, every: int) -> None:
+        self.checkpoint = instantanea.Checkpointer(path, every, self.snapshot_state,
+                                                   external=self.snapshot_external())
+
+    def start_recording(self, path: str) -> None:
+        """
+        Empieza a grabar una traza en path (JSON Lines). El estado inicial
+        se guarda junto a ella como instantánea (path + ".snap") y cada
+        operación posterior se anota con su instante, de modo que
+        trazas.TraceReplay reproduce exactamente la misma ejecución.
+        """
+        if self.recorder is not None:
+            raise ValueError(f"Ya se está grabando una traza en {self.recorder.path}")
+        snapshot = path + ".snap"
+        self.save_snapshot(snapshot)
+        self.recorder = TraceRecorder(path)
+        self._record("start", target=os.path.basename(snapshot))
+        self.events.note(f"Grabación de traza en {path}")
+
+    def stop_recording(self) -> int:
+        # Cierra la traza con la huella del estado final; devuelve las filas grabadas
+        recorder = self.recorder
+        if recorder is None:
+            return 0
+        self._record("end", value=fingerprint(self))
+        self.recorder = None
+        recorder.close()
+        self.events.note(f"Traza grabada en {recorder.path}: {recorder.rows} operaciones")
+        return recorder.rows
+
+    def close(self) -> None:
+        # Vuelca lo pendiente antes de salir
+        self.stop_recording()
+        self.events.stop_writer()
+        if self.journal is not None:
+            self.journal.close()
@@ -0,0 +1,140 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from planificador import Scheduler
+from registro import register_formats
+
+
+# Límite de salto cuando se ejecuta hasta completar sin número de ciclos
+_UNBOUNDED = 2 ** 62
+
+
+def _on_core(record) -> str:
+    # Los eventos de núcleo guardan (núcleo, tiempo restante, ciclos[, causa]); núcleo None con uno solo
+    core = record.payload[0] if record.payload else None
+    return "" if core is None else f" (núcleo {core})"
+
+
+register_formats({
+    "process_started": lambda record: (f"Proceso {record.pid} inició ejecución{_on_core(record)} "
+                                       f"(tiempo restante: {record.payload[1]})"),
+    "process_running": lambda record: (f"Proceso {record.pid} en ejecución{_on_core(record)} "
+                                       f"(tiempo restante: {record.payload[1]})"),
+    "process_completed": lambda record: f"Proceso {record.pid} completado{_on_core(record)}",
+    "process_preempted": lambda record: (f"Proceso {record.pid} interrumpido por "
+                                         f"{record.payload[3] if len(record.payload) > 3 else 'expropiación'}"
+                                         f"{_on_core(record)} (tiempo restante: {record.payload[1]})"),
+    "idle": lambda record: "CPU inactiva" + _on_core(record),
+})
+
+
+class SimulationResult:
+    """
+    Resultado de una ejecución sin interfaz.
+    events contiene tuplas (tiempo, evento, pid, tiempo restante, núcleo),
+    una por núcleo; pid y tiempo restante son None en los ciclos inactivos.
+    """
+
+    def __init__(self, events: List[Tuple], summary: Dict):
+        self.events = events
+        self.summary = summary
+
+
+class SimulationEngine:
+    """
+    Motor de simulación sin interfaz gráfica.
+    Avanza el planificador ciclo a ciclo sin dibujar nada, de modo que el
+    coste de una ejecución larga es únicamente el de execute_cycle.
+    """
+
+    def __init__(self, scheduler: Scheduler):
+        self.scheduler = scheduler
+
+    def run(self, cycles: Optional[int] = None, until_complete: bool = True,
+            record_events: bool = True, on_event: Optional[Callable[[dict], None]] = None,
+            event_driven: bool = False, journal=None, checkpoint=None) -> SimulationResult:
+        """
+        Ejecuta la simulación. Con event_driven=True el tiempo salta de un
+        evento relevante al siguiente (Scheduler.advance): el estado final y
+        el resumen son idénticos al modo ciclo a ciclo, pero los ciclos
+        consecutivos de ejecución o inactividad se registran como un único
+        evento en el instante en que terminan. Los contadores de eventos
+        suman ciclos de núcleo. Con journal (bitacora.Journal) cada evento
+        de núcleo se anexa además al diario binario, con el núcleo, el
+        tiempo restante y los ciclos que abarca como argumentos. Con
+        checkpoint (instantanea.Checkpointer) se guarda el estado cada
+        checkpoint.every ciclos exactos y al terminar.
+        """
+        if cycles is None and not until_complete:
+            raise ValueError("Se debe indicar un número de ciclos o ejecutar hasta completar")
+
+        scheduler = self.scheduler
+        execute_cycle = scheduler.execute_cycle
+        advance = scheduler.advance
+        events = []
+        counts = {}
+        write = journal.write if journal is not None else None
+        executed = 0
+        start_time = scheduler.time
+        started_at = time.perf_counter()
+        if checkpoint is not None:
+            checkpoint.start(start_time)
+
+        while cycles is None or executed < cycles:
+            if until_complete and not scheduler.has_pending_work():
+                break
+
+            if event_driven:
+                limit = cycles - executed if cycles is not None else _UNBOUNDED
+                if checkpoint is not None:
+                    # El salto se detiene en el próximo punto de control
+                    limit = min(limit, checkpoint.cycles_until_due(scheduler.time))
+                result = advance(limit)
+                step = result["cycles"]
+            else:
+                result = execute_cycle()
+                step = 1
+            executed += step
+            for core_result in result["events"]:
+                event_type = core_result["event"]
+                counts[event_type] = counts.get(event_type, 0) + step
+
+                if write is not None:
+                    process = core_result.get("process")
+                    write(time.time(), scheduler.time, event_type, None if process is None else process.pid,
+                          (core_result["core"], None if process is None else process.burst_time, step))
+
+                if record_events:
+                    process = core_result.get("process")
+                    if process is None:
+                        events.append((scheduler.time, event_type, None, None, core_result["core"]))
+                    else:
+                        events.append((scheduler.time, event_type, process.pid, process.burst_time,
+                                       core_result["core"]))
+
+            if on_event is not None:
+                on_event(result)
+            if checkpoint is not None:
+                checkpoint.maybe_save(scheduler.time)
+
+        if checkpoint is not None and checkpoint.last_cycle != scheduler.time:
+            checkpoint.save()
+
+        elapsed = time.perf_counter() - started_at
+        idle_cycles = counts.get("idle", 0)
+        core_cycles = executed * scheduler.cores
+        summary = {
+            "algorithm": scheduler.name,
+            "cycles": executed,
+            "start_time": start_time,
+            "end_time": scheduler.time,
+            "events": counts,
+            "completed": counts.get("process_completed", 0),
+            "idle_cycles": idle_cycles,
+            "cores": scheduler.cores,
+            "cpu_utilization": (core_cycles - idle_cycles) / core_cycles if core_cycles else 0.0,
+            "elapsed_seconds": elapsed,
+            "cycles_per_second": executed / elapsed if elapsed > 0 else 0.0,
+            "metrics": scheduler.metrics.report(),
+            "memory": scheduler.resources.get_memory_stats()
+        }
+        return SimulationResult(events, summary)
@@ -0,0 +1,33 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bitacora import Journal, JournalReader  # noqa: E402
+
+
+class JournalReaderTest(unittest.TestCase):
+    def test_by_cycle_matches_full_scan(self):
+        # Ciclos que retroceden a mitad (restauración de una instantánea) y eventos sin ciclo
+        rng = random.Random(5)
+        cycles = list(range(0, 300)) + list(range(100, 250)) + [None, None] + list(range(250, 263))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "eventos.diario")
+            journal = Journal(path, block_records=16)
+            for cycle in cycles:
+                journal.write(0.0, cycle, "note", rng.randrange(4), ())
+            journal.close()
+
+            with JournalReader(path) as reader:
+                everything = list(reader)
+                for start, end in [(0, 0), (5, 40), (120, 130), (240, 262), (262, 400), (500, 600)]:
+                    expected = [record for record in everything
+                                if record.cycle is not None and start <= record.cycle <= end]
+                    self.assertEqual(list(reader.by_cycle(start, end)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
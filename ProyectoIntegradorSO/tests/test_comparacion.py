@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from carga import generate_workload  # noqa: E402
+from comparacion import snapshot_workload  # noqa: E402
+from sesion import Session  # noqa: E402
+
+
+class SnapshotWorkloadTest(unittest.TestCase):
+    def test_includes_lazy_workload(self):
+        # La carga sintética aún no creada forma parte de la copia y la original no avanza
+        session = Session()
+        session.add_synthetic_workload(30, seed=4)
+        specs = list(generate_workload(30, seed=4))
+
+        workload = snapshot_workload(session.process_manager)
+        base = specs[0][0]
+        self.assertEqual(workload, [(arrival - base, priority, memory, burst)
+                                    for arrival, priority, memory, burst in specs])
+        self.assertEqual(snapshot_workload(session.process_manager), workload)
+
+        session.run()
+        self.assertEqual(session.scheduler.metrics.completed, 30)
+
+    def test_unbounded_workload(self):
+        session = Session()
+        session.add_synthetic_workload(None, seed=4)
+        with self.assertRaises(ValueError):
+            snapshot_workload(session.process_manager, limit=100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comunicacion import MessageQueue  # noqa: E402
+
+
+class SendManyTest(unittest.TestCase):
+    def _send_batch(self, policy: str) -> dict:
+        messages = MessageQueue()
+        messages.create_queue(1)
+        messages.create_queue(2, capacity=3, policy=policy)
+        self.assertEqual(messages.send_many(1, 2, list(range(5))), 3 if policy != "drop_oldest" else 5)
+        return messages.get_queue_stats(2)
+
+    def test_overflow_counted_like_single_sends(self):
+        # Los mensajes que no caben cuentan en el contador de la política, como en send_message
+        self.assertEqual(self._send_batch("reject")["rejected"], 2)
+        self.assertEqual(self._send_batch("block")["blocked_sends"], 2)
+        self.assertEqual(self._send_batch("drop_oldest")["dropped"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
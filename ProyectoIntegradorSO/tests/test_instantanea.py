@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sesion import Session  # noqa: E402
+from trazas import fingerprint  # noqa: E402
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+    """Una instantánea con carga sintética pendiente continúa igual que la simulación original."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "estado.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _session(self) -> Session:
+        session = Session()
+        session.set_algorithm("round_robin", quantum=3)
+        session.add_synthetic_workload(80, seed=7)
+        session.add_synthetic_workload(40, seed=11, burst_distribution="pareto", interactive_fraction=0.3)
+        return session
+
+    def test_restore_mid_workload(self):
+        original = self._session()
+        original.run(120)
+        self.assertIsNotNone(original.process_manager.next_arrival_time())
+        original.save_snapshot(self.path)
+        original.run()
+
+        restored = Session()
+        restored.load_snapshot(self.path)
+        restored.run()
+
+        self.assertEqual(fingerprint(restored), fingerprint(original))
+        self.assertEqual(restored.scheduler.metrics.report(), original.scheduler.metrics.report())
+
+    def test_checkpoints_fall_on_interval(self):
+        session = self._session()
+        session.enable_checkpoints(self.path, 25)
+        session.run(100)
+        self.assertEqual(session.checkpoint.last_cycle, 100)
+        self.assertEqual(session.checkpoint.saved, 4)
+
+        restored = Session()
+        restored.load_snapshot(self.path)
+        self.assertEqual(restored.scheduler.time, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
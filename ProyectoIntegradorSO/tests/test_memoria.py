@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memoria import create_allocator  # noqa: E402
+
+
+class FreeListAllocatorTest(unittest.TestCase):
+    def _fragmented(self, fit: str):
+        # Huecos de 30 en 0, 20 en 40, 30 en 70 y el resto desde 110
+        memory = create_allocator(f"{fit}_fit", 256)
+        for pid, size in enumerate((30, 10, 20, 10, 30, 10)):
+            memory.allocate(pid, size)
+        for pid in (0, 2, 4):
+            memory.free(pid)
+        return memory
+
+    def test_fits_choose_expected_hole(self):
+        expected = {"first": 0, "best": 40, "worst": 110, "next": 110}
+        for fit, start in expected.items():
+            memory = self._fragmented(fit)
+            self.assertTrue(memory.allocate(10, 15))
+            self.assertEqual(memory._blocks[10][0], start, fit)
+
+    def test_free_coalesces_neighbours(self):
+        memory = self._fragmented("first")
+        for pid in (1, 3, 5):
+            memory.free(pid)
+        self.assertEqual(memory.largest_free_block(), 256)
+        self.assertEqual(memory._sizes, {0: 256})
+
+
+class BuddyAllocatorTest(unittest.TestCase):
+    def test_stale_heap_entries_purged(self):
+        memory = create_allocator("buddy", 1024)
+        for _ in range(50):
+            for pid in range(64):
+                memory.allocate(pid, 16)
+            for pid in range(64):
+                memory.free(pid)
+        for heap, free in zip(memory._free_heaps, memory._free_sets):
+            self.assertLessEqual(len(heap), 2 * len(free) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
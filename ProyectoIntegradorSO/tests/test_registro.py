@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registro import EventLog  # noqa: E402
+
+
+class EventLogTest(unittest.TestCase):
+    def test_clear_keeps_lifetime_counters(self):
+        # clear no cuenta como descarte ni deja negativas las pérdidas del escritor
+        log = EventLog(capacity=4)
+        with tempfile.TemporaryDirectory() as directory:
+            log.start_writer(os.path.join(directory, "eventos.jsonl"), interval=60)
+            for _ in range(6):
+                log.record("note", None, "x")
+            log.clear()
+            log.record("note", None, "y")
+
+            self.assertEqual(log.total, 7)
+            self.assertEqual(log.dropped, 2)
+            self.assertEqual(log.writer_dropped, 3)
+            log.stop_writer()
+            self.assertEqual(log.written, 4)
+            self.assertEqual(log.writer_dropped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sesion import Session  # noqa: E402
+from trazas import TraceReplay, fingerprint  # noqa: E402
+
+
+class KillTest(unittest.TestCase):
+    def test_kill_before_arrival(self):
+        # Un proceso terminado antes de llegar no se admite ni se cuenta como completado
+        session = Session()
+        process = session.schedule_arrival(1, 64, 4, 5)
+        free_memory = session.resources.available_memory
+        session.kill(process.pid)
+        self.assertEqual(session.resources.available_memory, free_memory)
+
+        session.run(20)
+        self.assertEqual(process.state, "terminated")
+        self.assertIsNone(process.completion_time)
+        self.assertEqual(session.scheduler.metrics.completed, 0)
+        self.assertFalse(session.process_manager.pending_arrivals)
+
+
+class SetAlgorithmTest(unittest.TestCase):
+    def test_scheduler_indexes_dropped(self):
+        # Cada planificador registra sus índices; los del anterior no se quedan en la cola de listos
+        session = Session()
+        for _ in range(4):
+            session.create_process(2, 16, 5)
+        for algorithm in ("sjf", "priority_preemptive", "mlfq", "cfs", "stride", "lottery"):
+            session.set_algorithm(algorithm)
+            session.run(1)
+        self.assertEqual(set(session.process_manager.ready_queue._indexes), {"lottery_ticket"})
+
+        session.set_algorithm("fcfs", cores=2, per_core_queues=True)
+        session.run()
+        self.assertFalse(session.process_manager.ready_queue._keys)
+        self.assertEqual(session.scheduler.metrics.completed, 4)
+
+
+class LotterySeedTest(unittest.TestCase):
+    def _completions(self, seed: int) -> list:
+        session = Session()
+        session.set_algorithm("lottery", quantum=1, seed=seed)
+        for priority in range(1, 6):
+            session.create_process(priority, 16, 4)
+        session.run()
+        return [process.completion_time for process in session.process_manager.processes]
+
+    def test_seed_makes_lottery_reproducible(self):
+        # Con la misma semilla el sorteo elige igual; la semilla queda en la configuración
+        self.assertEqual(self._completions(7), self._completions(7))
+        session = Session()
+        session.set_algorithm("lottery", seed=7)
+        session.set_algorithm("lottery", quantum=3)
+        self.assertEqual(session.settings()["seed"], 7)
+
+
+class ConditionTest(unittest.TestCase):
+    def test_notified_waiter_blocks_on_mutex(self):
+        # Si el mutex está ocupado, el proceso despertado pasa a esperar al mutex y no a la condición
+        session = Session()
+        first = session.create_process(1, 16, 5).pid
+        second = session.create_process(1, 16, 5).pid
+        session.create_sync("mutex", "m")
+        session.create_sync("condition", "c", "m")
+
+        session.sync_wait("m", first)
+        session.sync_wait("c", first)
+        self.assertEqual(session.process_manager.blocked[first], "condición 'c'")
+        session.sync_wait("m", second)
+        self.assertEqual(session.sync_signal("c", second), [first])
+        self.assertEqual(session.process_manager.blocked[first], "semáforo 'm'")
+
+        session.sync_signal("m", second)
+        self.assertNotIn(first, session.process_manager.blocked)
+        self.assertEqual(session.sync_objects["m"].owner, first)
+
+
+class RecordingTest(unittest.TestCase):
+    def test_group_and_buffer_operations_replay(self):
+        # Difusión, grupos, temas y productor-consumidor quedan en la traza y se reproducen igual
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sesion.jsonl")
+            session = Session()
+            session.start_recording(path)
+            pids = [session.create_process(2, 32, 20).pid for _ in range(3)]
+            session.join_group(pids[1], "g")
+            session.subscribe(pids[2], "t")
+            session.broadcast(pids[0], "hola")
+            session.multicast(pids[0], "g", "grupo")
+            session.publish(pids[1], "t", "tema")
+            session.add_producer(pids[0])
+            session.add_consumer(pids[1])
+            session.produce(pids[0], ["a", "b", "c", "d", "e", "f", "g"])
+            session.run(4)
+            session.consume(pids[1], 2)
+            session.run(4)
+            session.stop_recording()
+
+            replayed = Session()
+            result = TraceReplay(replayed, path).run()
+            self.assertEqual(result["errors"], [])
+            self.assertTrue(result["matches"])
+            for pid in pids:
+                self.assertEqual(replayed.message_system.get_queue_size(pid),
+                                 session.message_system.get_queue_size(pid))
+            self.assertEqual(replayed.producer_consumer.get_buffer_status()["buffer_content"],
+                             session.producer_consumer.get_buffer_status()["buffer_content"])
+            self.assertEqual(fingerprint(replayed), fingerprint(session))
+            session.close()
+            replayed.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
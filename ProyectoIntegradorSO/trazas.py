@@ -0,0 +1,368 @@
+import csv
+import json
+import os
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Formato de las trazas: una fila por trabajo u operación, en orden creciente de instante.
+#   CSV: una cabecera con los nombres de columna (en cualquier orden; las desconocidas se ignoran).
+#   JSON Lines: un objeto por línea con las mismas claves.
+# Las líneas vacías y las que empiezan por "#" se ignoran. La columna "time" (o su alias "arrival")
+# es obligatoria. Una fila sin "op" es un trabajo: llega en "time" con "priority", "memory" y
+# "burst", e "id" lo identifica en las operaciones posteriores. Las filas con "op" son operaciones
+# sobre la sesión en ese instante: "id" es el proceso que la realiza y "target" y "value" sus
+# argumentos (ver TraceReplay).
+FORMATS = ("csv", "jsonl")
+_ALIASES = {"arrival": "time"}
+_INT_FIELDS = ("time", "id", "priority", "memory", "burst")
+
+
+class TraceRow(NamedTuple):
+    time: int
+    op: Optional[str]  # None en las filas de trabajos
+    id: Optional[int]
+    priority: Optional[int]
+    memory: Optional[int]
+    burst: Optional[int]
+    target: Any
+    value: Any
+
+
+def _format_of(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+class TraceReader:
+    """
+    Lector perezoso de trazas CSV o JSONL: recorre el archivo línea a
+    línea, así que una traza de millones de filas no se carga en memoria.
+    Con jobs_only produce solo las tuplas (llegada, prioridad, memoria,
+    tiempo de CPU) de los trabajos, listas para
+    ProcessManager.attach_workload; si no, produce TraceRow. offset se
+    suma a todos los instantes. El lector se puede serializar (recuerda
+    su posición en el archivo), de modo que una carga importada sigue
+    funcionando tras restaurar una instantánea.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, jobs_only: bool = False, offset: int = 0):
+        fmt = fmt or _format_of(path)
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato de traza desconocido: {fmt}")
+
+        self.path = path
+        self.fmt = fmt
+        self.jobs_only = jobs_only
+        self.offset = offset
+        self.line = 0  # Número de la última línea leída
+        self._position = 0  # Byte donde empieza la siguiente línea
+        self._columns: Optional[List[Optional[str]]] = None  # Campo de cada columna CSV
+        self._job_columns: Optional[Tuple[int, ...]] = None  # Posiciones de time, priority, memory y burst
+        self._op_column: Optional[int] = None  # Posición de la columna op, si la hay
+        self._last_time: Optional[int] = None
+        self._file = open(path, "rb")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_file"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._file = open(self.path, "rb")
+        self._file.seek(self._position)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> "TraceReader":
+        return self
+
+    def __next__(self):
+        if self._file.closed:
+            raise StopIteration
+        readline = self._file.readline
+        while True:
+            raw = readline()
+            if not raw:
+                self._file.close()
+                raise StopIteration
+            self._position += len(raw)
+            self.line += 1
+
+            text = raw.decode("utf-8").strip()
+            if not text or text.startswith("#"):
+                continue
+            if self.fmt == "csv" and self._columns is None:
+                self._read_header(text)
+                continue
+
+            if self._job_columns is not None and '"' not in text:
+                job = self._job(text.split(","))
+                if job is None:
+                    continue
+                return job
+
+            fields = self._parse(text)
+            if self.jobs_only and fields.get("op"):
+                continue  # Las operaciones solo tienen sentido al reproducir la traza
+            return self._row(fields)
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{self.path}, línea {self.line}: {message}")
+
+    def _read_header(self, text: str) -> None:
+        names = [name.strip().lower() for name in next(csv.reader([text]))]
+        names = [_ALIASES.get(name, name) for name in names]
+        if "time" not in names:
+            raise self._error("la cabecera debe incluir la columna time (o arrival)")
+        self._columns = [name if name in TraceRow._fields else None for name in names]
+        if self.jobs_only and all(name in names for name in ("priority", "memory", "burst")):
+            self._job_columns = tuple(names.index(name) for name in ("time", "priority", "memory", "burst"))
+            self._op_column = names.index("op") if "op" in names else None
+
+    def _job(self, cells: List[str]) -> Optional[Tuple[int, int, int, int]]:
+        # Camino rápido de las cargas CSV: solo se convierten las cuatro columnas de un trabajo
+        if self._op_column is not None and self._op_column < len(cells) and cells[self._op_column].strip():
+            return None
+        try:
+            time, priority, memory, burst = [int(cells[index]) for index in self._job_columns]
+        except (IndexError, ValueError):
+            # Celdas vacías o no numéricas: el camino general da el error preciso
+            return self._row(self._parse(",".join(cells)))
+        if self._last_time is not None and time < self._last_time:
+            raise self._error(f"el instante {time} es anterior al de la fila previa ({self._last_time})")
+        self._last_time = time
+        return time + self.offset, priority, memory, burst
+
+    def _parse(self, text: str) -> Dict[str, Any]:
+        if self.fmt == "jsonl":
+            try:
+                fields = json.loads(text)
+            except ValueError as e:
+                raise self._error(f"JSON no válido ({e})") from None
+            if not isinstance(fields, dict):
+                raise self._error("cada línea debe ser un objeto JSON")
+            for alias, name in _ALIASES.items():
+                if alias in fields and name not in fields:
+                    fields[name] = fields[alias]
+            return fields
+
+        # Camino rápido: solo las filas con comillas necesitan el analizador CSV
+        cells = text.split(",") if '"' not in text else next(csv.reader([text]))
+        return {name: cell.strip() for name, cell in zip(self._columns, cells)
+                if name is not None and cell.strip()}
+
+    def _row(self, fields: Dict[str, Any]):
+        values = {}
+        for name in _INT_FIELDS:
+            value = fields.get(name)
+            if value is not None:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    raise self._error(f"{name} debe ser un número entero") from None
+            values[name] = value
+
+        time = values["time"]
+        if time is None:
+            raise self._error("falta el instante (time)")
+        if self._last_time is not None and time < self._last_time:
+            raise self._error(f"el instante {time} es anterior al de la fila previa ({self._last_time})")
+        self._last_time = time
+        time += self.offset
+
+        op = fields.get("op") or None
+        if op is None:
+            if any(values[name] is None for name in ("priority", "memory", "burst")):
+                raise self._error("un trabajo necesita priority, memory y burst")
+            if self.jobs_only:
+                return time, values["priority"], values["memory"], values["burst"]
+
+        return TraceRow(time, op, values["id"], values["priority"], values["memory"], values["burst"],
+                        fields.get("target"), fields.get("value"))
+
+
+class TraceRecorder:
+    """
+    Graba las operaciones de una sesión como traza JSON Lines, una fila
+    por operación con su instante. Solo se escriben los campos presentes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._file = open(path, "w", encoding="utf-8")
+
+    def record(self, time: int, op: str, pid: Optional[int] = None, **fields: Any) -> None:
+        row = {"time": time, "op": op}
+        if pid is not None:
+            row["id"] = pid
+        row.update((name, value) for name, value in fields.items() if value is not None)
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def fingerprint(session) -> int:
+    """
+    Huella del estado de una sesión: reloj, métricas y estado de cada
+    proceso de la tabla. Dos ejecuciones con las mismas operaciones en los
+    mismos instantes tienen la misma huella.
+    """
+    processes = [(p.pid, p.state, p.burst_time, p.first_run_time, p.completion_time)
+                 for p in session.process_manager.processes]
+    report = sorted(session.scheduler.metrics.report().items())
+    return zlib.crc32(repr((session.scheduler.time, report, processes)).encode())
+
+
+def _flag(value: Any) -> bool:
+    # Valores booleanos de JSON o de texto CSV
+    return value in (True, 1, "1", "true", "True")
+
+
+class TraceReplay:
+    """
+    Reproduce una traza sobre una sesión (sesion.Session). El reloj avanza
+    por eventos hasta el instante de cada fila y entonces se aplica la
+    fila: los trabajos entran en la cola de llegadas y las operaciones se
+    ejecutan con los métodos de la sesión. Si la traza empieza con
+    "start", se restaura antes la instantánea del estado inicial, y si
+    termina con "end", la simulación se detiene en ese instante y se
+    compara la huella final con la grabada; sin "end" se ejecuta hasta
+    completar. Los errores de las operaciones se acumulan en lugar de
+    interrumpir la reproducción. Durante la reproducción no se registran
+    los eventos de cada ciclo.
+    """
+
+    def __init__(self, session, path: str, fmt: Optional[str] = None):
+        self.session = session
+        self.path = path
+        self.fmt = fmt
+        self.applied = 0
+        self.errors: List[Tuple[int, str, str]] = []  # (instante, operación, motivo)
+        self._pids: Dict[int, int] = {}  # id de la traza -> PID en esta ejecución
+
+    def run(self) -> Dict[str, Any]:
+        session = self.session
+        # Lo que se reproduce no se vuelve a grabar
+        recorder, session.recorder = session.recorder, None
+        recorded = None
+        try:
+            with TraceReader(self.path, self.fmt) as reader:
+                for index, row in enumerate(reader):
+                    if row.op == "start" and index == 0:
+                        session.load_snapshot(self._resolve(row.target))
+                        self.applied += 1
+                        continue
+
+                    self._advance_to(row.time)
+                    if row.op == "end":
+                        recorded = int(row.value)
+                        break
+                    try:
+                        self._apply(row)
+                        self.applied += 1
+                    except ValueError as e:
+                        self.errors.append((row.time, row.op or "job", str(e)))
+            if recorded is None:
+                session.run(None)
+        finally:
+            session.recorder = recorder
+
+        final = fingerprint(session)
+        return {
+            "rows": self.applied,
+            "errors": self.errors,
+            "time": session.scheduler.time,
+            "fingerprint": final,
+            "recorded": recorded,
+            "matches": None if recorded is None else final == recorded
+        }
+
+    def _resolve(self, path: str) -> str:
+        # Las instantáneas de una traza grabada se guardan junto a ella
+        beside = os.path.join(os.path.dirname(self.path), path)
+        return beside if os.path.exists(beside) else path
+
+    def _advance_to(self, time: int) -> None:
+        # advance nunca supera el máximo indicado, así que el reloj llega exactamente a time
+        while self.session.scheduler.time < time:
+            self.session.scheduler.advance(time - self.session.scheduler.time)
+
+    def _pid(self, value: Any) -> Optional[int]:
+        if value is None:
+            return None
+        value = int(value)
+        return self._pids.get(value, value)
+
+    def _apply(self, row: TraceRow) -> None:
+        session = self.session
+        op = row.op
+        pid = self._pid(row.id)
+
+        if op is None:
+            process = session.schedule_arrival(row.priority, row.memory, row.burst, row.time)
+            if row.id is not None:
+                self._pids[row.id] = process.pid
+        elif op == "create":
+            process = session.create_process(row.priority, row.memory, row.burst)
+            if row.id is not None:
+                self._pids[row.id] = process.pid
+        elif op == "suspend":
+            session.suspend(pid)
+        elif op == "resume":
+            session.resume(pid)
+        elif op == "kill":
+            session.kill(pid)
+        elif op == "send":
+            session.send(pid, self._pid(row.target), row.value)
+        elif op == "receive":
+            session.receive(pid, _flag(row.value))
+        elif op == "mailbox":
+            session.configure_mailbox(pid, int(row.value) if row.value else None, row.target)
+        elif op == "join":
+            session.join_group(pid, row.target)
+        elif op == "subscribe":
+            session.subscribe(pid, row.target)
+        elif op == "broadcast":
+            session.broadcast(pid, row.value)
+        elif op == "multicast":
+            session.multicast(pid, row.target, row.value)
+        elif op == "publish":
+            session.publish(pid, row.target, row.value)
+        elif op == "producer":
+            session.add_producer(pid)
+        elif op == "consumer":
+            session.add_consumer(pid)
+        elif op == "produce":
+            session.produce(pid, row.value if isinstance(row.value, list) else [row.value])
+        elif op == "consume":
+            session.consume(pid, int(row.value))
+        elif op in ("semaphore", "mutex", "condition"):
+            session.create_sync(op, row.target, 1 if row.value is None else row.value)
+        elif op == "wait":
+            session.sync_wait(row.target, pid)
+        elif op == "signal":
+            session.sync_signal(row.target, pid)
+        elif op == "workload":
+            params = dict(row.value)
+            session.add_synthetic_workload(params.pop("count"), **params)
+        elif op == "import":
+            options = row.value or {}
+            session.import_workload(row.target, options.get("format"), options.get("offset", 0))
+        elif op == "algorithm":
+            session.set_algorithm(**row.value)
+        elif op == "allocator":
+            session.set_allocator(row.target)
+        elif op == "start":
+            raise ValueError("start solo puede ser la primera fila de la traza")
+        else:
+            raise ValueError(f"Operación desconocida: {op}")